@@ -4,6 +4,7 @@ from PyQt6.QtWebEngineCore import QWebEngineProfile
 from src.infrastructure.services.filelist_auth import FilelistAuthenticator
 from src.presentation.windows.main_dashboard import MainDashboard
 from src.infrastructure.repositories.sqlite_media_repository import SQLiteMediaRepository
+from src.infrastructure.repositories.cached_media_repository import CachedMediaRepository
 from src.application.media_controller import MediaController
 
 
@@ -28,7 +29,8 @@ class AppController(QObject):
         self.auth_manager.login()
 
         # 2. Initialize Infrastructure & Controllers
-        self.repo = SQLiteMediaRepository()
+        # Item rows are served from memory; SQLite only sees writes and cache-table lookups.
+        self.repo = CachedMediaRepository(SQLiteMediaRepository())
         
         # MediaController will eventually be broken into UseCases in the Application Layer,
         # but for now we inject the repo indirectly or simply retain its capabilities.
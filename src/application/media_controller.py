@@ -1,15 +1,16 @@
 import os
 import re
+import json
 import logging
 from typing import List, Any
-import qbittorrentapi
-from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
 
 from src.infrastructure.services.image_downloader import ImageDownloaderThread
 from src.infrastructure.services.tmdb_fetcher import TMDBFetcherThread, TMDBEpisodeFetcherThread
-from src.infrastructure.services.qbittorrent import QBittorrentClient, QBittorrentFilesWorker, QBittorrentPollingThread
-from src.infrastructure.services.ssh_client import SSHTelemetryClient
-from src.application.use_cases.sync_use_cases import SyncTorrentStateUseCase
+from src.infrastructure.services.qbittorrent import QBittorrentBatchAddWorker, QBittorrentDeleteWorker, QBittorrentFilesWorker, QBittorrentPollingThread
+from src.infrastructure.services.ssh_client import SSHTelemetryService
+from src.application.use_cases.sync_use_cases import SyncConversionStateUseCase, SyncTorrentStatesBatchUseCase
+from src.application.torrent_add_queue import KNOWN, QUEUED, TorrentAddQueue
 
 # Configure Logging for conversion tracking
 logging.basicConfig(
@@ -69,6 +70,13 @@ class MediaController(QObject):
         self._threads = []
         self._qbit_client = None
         self._poll_worker = None
+        self._telemetry_service = None
+        # Adds arriving within the debounce window (e.g. every season of a show) go out as one batch.
+        self._add_queue = TorrentAddQueue(self._is_known_torrent)
+        self._add_flush_timer = QTimer(self)
+        self._add_flush_timer.setSingleShot(True)
+        self._add_flush_timer.setInterval(300)
+        self._add_flush_timer.timeout.connect(self._flush_torrent_adds)
         self.start_global_polling()
 
     def start_global_polling(self):
@@ -76,10 +84,18 @@ class MediaController(QObject):
         if self._poll_worker:
             return
 
-        sync_uc = SyncTorrentStateUseCase(self.repo)
+        sync_uc = SyncTorrentStatesBatchUseCase(self.repo)
         self._poll_worker = QBittorrentPollingThread(repo=self.repo, sync_use_case=sync_uc, parent=self)
         self._poll_worker.start()
 
+    def _ensure_telemetry_service(self) -> SSHTelemetryService:
+        """Lazily starts the single SSH telemetry service shared by every media item."""
+        if self._telemetry_service is None:
+            sync_uc = SyncConversionStateUseCase(self.repo)
+            self._telemetry_service = SSHTelemetryService(repo=self.repo, sync_use_case=sync_uc, parent=self)
+            self._telemetry_service.start()
+        return self._telemetry_service
+
     def add_media_flow(self, flow_index: int, title: str, relative_path: str, torrent_bytes: bytes, image_url: str, is_restored: bool = False, tmdb_id: str = None, media_type: str = "movie", season: str = ""):
         """Bootstraps the background tasks for a newly added media flow."""
         logger.info(f"Adding media flow [{flow_index}]: {title}")
@@ -213,10 +229,65 @@ class MediaController(QObject):
             base_path = os.getenv("BASE_SCRATCH_PATH")
             final_save_path = f"{base_path}/{relative_path}".replace("\\", "/")
             logger.info(f"Queueing torrent download to: {final_save_path}")
-            
-            qbit_worker = QBittorrentClient(torrent_bytes, final_save_path, self)
-            self._threads.append(qbit_worker)
-            qbit_worker.start()
+            self._queue_torrent_add(flow_index, torrent_bytes, final_save_path)
+
+    def _is_known_torrent(self, torrent_hash: str) -> bool:
+        """
+        Only qBittorrent's own view counts: torrent_cache and item links outlive deleted torrents, and
+        trusting them would drop a re-add and link the item to a hash qBittorrent no longer has.
+        """
+        return bool(self._poll_worker) and self._poll_worker.is_known_torrent(torrent_hash)
+
+    def _link_torrent_hash(self, flow_index: int, torrent_hash: str) -> None:
+        """Records the infohash so the poller matches this item by hash, not by name/path."""
+        item = self.repo.get_item(flow_index)
+        if not item:
+            return
+        try:
+            t_info = json.loads(item.torrent_data) if item.torrent_data else {}
+        except (TypeError, ValueError):
+            t_info = {}
+        if not t_info.get("hash"):
+            t_info["hash"] = torrent_hash
+            self.repo.update_torrent_data(flow_index, json.dumps(t_info))
+
+    def _queue_torrent_add(self, flow_index: int, torrent_bytes: bytes, save_path: str) -> None:
+        torrent_hash, outcome = self._add_queue.enqueue(flow_index, torrent_bytes, save_path)
+        if outcome == KNOWN:
+            logger.info(f"Skipping duplicate torrent {torrent_hash} for flow [{flow_index}]")
+            self._link_torrent_hash(flow_index, torrent_hash)
+        elif outcome == QUEUED:
+            self._add_flush_timer.start()
+
+    def _flush_torrent_adds(self) -> None:
+        batch = self._add_queue.take_batch()
+        if not batch:
+            return
+        logger.info(f"Submitting {len(batch)} torrent(s) to qBittorrent")
+
+        qbit_worker = QBittorrentBatchAddWorker(batch, self)
+        qbit_worker.finished.connect(logger.info)
+        qbit_worker.error.connect(logger.error)
+        qbit_worker.submitted.connect(self._on_torrents_submitted)
+        qbit_worker.rejected.connect(lambda names, _reason: self._add_queue.reject(names))
+        self._threads.append(qbit_worker)
+        qbit_worker.start()
+
+    def _on_torrents_submitted(self, names: list) -> None:
+        # Only now that qBittorrent accepted them do the items point at their hashes.
+        for flow_index, torrent_hash in self._add_queue.confirm(names):
+            self._link_torrent_hash(flow_index, torrent_hash)
+
+    def shutdown(self, timeout_ms: int = 3000) -> bool:
+        """
+        Stops the poller and telemetry threads, waiting up to `timeout_ms` for them to finish.
+        Returns True once no controller thread can still be using the repository.
+        """
+        pollers = [thread for thread in (self._poll_worker, self._telemetry_service) if thread is not None]
+        for thread in pollers:
+            thread.stop(wait=False)
+        stopped = all(thread.wait(timeout_ms) for thread in pollers)
+        return stopped and not any(thread.isRunning() for thread in self._threads)
 
     def fetch_image(self, flow_index: int, url: str):
         thread = ImageDownloaderThread(url, self)
@@ -229,37 +300,29 @@ class MediaController(QObject):
         logger.info(f"[Read-Only Mode] Torrent completed for: {target_path}. Deferring trigger to native qBittorrent script.")
 
     def request_deletion(self, hashes: List[str], delete_files: bool):
-        try:
-            logger.info(f"Requesting deletion of torrents: {hashes}")
-            h = os.getenv("QBIT_HOST")
-            p = os.getenv("QBIT_PORT")
-            c = qbittorrentapi.Client(
-                host=f"http://{h}:{p}", 
-                username=os.getenv("QBIT_USER"), 
-                password=os.getenv("QBIT_PASS")
-            )
-            c.auth_log_in()
-            c.torrents_delete(delete_files=delete_files, torrent_hashes=hashes)
-        except Exception as e:
-            logger.error(f"Failed to delete torrents {hashes}: {e}")
+        logger.info(f"Requesting deletion of torrents: {hashes}")
+        # Adding the same torrent again right after must reach qBittorrent instead of being deduplicated.
+        self._add_queue.forget(hashes)
+        if self._poll_worker:
+            self._poll_worker.forget_torrents(hashes)
+        worker = QBittorrentDeleteWorker(hashes, delete_files, self)
+        worker.error.connect(lambda err: logger.error(f"Failed to delete torrents {hashes}: {err}"))
+        self._threads.append(worker)
+        worker.start()
 
     def start_ssh_telemetry(self, flow_index: int, target_title: str):
         # 1. Check if the item is already completely converted in the DB
-        item = self.repo.get_item(flow_index)
         should_run_once_for_logs = False
-        if item and item.conversion_data:
+        jobs = self.repo.get_conversion_jobs(flow_index, include_logs=False)
+        if jobs:
             try:
-                import json
-                c_data = json.loads(item.conversion_data)
-                # If it's a list of jobs (episodes/movies) and ALL are completed
-                if c_data and isinstance(c_data, list) and all(r.get("db_status", "").upper() == "COMPLETED" for r in c_data):
+                # If ALL jobs (episodes/movies) are completed
+                if all(job.db_status.upper() == "COMPLETED" for job in jobs):
                     missing_local_logs = False
-                    for row in c_data:
-                        gen_local = str(row.get("gen_log_local_path", "") or "")
-                        ff_local = str(row.get("ff_log_local_path", "") or "")
-                        if not gen_local or not os.path.exists(gen_local):
+                    for job in jobs:
+                        if not job.gen_log_local_path or not os.path.exists(job.gen_log_local_path):
                             missing_local_logs = True
-                        if not ff_local or not os.path.exists(ff_local):
+                        if not job.ff_log_local_path or not os.path.exists(job.ff_log_local_path):
                             missing_local_logs = True
 
                     if missing_local_logs:
@@ -278,18 +341,7 @@ class MediaController(QObject):
 
         # 2. Start normal telemetry if not completed
         logger.info(f"Initializing SSH telemetry for: {target_title}")
-        from src.application.use_cases.sync_use_cases import SyncConversionStateUseCase
-        sync_uc = SyncConversionStateUseCase(self.repo)
-        ssh_worker = SSHTelemetryClient(
-            repo=self.repo,
-            sync_use_case=sync_uc,
-            item_id=flow_index,
-            target_title=target_title,
-            run_once=should_run_once_for_logs,
-            parent=self
-        )
-        self._threads.append(ssh_worker)
-        ssh_worker.start()
+        self._ensure_telemetry_service().register(flow_index, target_title, run_once=should_run_once_for_logs)
 
     def request_torrent_files(self, flow_index: int, torrent_hash: str):
         worker = QBittorrentFilesWorker(torrent_hash, self)
@@ -0,0 +1,71 @@
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from src.utils.torrent_hash import torrent_infohash
+
+# enqueue() outcomes.
+QUEUED = "queued"      # new torrent, goes out with the next batch
+WAITING = "waiting"    # same torrent as a queued/in-flight add; linked when that add is confirmed
+KNOWN = "known"        # already in qBittorrent; link right away, do not add
+
+
+class TorrentAddQueue:
+    """
+    Bookkeeping for batched torrent adds, kept free of Qt and I/O so the controller only has to
+    debounce and dispatch.
+    Torrents are keyed by their locally computed infohash. One already known (`is_known`, i.e.
+    reported by qBittorrent's last poll) or already waiting on an add is never queued twice;
+    a media item waiting on a queued add is only linked to the hash once qBittorrent confirms it,
+    so a failed add leaves nothing behind that would block a retry.
+    """
+    def __init__(self, is_known: Callable[[str], bool]):
+        self._is_known = is_known
+        # (file name stem, torrent bytes, save path) not yet handed to a worker.
+        self._pending: List[Tuple[str, bytes, str]] = []
+        # Name of every queued or in-flight add -> flow indexes to link once it is confirmed.
+        self._waiting: Dict[str, List[int]] = {}
+        # Hashes qBittorrent accepted that the poller does not report as known yet.
+        self._confirmed: Set[str] = set()
+
+    def enqueue(self, flow_index: int, torrent_bytes: bytes, save_path: str) -> Tuple[Optional[str], str]:
+        """Returns (infohash or None, QUEUED | WAITING | KNOWN)."""
+        # Once the poller reports an accepted hash, is_known answers for it.
+        self._confirmed = {h for h in self._confirmed if not self._is_known(h)}
+        torrent_hash = torrent_infohash(torrent_bytes)
+        if torrent_hash is None:
+            # Unparseable metainfo: submit it anyway and let qBittorrent judge; nothing to link.
+            name = f"flow_{flow_index}"
+            self._pending.append((name, torrent_bytes, save_path))
+            self._waiting[name] = []
+            return None, QUEUED
+        if torrent_hash in self._waiting:
+            self._waiting[torrent_hash].append(flow_index)
+            return torrent_hash, WAITING
+        if torrent_hash in self._confirmed or self._is_known(torrent_hash):
+            return torrent_hash, KNOWN
+        self._pending.append((torrent_hash, torrent_bytes, save_path))
+        self._waiting[torrent_hash] = [flow_index]
+        return torrent_hash, QUEUED
+
+    def take_batch(self) -> List[Tuple[str, bytes, str]]:
+        batch, self._pending = self._pending, []
+        return batch
+
+    def confirm(self, names: List[str]) -> List[Tuple[int, str]]:
+        """Marks adds as accepted and returns the (flow_index, infohash) links to record."""
+        links = []
+        for name in names:
+            if name not in self._waiting:
+                continue
+            self._confirmed.add(name)
+            for flow_index in self._waiting.pop(name):
+                links.append((flow_index, name))
+        return links
+
+    def reject(self, names: List[str]) -> None:
+        """Forgets failed adds so the same torrent can be queued again."""
+        for name in names:
+            self._waiting.pop(name, None)
+
+    def forget(self, hashes: List[str]) -> None:
+        """Drops accepted hashes whose torrents are being deleted, so adding them again is not skipped."""
+        self._confirmed.difference_update(hashes)
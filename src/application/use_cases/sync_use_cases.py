@@ -1,22 +1,71 @@
+import hashlib
+import threading
+from typing import Dict, List, Optional, Tuple
+
 from src.domain.repositories import IMediaRepository
 from src.application.events import event_bus
 
-class SyncTorrentStateUseCase:
-    """Updates the internal datastore with external qBittorrent telemetry and notifies the UI."""
+class PayloadChangeTracker:
+    """Remembers a content digest of the last persisted payload per item so identical telemetry is skipped."""
+    def __init__(self):
+        self._digests: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(payload: str) -> str:
+        return hashlib.blake2b((payload or "").encode("utf-8"), digest_size=16).hexdigest()
+
+    def prime(self, item_id: int, payload: Optional[str]) -> None:
+        """Seeds the tracker with already-persisted state without overriding newer knowledge."""
+        if item_id is None or not payload:
+            return
+        with self._lock:
+            self._digests.setdefault(item_id, self._digest(payload))
+
+    def changed(self, item_id: int, payload: str) -> Optional[str]:
+        """Returns the new digest if the payload differs from the last persisted one, otherwise None."""
+        digest = self._digest(payload)
+        with self._lock:
+            return None if self._digests.get(item_id) == digest else digest
+
+    def remember(self, item_id: int, digest: str) -> None:
+        with self._lock:
+            self._digests[item_id] = digest
+
+class SyncTorrentStatesBatchUseCase:
+    """Persists a whole poll cycle of qBittorrent telemetry in one transaction, then notifies the UI per changed item."""
     def __init__(self, repo: IMediaRepository):
         self.repo = repo
+        self.tracker = PayloadChangeTracker()
+
+    def prime(self, item_id: int, torrent_data: Optional[str]) -> None:
+        self.tracker.prime(item_id, torrent_data)
 
-    def execute(self, item_id: int, torrent_data: str):
-        self.repo.update_torrent_data(item_id, torrent_data)
-        event_bus.torrent_updated_signal.emit(item_id)
+    def execute(self, updates: List[Tuple[int, str]]):
+        changed: List[Tuple[int, str, str]] = []
+        for item_id, torrent_data in updates:
+            digest = self.tracker.changed(item_id, torrent_data)
+            if digest is not None:
+                changed.append((item_id, torrent_data, digest))
+        if not changed:
+            return
+        self.repo.update_torrent_data_many([(item_id, data) for item_id, data, _ in changed])
+        for item_id, _, digest in changed:
+            self.tracker.remember(item_id, digest)
+            event_bus.torrent_updated_signal.emit(item_id)
 
 class SyncConversionStateUseCase:
     """Updates the internal datastore with external SSH conversion telemetry and notifies the UI."""
     def __init__(self, repo: IMediaRepository):
         self.repo = repo
+        self.tracker = PayloadChangeTracker()
 
     def execute(self, item_id: int, conversion_data: str):
+        digest = self.tracker.changed(item_id, conversion_data)
+        if digest is None:
+            return
         self.repo.update_conversion_data(item_id, conversion_data)
+        self.tracker.remember(item_id, digest)
         event_bus.conversion_updated_signal.emit(item_id)
         
 class UpdateMetadataUseCase:
@@ -12,6 +12,10 @@ class TorrentState:
     eta: int = 0
     download_speed: int = 0
     total_size: int = 0
+    human_state: str = ""
+    pill_class: str = ""
+    pb_style: str = ""
+    item_id: Optional[int] = None
 
 @dataclass
 class ConversionJob:
@@ -22,6 +26,9 @@ class ConversionJob:
     sub_status: str = "Pending"
     gen_log: str = ""
     ff_tail: str = ""
+    # Stored body lengths; with include_logs=False the bodies above stay empty while these are still set.
+    gen_log_len: int = 0
+    ff_tail_len: int = 0
     prog: int = 0
     initial_size_bytes: int = 0
     final_size_bytes: int = 0
@@ -31,6 +38,7 @@ class ConversionJob:
     ff_log_remote_path: str = ""
     gen_log_local_path: str = ""
     ff_log_local_path: str = ""
+    item_id: Optional[int] = None
 
 @dataclass
 class MediaItem:
@@ -44,7 +52,23 @@ class MediaItem:
     genre: Optional[str] = None
     rating: Optional[str] = None
     torrent_data: Optional[str] = None
+    # JSON job list; gen_log/ff_tail are replaced by gen_log_ref/ff_tail_ref plus *_len once stored.
     conversion_data: Optional[str] = None
     is_season: int = 0
     media_type: str = 'movie'
     tmdb_id: Optional[str] = None
+
+@dataclass
+class MediaItemSummary:
+    """Lightweight projection of a MediaItem for list/poll loops; excludes the heavy conversion payload."""
+    id: int
+    relative_path: str = ""
+    title: str = ""
+    season: str = ""
+    is_season: int = 0
+    media_type: str = 'movie'
+    torrent_data: Optional[str] = None
+    torrent_hash: str = ""
+    torrent_state: str = ""
+    conversion_job_count: int = 0
+    conversion_completed: bool = False
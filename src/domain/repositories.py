@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from src.domain.entities import MediaItem
+from typing import List, Optional, Tuple
+from src.domain.entities import MediaItem, MediaItemSummary, TorrentState, ConversionJob
 
 class IMediaRepository(ABC):
     """Abstract base class for Media Repositories to enforce DDD boundaries."""
@@ -13,6 +13,11 @@ class IMediaRepository(ABC):
     def get_all_items(self) -> List[MediaItem]:
         pass
 
+    @abstractmethod
+    def get_item_summaries(self) -> List[MediaItemSummary]:
+        """Returns every item without its conversion payload, for loops that only need identity and state."""
+        pass
+
     @abstractmethod
     def get_item(self, item_id: int) -> Optional[MediaItem]:
         pass
@@ -25,6 +30,14 @@ class IMediaRepository(ABC):
     def update_item_title(self, item_id: int, title: str) -> None:
         pass
 
+    @abstractmethod
+    def update_item_image_url(self, item_id: int, image_url: str) -> None:
+        pass
+
+    @abstractmethod
+    def update_tmdb_id(self, item_id: int, tmdb_id: str) -> None:
+        pass
+
     @abstractmethod
     def update_metadata(self, item_id: int, description: str, genre: str, rating: str) -> None:
         pass
@@ -33,14 +46,42 @@ class IMediaRepository(ABC):
     def update_torrent_data(self, item_id: int, data: str) -> None:
         pass
 
+    @abstractmethod
+    def update_torrent_data_many(self, updates: List[Tuple[int, str]]) -> None:
+        """Persists several (item_id, torrent_data) pairs in a single transaction."""
+        pass
+
     @abstractmethod
     def update_conversion_data(self, item_id: int, data: str) -> None:
         pass
 
+    @abstractmethod
+    def get_torrent_state(self, item_id: int) -> Optional[TorrentState]:
+        pass
+
+    @abstractmethod
+    def get_conversion_jobs(self, item_id: int, include_logs: bool = True) -> List[ConversionJob]:
+        """With include_logs=False the gen_log/ff_tail bodies are left empty; see get_conversion_job_logs."""
+        pass
+
+    @abstractmethod
+    def get_conversion_job_logs(self, item_id: int, path: str) -> Tuple[str, str]:
+        """Lazily loads the (gen_log, ff_tail) bodies of a single job."""
+        pass
+
+    @abstractmethod
+    def get_conversion_jobs_by_status(self, db_status: str) -> List[ConversionJob]:
+        """Returns every tracked conversion job in the given status (case-insensitive), across all items."""
+        pass
+
     @abstractmethod
     def get_tmdb_cache(self, tmdb_id: str, media_type: str) -> str:
         pass
 
+    @abstractmethod
+    def recover_tmdb_id_by_title(self, title: str) -> Optional[str]:
+        pass
+
     @abstractmethod
     def set_tmdb_cache(self, tmdb_id: str, media_type: str, data: str) -> None:
         pass
@@ -57,6 +98,11 @@ class IMediaRepository(ABC):
     def get_torrent_cache_by_path(self, path: str) -> str:
         pass
 
+    @abstractmethod
+    def has_torrent_cache_for_path(self, path: str) -> bool:
+        """Index-only existence probe, cheaper than get_torrent_cache_by_path when the payload is not needed."""
+        pass
+
     @abstractmethod
     def get_conversion_cache(self, path: str) -> str:
         pass
@@ -0,0 +1,156 @@
+import threading
+from dataclasses import replace
+from typing import Dict, List, Optional, Tuple
+
+from src.domain.repositories import IMediaRepository
+from src.domain.entities import MediaItem, MediaItemSummary, TorrentState, ConversionJob
+
+
+class CachedMediaRepository(IMediaRepository):
+    """
+    Write-through decorator keeping every MediaItem row in memory in front of another IMediaRepository.
+    Item reads are served from the id-keyed map, so the GUI thread never touches SQLite for them.
+    Non-item caches (TMDB, torrent, conversion) and telemetry projections are delegated unchanged.
+    """
+    def __init__(self, inner: IMediaRepository):
+        self._inner = inner
+        # _write_lock orders "persist, then update map" pairs; _lock only guards short map access,
+        # so readers never wait behind a database write.
+        self._write_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._items: Dict[int, MediaItem] = {item.id: item for item in inner.get_all_items()}
+
+    def close(self) -> None:
+        close = getattr(self._inner, "close", None)
+        if callable(close):
+            close()
+
+    def _set_fields(self, item_id: int, **fields) -> None:
+        with self._lock:
+            cached = self._items.get(item_id)
+            if cached is not None:
+                self._items[item_id] = replace(cached, **fields)
+
+    def add_item(self, item: MediaItem) -> int:
+        with self._write_lock:
+            item_id = self._inner.add_item(item)
+            # Re-read once so the cached row carries the same defaults the database applied.
+            stored = self._inner.get_item(item_id) or replace(item, id=item_id)
+            with self._lock:
+                self._items[item_id] = stored
+        return item_id
+
+    def get_all_items(self) -> List[MediaItem]:
+        with self._lock:
+            return [replace(self._items[item_id]) for item_id in sorted(self._items)]
+
+    def get_item_summaries(self) -> List[MediaItemSummary]:
+        # A single projection query; conversion log payloads never leave SQLite.
+        return self._inner.get_item_summaries()
+
+    def get_item(self, item_id: int) -> Optional[MediaItem]:
+        if item_id is None:
+            return None
+        with self._lock:
+            cached = self._items.get(item_id)
+            return replace(cached) if cached is not None else None
+
+    def delete_item(self, item_id: int) -> bool:
+        if item_id is None:
+            return False
+        with self._write_lock:
+            deleted = self._inner.delete_item(item_id)
+            with self._lock:
+                self._items.pop(item_id, None)
+        return deleted
+
+    def update_item_title(self, item_id: int, title: str) -> None:
+        if item_id is None:
+            return
+        with self._write_lock:
+            self._inner.update_item_title(item_id, title)
+            self._set_fields(item_id, title=title)
+
+    def update_item_image_url(self, item_id: int, image_url: str) -> None:
+        if item_id is None:
+            return
+        with self._write_lock:
+            self._inner.update_item_image_url(item_id, image_url)
+            self._set_fields(item_id, image_url=image_url)
+
+    def update_tmdb_id(self, item_id: int, tmdb_id: str) -> None:
+        if item_id is None:
+            return
+        with self._write_lock:
+            self._inner.update_tmdb_id(item_id, tmdb_id)
+            self._set_fields(item_id, tmdb_id=tmdb_id or None)
+
+    def update_metadata(self, item_id: int, description: str, genre: str, rating: str) -> None:
+        if item_id is None:
+            return
+        with self._write_lock:
+            self._inner.update_metadata(item_id, description, genre, rating)
+            self._set_fields(item_id, description=description or None, genre=genre or None, rating=rating or None)
+
+    def update_torrent_data(self, item_id: int, data: str) -> None:
+        if item_id is None:
+            return
+        with self._write_lock:
+            self._inner.update_torrent_data(item_id, data)
+            self._set_fields(item_id, torrent_data=data or None)
+
+    def update_torrent_data_many(self, updates: List[Tuple[int, str]]) -> None:
+        with self._write_lock:
+            self._inner.update_torrent_data_many(updates)
+            for item_id, data in updates:
+                if item_id is not None:
+                    self._set_fields(item_id, torrent_data=data or None)
+
+    def update_conversion_data(self, item_id: int, data: str) -> None:
+        if item_id is None:
+            return
+        with self._write_lock:
+            self._inner.update_conversion_data(item_id, data)
+            # Cache what was stored: log bodies are swapped for store references, so the map never
+            # holds them; get_conversion_job_logs() reads them on demand.
+            stored = self._inner.get_item(item_id)
+            self._set_fields(item_id, conversion_data=stored.conversion_data if stored is not None else data or None)
+
+    def get_torrent_state(self, item_id: int) -> Optional[TorrentState]:
+        return self._inner.get_torrent_state(item_id)
+
+    def get_conversion_jobs(self, item_id: int, include_logs: bool = True) -> List[ConversionJob]:
+        return self._inner.get_conversion_jobs(item_id, include_logs)
+
+    def get_conversion_job_logs(self, item_id: int, path: str) -> Tuple[str, str]:
+        return self._inner.get_conversion_job_logs(item_id, path)
+
+    def get_conversion_jobs_by_status(self, db_status: str) -> List[ConversionJob]:
+        return self._inner.get_conversion_jobs_by_status(db_status)
+
+    def get_tmdb_cache(self, tmdb_id: str, media_type: str) -> str:
+        return self._inner.get_tmdb_cache(tmdb_id, media_type)
+
+    def recover_tmdb_id_by_title(self, title: str) -> Optional[str]:
+        return self._inner.recover_tmdb_id_by_title(title)
+
+    def set_tmdb_cache(self, tmdb_id: str, media_type: str, data: str) -> None:
+        self._inner.set_tmdb_cache(tmdb_id, media_type, data)
+
+    def get_torrent_cache(self, hash_val: str) -> str:
+        return self._inner.get_torrent_cache(hash_val)
+
+    def set_torrent_cache(self, hash_val: str, path: str, data: str) -> None:
+        self._inner.set_torrent_cache(hash_val, path, data)
+
+    def get_torrent_cache_by_path(self, path: str) -> str:
+        return self._inner.get_torrent_cache_by_path(path)
+
+    def has_torrent_cache_for_path(self, path: str) -> bool:
+        return self._inner.has_torrent_cache_for_path(path)
+
+    def get_conversion_cache(self, path: str) -> str:
+        return self._inner.get_conversion_cache(path)
+
+    def set_conversion_cache(self, path: str, data: str) -> None:
+        self._inner.set_conversion_cache(path, data)
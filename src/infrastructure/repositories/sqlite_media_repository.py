@@ -1,71 +1,595 @@
+import hashlib
+import json
+import re
 import sqlite3
-from typing import List, Optional
-from contextlib import closing
+import threading
+import weakref
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
 
 from src.domain.repositories import IMediaRepository
-from src.domain.entities import MediaItem
+from src.domain.entities import MediaItem, MediaItemSummary, TorrentState, ConversionJob
+
+# Connection tuning applied once per pooled connection.
+# WAL lets GUI-thread readers proceed while the poller/SSH threads hold the writer lock.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-16000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA busy_timeout=5000",
+)
+_STATEMENT_CACHE_SIZE = 256
+
+
+_V2_TORRENT_STATE_COLUMNS = (
+    "item_id", "hash", "name", "progress", "state", "human_state", "save_path", "eta", "download_speed", "total_size",
+)
+# Schema 6 adds the card's display classes so the grid renders torrent state without parsing torrent_data.
+_TORRENT_STATE_COLUMNS = _V2_TORRENT_STATE_COLUMNS + ("pill_class", "pb_style")
+# Schema 2 kept log bodies inline; only migration 2 still writes this shape before migration 5 rebuilds the table.
+_V2_CONVERSION_JOB_COLUMNS = (
+    "item_id", "path", "db_status", "stage_results", "sub_status", "gen_log", "ff_tail", "prog",
+    "initial_size_bytes", "final_size_bytes", "size_diff_pct", "conversion_total_minutes",
+    "gen_log_remote_path", "ff_log_remote_path", "gen_log_local_path", "ff_log_local_path",
+)
+_CONVERSION_JOB_COLUMNS = (
+    "item_id", "path", "db_status", "stage_results", "sub_status",
+    "gen_log_ref", "gen_log_len", "ff_tail_ref", "ff_tail_len", "prog",
+    "initial_size_bytes", "final_size_bytes", "size_diff_pct", "conversion_total_minutes",
+    "gen_log_remote_path", "ff_log_remote_path", "gen_log_local_path", "ff_log_local_path",
+)
+# (body key, store reference key, body length key) for each log a conversion job carries
+_LOG_FIELDS = (
+    ("gen_log", "gen_log_ref", "gen_log_len"),
+    ("ff_tail", "ff_tail_ref", "ff_tail_len"),
+)
+_LOG_COMPRESSION_LEVEL = 6
+
+
+def _upsert_sql(table: str, columns: Tuple[str, ...], key: Tuple[str, ...]) -> str:
+    """INSERT ... ON CONFLICT DO UPDATE that leaves rows whose values are unchanged untouched."""
+    values = [column for column in columns if column not in key]
+    return (
+        f'INSERT INTO {table} ({", ".join(columns)}) VALUES ({", ".join("?" * len(columns))}) '
+        f'ON CONFLICT ({", ".join(key)}) DO UPDATE SET {", ".join(f"{c} = excluded.{c}" for c in values)} '
+        f'WHERE ({", ".join(values)}) IS NOT ({", ".join(f"excluded.{c}" for c in values)})'
+    )
+
+
+_SQL_UPSERT_TORRENT_STATE = _upsert_sql("torrent_state", _TORRENT_STATE_COLUMNS, ("item_id",))
+_SQL_UPSERT_CONVERSION_JOB = _upsert_sql("conversion_jobs", _CONVERSION_JOB_COLUMNS, ("item_id", "path"))
+
+
+def _safe_int(value: Any) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _safe_float(value: Any) -> float:
+    try:
+        return float(value or 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+# Point lookups issued on every poll cycle or card render. Each must resolve through an index;
+# tests/test_sqlite_query_plans.py asserts this via explain_query_plan().
+_SQL_ITEM_BY_ID = 'SELECT * FROM media_items WHERE id = ?'
+_SQL_TORRENT_STATE_BY_ITEM = 'SELECT * FROM torrent_state WHERE item_id = ?'
+_SQL_CONVERSION_JOBS_BY_ITEM = 'SELECT * FROM conversion_jobs WHERE item_id = ? ORDER BY rowid'
+_SQL_CONVERSION_JOB_LOG_REFS = 'SELECT gen_log_ref, ff_tail_ref FROM conversion_jobs WHERE item_id = ? AND path = ?'
+_SQL_CONVERSION_LOG_BY_DIGEST = 'SELECT body FROM conversion_logs WHERE digest = ?'
+_SQL_CONVERSION_LOG_EXISTS = 'SELECT 1 FROM conversion_logs WHERE digest = ?'
+_SQL_ITEM_SUMMARIES = '''
+    SELECT m.id, m.relative_path, m.title, m.season, m.is_season, m.media_type, m.torrent_data,
+           t.hash AS torrent_hash, t.human_state AS torrent_state,
+           COUNT(c.path) AS job_count,
+           COALESCE(SUM(UPPER(c.db_status) = 'COMPLETED'), 0) AS completed_count
+    FROM media_items m
+    LEFT JOIN torrent_state t ON t.item_id = m.id
+    LEFT JOIN conversion_jobs c ON c.item_id = m.id
+    GROUP BY m.id
+    ORDER BY m.id
+'''
+_SQL_CONVERSION_JOBS_BY_STATUS = 'SELECT * FROM conversion_jobs WHERE db_status = ? COLLATE NOCASE ORDER BY item_id, rowid'
+_SQL_TMDB_CACHE_BY_KEY = 'SELECT data FROM tmdb_cache WHERE id = ? AND type = ?'
+_SQL_TMDB_ID_BY_FULL_TITLE = 'SELECT id FROM tmdb_cache WHERE full_title = ? LIMIT 1'
+_SQL_TMDB_ID_BY_NORMALIZED_TITLE = 'SELECT id FROM tmdb_cache WHERE normalized_title = ? LIMIT 1'
+_SQL_TORRENT_CACHE_BY_HASH = 'SELECT data FROM torrent_cache WHERE hash = ?'
+_SQL_TORRENT_CACHE_BY_PATH = 'SELECT data FROM torrent_cache WHERE path = ?'
+_SQL_TORRENT_CACHE_EXISTS_FOR_PATH = 'SELECT 1 FROM torrent_cache WHERE path = ? LIMIT 1'
+_SQL_CONVERSION_CACHE_BY_PATH = 'SELECT data FROM conversion_cache WHERE path = ?'
+
+_HOT_LOOKUP_QUERIES: Dict[str, Tuple[str, Tuple]] = {
+    "item_by_id": (_SQL_ITEM_BY_ID, (1,)),
+    "torrent_state_by_item": (_SQL_TORRENT_STATE_BY_ITEM, (1,)),
+    "conversion_jobs_by_item": (_SQL_CONVERSION_JOBS_BY_ITEM, (1,)),
+    "conversion_job_log_refs": (_SQL_CONVERSION_JOB_LOG_REFS, (1, "x")),
+    "conversion_log_by_digest": (_SQL_CONVERSION_LOG_BY_DIGEST, ("x",)),
+    "conversion_log_exists": (_SQL_CONVERSION_LOG_EXISTS, ("x",)),
+    "conversion_jobs_by_status": (_SQL_CONVERSION_JOBS_BY_STATUS, ("FAILED",)),
+    "tmdb_cache_by_key": (_SQL_TMDB_CACHE_BY_KEY, ("1", "movie")),
+    "tmdb_id_by_full_title": (_SQL_TMDB_ID_BY_FULL_TITLE, ("x",)),
+    "tmdb_id_by_normalized_title": (_SQL_TMDB_ID_BY_NORMALIZED_TITLE, ("x",)),
+    "torrent_cache_by_hash": (_SQL_TORRENT_CACHE_BY_HASH, ("x",)),
+    "torrent_cache_by_path": (_SQL_TORRENT_CACHE_BY_PATH, ("x",)),
+    "torrent_cache_exists_for_path": (_SQL_TORRENT_CACHE_EXISTS_FOR_PATH, ("x",)),
+    "conversion_cache_by_path": (_SQL_CONVERSION_CACHE_BY_PATH, ("x",)),
+}
+
+
+def _normalize_title(title: Optional[str]) -> str:
+    """Case/punctuation-insensitive form of a title used for tmdb_id recovery lookups."""
+    return " ".join(re.sub(r'[\W_]+', " ", str(title or "").casefold()).split())
+
+
+def _tmdb_titles(data: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """Extracts (full_title, normalized_title) from a cached TMDB payload, if it carries one."""
+    try:
+        payload = json.loads(data) if data else {}
+    except (TypeError, ValueError):
+        return None, None
+    full_title = payload.get("full_title") if isinstance(payload, dict) else None
+    if not full_title:
+        return None, None
+    return str(full_title), _normalize_title(full_title)
+
+
+def _torrent_state_row(item_id: int, data: Optional[str]) -> Optional[Tuple]:
+    """Flattens a poller torrent payload into a torrent_state row, or None if it carries no torrent."""
+    try:
+        t_info = json.loads(data) if data else {}
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(t_info, dict) or not t_info.get("hash"):
+        return None
+    return (
+        item_id,
+        str(t_info.get("hash", "")),
+        str(t_info.get("name", "") or ""),
+        _safe_float(t_info.get("prog_val")),
+        str(t_info.get("qbit_state", "") or ""),
+        str(t_info.get("human_state", "") or ""),
+        str(t_info.get("save_path", "") or ""),
+        _safe_int(t_info.get("eta")),
+        _safe_int(t_info.get("dl_speed")),
+        _safe_int(t_info.get("raw_size_bytes")),
+        str(t_info.get("pill_class", "") or ""),
+        str(t_info.get("pb_style", "") or ""),
+    )
+
+
+def _v2_conversion_job_rows(item_id: int, data: Optional[str]) -> List[Tuple]:
+    """Flattens an SSH telemetry payload into schema-2 conversion_jobs rows (log bodies inline)."""
+    try:
+        jobs = json.loads(data) if data else []
+    except (TypeError, ValueError):
+        return []
+    if isinstance(jobs, dict):
+        jobs = [jobs]
+    if not isinstance(jobs, list):
+        return []
+
+    rows: Dict[str, Tuple] = {}
+    for job in jobs:
+        if not isinstance(job, dict) or not job.get("path"):
+            continue
+        stage_results = job.get("stage_results", {})
+        if not isinstance(stage_results, str):
+            stage_results = json.dumps(stage_results or {})
+        rows[str(job["path"])] = (
+            item_id,
+            str(job["path"]),
+            str(job.get("db_status", "") or ""),
+            stage_results,
+            str(job.get("sub_status", "") or ""),
+            str(job.get("gen_log", "") or ""),
+            str(job.get("ff_tail", "") or ""),
+            _safe_int(job.get("prog")),
+            _safe_int(job.get("initial_size_bytes")),
+            _safe_int(job.get("final_size_bytes")),
+            _safe_float(job.get("size_diff_pct")),
+            _safe_float(job.get("conversion_total_minutes")),
+            str(job.get("gen_log_remote_path", "") or ""),
+            str(job.get("ff_log_remote_path", "") or ""),
+            str(job.get("gen_log_local_path", "") or ""),
+            str(job.get("ff_log_local_path", "") or ""),
+        )
+    return list(rows.values())
+
+
+def _log_digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _payload_jobs(data: Optional[str]) -> Tuple[Any, List[Any]]:
+    """Parses an SSH telemetry payload (one job dict or a list of them) into (parsed payload, jobs)."""
+    try:
+        parsed = json.loads(data) if data else None
+    except (TypeError, ValueError):
+        return None, []
+    if isinstance(parsed, dict):
+        return parsed, [parsed]
+    if isinstance(parsed, list):
+        return parsed, parsed
+    return None, []
+
+
+def _conversion_job_rows(item_id: int, jobs: List[Any]) -> List[Tuple]:
+    """Flattens externalized job dicts (log references instead of bodies) into conversion_jobs rows."""
+    rows: Dict[str, Tuple] = {}
+    for job in jobs:
+        if not isinstance(job, dict) or not job.get("path"):
+            continue
+        stage_results = job.get("stage_results", {})
+        if not isinstance(stage_results, str):
+            stage_results = json.dumps(stage_results or {})
+        rows[str(job["path"])] = (
+            item_id,
+            str(job["path"]),
+            str(job.get("db_status", "") or ""),
+            stage_results,
+            str(job.get("sub_status", "") or ""),
+            str(job.get("gen_log_ref", "") or ""),
+            _safe_int(job.get("gen_log_len")),
+            str(job.get("ff_tail_ref", "") or ""),
+            _safe_int(job.get("ff_tail_len")),
+            _safe_int(job.get("prog")),
+            _safe_int(job.get("initial_size_bytes")),
+            _safe_int(job.get("final_size_bytes")),
+            _safe_float(job.get("size_diff_pct")),
+            _safe_float(job.get("conversion_total_minutes")),
+            str(job.get("gen_log_remote_path", "") or ""),
+            str(job.get("ff_log_remote_path", "") or ""),
+            str(job.get("gen_log_local_path", "") or ""),
+            str(job.get("ff_log_local_path", "") or ""),
+        )
+    return list(rows.values())
+
+
+class _PooledConnection:
+    """Owns a single thread's SQLite connection and closes it once the owning thread releases it."""
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self._finalizer = weakref.finalize(self, conn.close)
+
+    def close(self) -> None:
+        self._finalizer()
+
 
 class SQLiteMediaRepository(IMediaRepository):
     """Concrete implementation of IMediaRepository using SQLite."""
     def __init__(self, db_path: str = "local_data.db"):
         self.db_path = db_path
+        self._local = threading.local()
+        self._pool: "weakref.WeakSet[_PooledConnection]" = weakref.WeakSet()
+        self._pool_lock = threading.Lock()
         self._init_db()
 
-    def _get_connection(self):
-        return sqlite3.connect(self.db_path)
+    def _get_connection(self) -> sqlite3.Connection:
+        """Returns the calling thread's persistent connection, opening and tuning it on first use."""
+        pooled = getattr(self._local, "pooled", None)
+        if pooled is None:
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=5.0,
+                check_same_thread=False,
+                cached_statements=_STATEMENT_CACHE_SIZE,
+            )
+            conn.row_factory = sqlite3.Row
+            for pragma in _CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            pooled = _PooledConnection(conn)
+            self._local.pooled = pooled
+            with self._pool_lock:
+                self._pool.add(pooled)
+        return pooled.conn
+
+    def close(self) -> None:
+        """Closes every pooled connection. Threads transparently reconnect on their next call."""
+        with self._pool_lock:
+            pooled_connections = list(self._pool)
+            self._pool.clear()
+        for pooled in pooled_connections:
+            try:
+                pooled.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
 
     def _init_db(self):
-        with closing(self._get_connection()) as conn:
-            with conn:  # Context manager for the transaction (auto-commits)
-                cursor = conn.cursor()
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS media_items (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        relative_path TEXT NOT NULL,
-                        image_url TEXT,
-                        title TEXT NOT NULL,
-                        season TEXT
-                    )
-                ''')
-                
-                # Dynamically inject new state columns into existing databases
-                columns = [
-                    ("description", "TEXT"),
-                    ("genre", "TEXT"),
-                    ("rating", "TEXT"),
-                    ("torrent_data", "TEXT"),
-                    ("conversion_data", "TEXT"),
-                    ("is_season", "INTEGER DEFAULT 0"),
-                    ("media_type", "TEXT DEFAULT 'movie'"),
-                    ("tmdb_id", "TEXT")
-                ]
-                for col_name, col_type in columns:
-                    try:
-                        cursor.execute(f'ALTER TABLE media_items ADD COLUMN {col_name} {col_type}')
-                    except sqlite3.OperationalError:
-                        pass # Column already exists
-                        
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS tmdb_cache (
-                        id TEXT,
-                        type TEXT,
-                        data TEXT,
-                        PRIMARY KEY (id, type)
-                    )
-                ''')
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS torrent_cache (
-                        hash TEXT PRIMARY KEY,
-                        path TEXT,
-                        data TEXT
-                    )
-                ''')
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS conversion_cache (
-                        path TEXT PRIMARY KEY,
-                        data TEXT
-                    )
-                ''')
+        """Brings the schema up to date. A current database costs a single PRAGMA user_version read."""
+        conn = self._get_connection()
+        current_version = conn.execute('PRAGMA user_version').fetchone()[0]
+        for version, step in self._MIGRATIONS:
+            if version <= current_version:
+                continue
+            cursor = conn.cursor()
+            # Explicit BEGIN: the sqlite3 module would otherwise autocommit each DDL statement.
+            cursor.execute('BEGIN IMMEDIATE')
+            try:
+                step(self, cursor)
+                cursor.execute(f'PRAGMA user_version = {int(version)}')
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    def _migrate_base_schema(self, cursor: sqlite3.Cursor) -> None:
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS media_items (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                relative_path TEXT NOT NULL,
+                image_url TEXT,
+                title TEXT NOT NULL,
+                season TEXT
+            )
+        ''')
+
+        # Databases created before versioning may be missing any of the later state columns
+        cursor.execute('PRAGMA table_info(media_items)')
+        existing_columns = {row[1] for row in cursor.fetchall()}
+        columns = [
+            ("description", "TEXT"),
+            ("genre", "TEXT"),
+            ("rating", "TEXT"),
+            ("torrent_data", "TEXT"),
+            ("conversion_data", "TEXT"),
+            ("is_season", "INTEGER DEFAULT 0"),
+            ("media_type", "TEXT DEFAULT 'movie'"),
+            ("tmdb_id", "TEXT")
+        ]
+        for col_name, col_type in columns:
+            if col_name not in existing_columns:
+                cursor.execute(f'ALTER TABLE media_items ADD COLUMN {col_name} {col_type}')
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS tmdb_cache (
+                id TEXT,
+                type TEXT,
+                data TEXT,
+                PRIMARY KEY (id, type)
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS torrent_cache (
+                hash TEXT PRIMARY KEY,
+                path TEXT,
+                data TEXT
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS conversion_cache (
+                path TEXT PRIMARY KEY,
+                data TEXT
+            )
+        ''')
+
+    def _migrate_normalized_telemetry(self, cursor: sqlite3.Cursor) -> None:
+        """Adds typed mirrors of the torrent_data/conversion_data blobs and backfills them once."""
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS torrent_state (
+                item_id INTEGER PRIMARY KEY,
+                hash TEXT NOT NULL,
+                name TEXT,
+                progress REAL DEFAULT 0,
+                state TEXT,
+                human_state TEXT,
+                save_path TEXT,
+                eta INTEGER DEFAULT 0,
+                download_speed INTEGER DEFAULT 0,
+                total_size INTEGER DEFAULT 0
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_torrent_state_hash ON torrent_state (hash)')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS conversion_jobs (
+                item_id INTEGER NOT NULL,
+                path TEXT NOT NULL,
+                db_status TEXT,
+                stage_results TEXT,
+                sub_status TEXT,
+                gen_log TEXT,
+                ff_tail TEXT,
+                prog INTEGER DEFAULT 0,
+                initial_size_bytes INTEGER DEFAULT 0,
+                final_size_bytes INTEGER DEFAULT 0,
+                size_diff_pct REAL DEFAULT 0,
+                conversion_total_minutes REAL DEFAULT 0,
+                gen_log_remote_path TEXT,
+                ff_log_remote_path TEXT,
+                gen_log_local_path TEXT,
+                ff_log_local_path TEXT,
+                PRIMARY KEY (item_id, path)
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_conversion_jobs_status ON conversion_jobs (db_status COLLATE NOCASE)')
+
+        cursor.execute('SELECT id, torrent_data, conversion_data FROM media_items')
+        placeholders = ", ".join("?" * len(_V2_CONVERSION_JOB_COLUMNS))
+        for item_id, torrent_data, conversion_data in cursor.fetchall():
+            torrent_row = _torrent_state_row(item_id, torrent_data)
+            if torrent_row is not None:
+                cursor.execute(
+                    f'INSERT OR REPLACE INTO torrent_state ({", ".join(_V2_TORRENT_STATE_COLUMNS)}) '
+                    f'VALUES ({", ".join("?" * len(_V2_TORRENT_STATE_COLUMNS))})',
+                    torrent_row[:len(_V2_TORRENT_STATE_COLUMNS)],
+                )
+            cursor.executemany(
+                f'INSERT OR REPLACE INTO conversion_jobs ({", ".join(_V2_CONVERSION_JOB_COLUMNS)}) VALUES ({placeholders})',
+                _v2_conversion_job_rows(item_id, conversion_data),
+            )
+
+    def _migrate_tmdb_title_index(self, cursor: sqlite3.Cursor) -> None:
+        """Promotes full_title out of the cached TMDB JSON into indexed columns for title recovery."""
+        cursor.execute('ALTER TABLE tmdb_cache ADD COLUMN full_title TEXT')
+        cursor.execute('ALTER TABLE tmdb_cache ADD COLUMN normalized_title TEXT')
+        cursor.execute('SELECT id, type, data FROM tmdb_cache WHERE data LIKE ?', ('%"full_title"%',))
+        backfill = []
+        for tmdb_id, media_type, data in cursor.fetchall():
+            full_title, normalized_title = _tmdb_titles(data)
+            if full_title:
+                backfill.append((full_title, normalized_title, tmdb_id, media_type))
+        cursor.executemany('UPDATE tmdb_cache SET full_title = ?, normalized_title = ? WHERE id = ? AND type = ?', backfill)
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_tmdb_cache_full_title ON tmdb_cache (full_title)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_tmdb_cache_normalized_title ON tmdb_cache (normalized_title)')
+
+    def _migrate_lookup_indexes(self, cursor: sqlite3.Cursor) -> None:
+        # torrent_cache.path is probed for every completed torrent each poll cycle.
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_torrent_cache_path ON torrent_cache (path)')
+
+    def _migrate_conversion_log_store(self, cursor: sqlite3.Cursor) -> None:
+        """Moves gen_log/ff_tail bodies out of media_items and conversion_jobs into a deduplicated, compressed store."""
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS conversion_logs (
+                digest TEXT PRIMARY KEY,
+                length INTEGER NOT NULL,
+                body BLOB NOT NULL
+            )
+        ''')
+        # conversion_jobs only mirrors media_items.conversion_data, so it is rebuilt rather than altered.
+        cursor.execute('DROP TABLE IF EXISTS conversion_jobs')
+        cursor.execute('''
+            CREATE TABLE conversion_jobs (
+                item_id INTEGER NOT NULL,
+                path TEXT NOT NULL,
+                db_status TEXT,
+                stage_results TEXT,
+                sub_status TEXT,
+                gen_log_ref TEXT,
+                gen_log_len INTEGER DEFAULT 0,
+                ff_tail_ref TEXT,
+                ff_tail_len INTEGER DEFAULT 0,
+                prog INTEGER DEFAULT 0,
+                initial_size_bytes INTEGER DEFAULT 0,
+                final_size_bytes INTEGER DEFAULT 0,
+                size_diff_pct REAL DEFAULT 0,
+                conversion_total_minutes REAL DEFAULT 0,
+                gen_log_remote_path TEXT,
+                ff_log_remote_path TEXT,
+                gen_log_local_path TEXT,
+                ff_log_local_path TEXT,
+                PRIMARY KEY (item_id, path)
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_conversion_jobs_status ON conversion_jobs (db_status COLLATE NOCASE)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_conversion_jobs_gen_log_ref ON conversion_jobs (gen_log_ref)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_conversion_jobs_ff_tail_ref ON conversion_jobs (ff_tail_ref)')
+
+        cursor.execute("SELECT id, conversion_data FROM media_items WHERE conversion_data IS NOT NULL AND conversion_data != ''")
+        for item_id, conversion_data in cursor.fetchall():
+            stored, jobs = self._externalize_logs(cursor, conversion_data)
+            cursor.execute('UPDATE media_items SET conversion_data = ? WHERE id = ?', (stored, item_id))
+            self._write_conversion_jobs(cursor, item_id, jobs)
+
+    def _migrate_torrent_display_columns(self, cursor: sqlite3.Cursor) -> None:
+        """Adds the card's pill/progress-bar classes to torrent_state so the grid can render from it alone."""
+        cursor.execute('ALTER TABLE torrent_state ADD COLUMN pill_class TEXT')
+        cursor.execute('ALTER TABLE torrent_state ADD COLUMN pb_style TEXT')
+        cursor.execute("SELECT id, torrent_data FROM media_items WHERE torrent_data IS NOT NULL AND torrent_data != ''")
+        self._write_torrent_states(cursor, cursor.fetchall())
+
+    # Ordered (user_version, step) pairs. Append new steps; never edit or reorder applied ones.
+    _MIGRATIONS = (
+        (1, _migrate_base_schema),
+        (2, _migrate_normalized_telemetry),
+        (3, _migrate_tmdb_title_index),
+        (4, _migrate_lookup_indexes),
+        (5, _migrate_conversion_log_store),
+        (6, _migrate_torrent_display_columns),
+    )
+
+    def explain_query_plan(self, sql: str, params: Tuple = ()) -> List[str]:
+        """Returns the EXPLAIN QUERY PLAN detail lines for a statement, for index regression checks."""
+        cursor = self._get_connection().cursor()
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return [row['detail'] for row in cursor.fetchall()]
+
+    def _write_torrent_states(self, cursor: sqlite3.Cursor, updates: List[Tuple[int, Optional[str]]]) -> None:
+        rows = []
+        cleared = []
+        for item_id, data in updates:
+            row = _torrent_state_row(item_id, data)
+            if row is None:
+                cleared.append((item_id,))
+            else:
+                rows.append(row)
+        if cleared:
+            cursor.executemany('DELETE FROM torrent_state WHERE item_id = ?', cleared)
+        if rows:
+            cursor.executemany(_SQL_UPSERT_TORRENT_STATE, rows)
+
+    def _write_conversion_jobs(self, cursor: sqlite3.Cursor, item_id: int, jobs: List[Any]) -> None:
+        """Syncs an item's job rows with its payload, touching only the jobs that were added, changed or dropped."""
+        cursor.execute('SELECT path, gen_log_ref, ff_tail_ref FROM conversion_jobs WHERE item_id = ?', (item_id,))
+        previous = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+        rows = _conversion_job_rows(item_id, jobs)
+        paths = {row[1] for row in rows}
+        vanished = [(item_id, path) for path in previous if path not in paths]
+        if vanished:
+            cursor.executemany('DELETE FROM conversion_jobs WHERE item_id = ? AND path = ?', vanished)
+        if rows:
+            cursor.executemany(_SQL_UPSERT_CONVERSION_JOB, rows)
+        ref_columns = [_CONVERSION_JOB_COLUMNS.index(ref) for _, ref, _ in _LOG_FIELDS]
+        kept_refs = {row[i] for row in rows for i in ref_columns}
+        dropped_refs = {ref for refs in previous.values() for ref in refs if ref and ref not in kept_refs}
+        self._prune_conversion_logs(cursor, dropped_refs)
+
+    def _store_log(self, cursor: sqlite3.Cursor, text: str) -> str:
+        """Stores a log body once per distinct content and returns its digest."""
+        digest = _log_digest(text)
+        cursor.execute(_SQL_CONVERSION_LOG_EXISTS, (digest,))
+        if cursor.fetchone() is None:
+            cursor.execute(
+                'INSERT INTO conversion_logs (digest, length, body) VALUES (?, ?, ?)',
+                (digest, len(text), zlib.compress(text.encode("utf-8"), _LOG_COMPRESSION_LEVEL)),
+            )
+        return digest
+
+    def _load_log(self, cursor: sqlite3.Cursor, digest: Optional[str]) -> str:
+        if not digest:
+            return ""
+        cursor.execute(_SQL_CONVERSION_LOG_BY_DIGEST, (digest,))
+        row = cursor.fetchone()
+        if not row:
+            return ""
+        try:
+            return zlib.decompress(row[0]).decode("utf-8", errors="ignore")
+        except zlib.error:
+            return ""
+
+    def _prune_conversion_logs(self, cursor: sqlite3.Cursor, digests) -> None:
+        """Drops the given log bodies once no conversion job references them any more."""
+        if digests:
+            cursor.executemany(
+                "DELETE FROM conversion_logs WHERE digest = ? "
+                "AND NOT EXISTS (SELECT 1 FROM conversion_jobs WHERE gen_log_ref = ?) "
+                "AND NOT EXISTS (SELECT 1 FROM conversion_jobs WHERE ff_tail_ref = ?)",
+                [(digest, digest, digest) for digest in digests],
+            )
+
+    def _externalize_logs(self, cursor: sqlite3.Cursor, data: Optional[str]) -> Tuple[Optional[str], List[Any]]:
+        """
+        Swaps each job's gen_log/ff_tail body for a log store reference plus its length.
+        Returns the payload to keep in media_items and the externalized job dicts.
+        """
+        parsed, jobs = _payload_jobs(data)
+        externalized = False
+        for job in jobs:
+            # Path-less jobs get no conversion_jobs row to hold their references, so their logs stay inline.
+            if not isinstance(job, dict) or not job.get("path"):
+                continue
+            for body_key, ref_key, len_key in _LOG_FIELDS:
+                if body_key in job:
+                    text = str(job.pop(body_key) or "")
+                    job[ref_key] = self._store_log(cursor, text) if text else ""
+                    job[len_key] = len(text)
+                    externalized = True
+        return (json.dumps(parsed) if externalized else data), jobs
 
     def _row_to_entity(self, row: sqlite3.Row) -> MediaItem:
         return MediaItem(
@@ -78,160 +602,291 @@ class SQLiteMediaRepository(IMediaRepository):
             genre=row.keys() and 'genre' in row.keys() and row['genre'] or None,
             rating=row.keys() and 'rating' in row.keys() and row['rating'] or None,
             torrent_data=row.keys() and 'torrent_data' in row.keys() and row['torrent_data'] or None,
+            # Log bodies stay in the store; jobs carry *_ref/*_len and are read via get_conversion_job_logs().
             conversion_data=row.keys() and 'conversion_data' in row.keys() and row['conversion_data'] or None,
             is_season=row.keys() and 'is_season' in row.keys() and row['is_season'] or 0,
             media_type=row.keys() and 'media_type' in row.keys() and row['media_type'] or 'movie',
             tmdb_id=row.keys() and 'tmdb_id' in row.keys() and row['tmdb_id'] or None
         )
 
+    def _row_to_torrent_state(self, row: sqlite3.Row) -> TorrentState:
+        return TorrentState(
+            hash=row['hash'],
+            name=row['name'] or "",
+            progress=row['progress'] or 0.0,
+            state=row['state'] or "",
+            save_path=row['save_path'] or "",
+            eta=row['eta'] or 0,
+            download_speed=row['download_speed'] or 0,
+            total_size=row['total_size'] or 0,
+            human_state=row['human_state'] or "",
+            pill_class=row['pill_class'] or "",
+            pb_style=row['pb_style'] or "",
+            item_id=row['item_id'],
+        )
+
+    def _row_to_conversion_job(self, row: sqlite3.Row, include_logs: bool = True) -> ConversionJob:
+        gen_log = ff_tail = ""
+        if include_logs:
+            cursor = self._get_connection().cursor()
+            gen_log = self._load_log(cursor, row['gen_log_ref'])
+            ff_tail = self._load_log(cursor, row['ff_tail_ref'])
+        try:
+            stage_results = json.loads(row['stage_results'] or "{}")
+        except ValueError:
+            stage_results = {}
+        return ConversionJob(
+            path=row['path'],
+            db_status=row['db_status'] or "",
+            stage_results=stage_results if isinstance(stage_results, dict) else {},
+            sub_status=row['sub_status'] or "",
+            gen_log=gen_log,
+            ff_tail=ff_tail,
+            gen_log_len=row['gen_log_len'] or 0,
+            ff_tail_len=row['ff_tail_len'] or 0,
+            prog=row['prog'] or 0,
+            initial_size_bytes=row['initial_size_bytes'] or 0,
+            final_size_bytes=row['final_size_bytes'] or 0,
+            size_diff_pct=row['size_diff_pct'] or 0.0,
+            conversion_total_minutes=row['conversion_total_minutes'] or 0.0,
+            gen_log_remote_path=row['gen_log_remote_path'] or "",
+            ff_log_remote_path=row['ff_log_remote_path'] or "",
+            gen_log_local_path=row['gen_log_local_path'] or "",
+            ff_log_local_path=row['ff_log_local_path'] or "",
+            item_id=row['item_id'],
+        )
+
     def add_item(self, item: MediaItem) -> int:
-        with closing(self._get_connection()) as conn:
-            with conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO media_items (relative_path, image_url, title, season, is_season, media_type, tmdb_id)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (item.relative_path, item.image_url, item.title, item.season, item.is_season, item.media_type, item.tmdb_id))
-                return cursor.lastrowid
+        conn = self._get_connection()
+        with conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO media_items (relative_path, image_url, title, season, is_season, media_type, tmdb_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (item.relative_path, item.image_url, item.title, item.season, item.is_season, item.media_type, item.tmdb_id))
+            return cursor.lastrowid
 
     def get_all_items(self) -> List[MediaItem]:
-        with closing(self._get_connection()) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM media_items')
-            rows = cursor.fetchall()
-            return [self._row_to_entity(row) for row in rows]
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        cursor.execute('SELECT * FROM media_items')
+        rows = cursor.fetchall()
+        return [self._row_to_entity(row) for row in rows]
+
+    def get_item_summaries(self) -> List[MediaItemSummary]:
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        cursor.execute(_SQL_ITEM_SUMMARIES)
+        return [
+            MediaItemSummary(
+                id=row['id'],
+                relative_path=row['relative_path'],
+                title=row['title'],
+                season=row['season'],
+                is_season=row['is_season'] or 0,
+                media_type=row['media_type'] or 'movie',
+                torrent_data=row['torrent_data'] or None,
+                torrent_hash=row['torrent_hash'] or "",
+                torrent_state=row['torrent_state'] or "",
+                conversion_job_count=row['job_count'],
+                conversion_completed=row['job_count'] > 0 and row['completed_count'] == row['job_count'],
+            )
+            for row in cursor.fetchall()
+        ]
 
     def get_item(self, item_id: int) -> Optional[MediaItem]:
         if item_id is None:
             return None
-        with closing(self._get_connection()) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM media_items WHERE id = ?', (item_id,))
-            row = cursor.fetchone()
-            return self._row_to_entity(row) if row else None
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        cursor.execute(_SQL_ITEM_BY_ID, (item_id,))
+        row = cursor.fetchone()
+        return self._row_to_entity(row) if row else None
 
     def delete_item(self, item_id: int) -> bool:
         if item_id is None:
             return False
-            
-        with closing(self._get_connection()) as conn:
-            with conn:
-                cursor = conn.cursor()
-                cursor.execute('DELETE FROM media_items WHERE id = ?', (item_id,))
-                return cursor.rowcount > 0
+
+        conn = self._get_connection()
+        with conn:
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM media_items WHERE id = ?', (item_id,))
+            deleted = cursor.rowcount > 0
+            cursor.execute('DELETE FROM torrent_state WHERE item_id = ?', (item_id,))
+            self._write_conversion_jobs(cursor, item_id, [])
+            return deleted
 
     def update_item_title(self, item_id: int, title: str) -> None:
         if item_id is None:
             return
-        with closing(self._get_connection()) as conn:
-            with conn:
-                cursor = conn.cursor()
-                cursor.execute('UPDATE media_items SET title = ? WHERE id = ?', (title, item_id))
+        conn = self._get_connection()
+        with conn:
+            cursor = conn.cursor()
+            cursor.execute('UPDATE media_items SET title = ? WHERE id = ?', (title, item_id))
 
     def update_item_image_url(self, item_id: int, image_url: str) -> None:
         if item_id is None:
             return
-        with closing(self._get_connection()) as conn:
-            with conn:
-                cursor = conn.cursor()
-                cursor.execute('UPDATE media_items SET image_url = ? WHERE id = ?', (image_url, item_id))
+        conn = self._get_connection()
+        with conn:
+            cursor = conn.cursor()
+            cursor.execute('UPDATE media_items SET image_url = ? WHERE id = ?', (image_url, item_id))
 
     def update_tmdb_id(self, item_id: int, tmdb_id: str) -> None:
         if item_id is None:
             return
-        with closing(self._get_connection()) as conn:
-            with conn:
-                cursor = conn.cursor()
-                try:
-                    cursor.execute('UPDATE media_items SET tmdb_id = ? WHERE id = ?', (tmdb_id, item_id))
-                except sqlite3.OperationalError:
-                    pass
+        conn = self._get_connection()
+        with conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute('UPDATE media_items SET tmdb_id = ? WHERE id = ?', (tmdb_id, item_id))
+            except sqlite3.OperationalError:
+                pass
 
     def update_metadata(self, item_id: int, description: str, genre: str, rating: str) -> None:
         if item_id is None:
             return
-        with closing(self._get_connection()) as conn:
-            with conn:
-                cursor = conn.cursor()
-                cursor.execute('UPDATE media_items SET description=?, genre=?, rating=? WHERE id=?', (description, genre, rating, item_id))
+        conn = self._get_connection()
+        with conn:
+            cursor = conn.cursor()
+            cursor.execute('UPDATE media_items SET description=?, genre=?, rating=? WHERE id=?', (description, genre, rating, item_id))
 
     def update_torrent_data(self, item_id: int, data: str) -> None:
         if item_id is None:
             return
-        with closing(self._get_connection()) as conn:
-            with conn:
-                cursor = conn.cursor()
-                cursor.execute('UPDATE media_items SET torrent_data=? WHERE id=?', (data, item_id))
+        conn = self._get_connection()
+        with conn:
+            cursor = conn.cursor()
+            # IS NOT guard: identical payloads never dirty the row or the WAL.
+            cursor.execute('UPDATE media_items SET torrent_data=? WHERE id=? AND torrent_data IS NOT ?', (data, item_id, data))
+            if cursor.rowcount > 0:
+                self._write_torrent_states(cursor, [(item_id, data)])
+
+    def update_torrent_data_many(self, updates: List[Tuple[int, str]]) -> None:
+        rows = [(data, item_id, data) for item_id, data in updates if item_id is not None]
+        if not rows:
+            return
+        conn = self._get_connection()
+        with conn:
+            cursor = conn.cursor()
+            cursor.executemany('UPDATE media_items SET torrent_data=? WHERE id=? AND torrent_data IS NOT ?', rows)
+            self._write_torrent_states(cursor, [(item_id, data) for data, item_id, _ in rows])
 
     def update_conversion_data(self, item_id: int, data: str) -> None:
         if item_id is None:
             return
-        with closing(self._get_connection()) as conn:
-            with conn:
-                cursor = conn.cursor()
-                cursor.execute('UPDATE media_items SET conversion_data=? WHERE id=?', (data, item_id))
+        conn = self._get_connection()
+        with conn:
+            cursor = conn.cursor()
+            # Log bodies go to the content-addressed store; the row keeps only references, so a poll
+            # that re-sends the same logs matches the IS NOT guard and rewrites nothing.
+            stored, jobs = self._externalize_logs(cursor, data)
+            cursor.execute('UPDATE media_items SET conversion_data=? WHERE id=? AND conversion_data IS NOT ?', (stored, item_id, stored))
+            if cursor.rowcount > 0:
+                self._write_conversion_jobs(cursor, item_id, jobs)
+
+    def get_torrent_state(self, item_id: int) -> Optional[TorrentState]:
+        if item_id is None:
+            return None
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        cursor.execute(_SQL_TORRENT_STATE_BY_ITEM, (item_id,))
+        row = cursor.fetchone()
+        return self._row_to_torrent_state(row) if row else None
+
+    def get_conversion_jobs(self, item_id: int, include_logs: bool = True) -> List[ConversionJob]:
+        if item_id is None:
+            return []
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        cursor.execute(_SQL_CONVERSION_JOBS_BY_ITEM, (item_id,))
+        return [self._row_to_conversion_job(row, include_logs) for row in cursor.fetchall()]
+
+    def get_conversion_job_logs(self, item_id: int, path: str) -> Tuple[str, str]:
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        cursor.execute(_SQL_CONVERSION_JOB_LOG_REFS, (item_id, path))
+        row = cursor.fetchone()
+        if not row:
+            return "", ""
+        return self._load_log(cursor, row['gen_log_ref']), self._load_log(cursor, row['ff_tail_ref'])
+
+    def get_conversion_jobs_by_status(self, db_status: str) -> List[ConversionJob]:
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        cursor.execute(_SQL_CONVERSION_JOBS_BY_STATUS, (db_status,))
+        return [self._row_to_conversion_job(row) for row in cursor.fetchall()]
 
     def get_tmdb_cache(self, tmdb_id: str, media_type: str) -> str:
-        with closing(self._get_connection()) as conn:
-            cursor = conn.cursor()
-            cursor.execute('SELECT data FROM tmdb_cache WHERE id = ? AND type = ?', (tmdb_id, media_type))
-            row = cursor.fetchone()
-            return row[0] if row else ""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        cursor.execute(_SQL_TMDB_CACHE_BY_KEY, (tmdb_id, media_type))
+        row = cursor.fetchone()
+        return row[0] if row else ""
 
     def recover_tmdb_id_by_title(self, title: str) -> Optional[str]:
-        with closing(self._get_connection()) as conn:
-            cursor = conn.cursor()
-            search_str = f'%"full_title": "{title}"%'
-            cursor.execute('SELECT id FROM tmdb_cache WHERE data LIKE ? LIMIT 1', (search_str,))
+        if not title:
+            return None
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        cursor.execute(_SQL_TMDB_ID_BY_FULL_TITLE, (title,))
+        row = cursor.fetchone()
+        if not row:
+            cursor.execute(_SQL_TMDB_ID_BY_NORMALIZED_TITLE, (_normalize_title(title),))
             row = cursor.fetchone()
-            return row[0] if row else None
+        return row[0] if row else None
 
     def set_tmdb_cache(self, tmdb_id: str, media_type: str, data: str) -> None:
-        with closing(self._get_connection()) as conn:
-            with conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT OR REPLACE INTO tmdb_cache (id, type, data)
-                    VALUES (?, ?, ?)
-                ''', (tmdb_id, media_type, data))
+        conn = self._get_connection()
+        with conn:
+            cursor = conn.cursor()
+            full_title, normalized_title = _tmdb_titles(data)
+            cursor.execute('''
+                INSERT OR REPLACE INTO tmdb_cache (id, type, data, full_title, normalized_title)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (tmdb_id, media_type, data, full_title, normalized_title))
 
     def get_torrent_cache(self, hash_val: str) -> str:
-        with closing(self._get_connection()) as conn:
-            cursor = conn.cursor()
-            cursor.execute('SELECT data FROM torrent_cache WHERE hash = ?', (hash_val,))
-            row = cursor.fetchone()
-            return row[0] if row else ""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        cursor.execute(_SQL_TORRENT_CACHE_BY_HASH, (hash_val,))
+        row = cursor.fetchone()
+        return row[0] if row else ""
 
     def set_torrent_cache(self, hash_val: str, path: str, data: str) -> None:
-        with closing(self._get_connection()) as conn:
-            with conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT OR REPLACE INTO torrent_cache (hash, path, data)
-                    VALUES (?, ?, ?)
-                ''', (hash_val, path, data))
+        conn = self._get_connection()
+        with conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT OR REPLACE INTO torrent_cache (hash, path, data)
+                VALUES (?, ?, ?)
+            ''', (hash_val, path, data))
 
     def get_torrent_cache_by_path(self, path: str) -> str:
-        with closing(self._get_connection()) as conn:
-            cursor = conn.cursor()
-            cursor.execute('SELECT data FROM torrent_cache WHERE path = ?', (path,))
-            row = cursor.fetchone()
-            return row[0] if row else ""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        cursor.execute(_SQL_TORRENT_CACHE_BY_PATH, (path,))
+        row = cursor.fetchone()
+        return row[0] if row else ""
+
+    def has_torrent_cache_for_path(self, path: str) -> bool:
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        cursor.execute(_SQL_TORRENT_CACHE_EXISTS_FOR_PATH, (path,))
+        return cursor.fetchone() is not None
 
     def get_conversion_cache(self, path: str) -> str:
-        with closing(self._get_connection()) as conn:
-            cursor = conn.cursor()
-            cursor.execute('SELECT data FROM conversion_cache WHERE path = ?', (path,))
-            row = cursor.fetchone()
-            return row[0] if row else ""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        cursor.execute(_SQL_CONVERSION_CACHE_BY_PATH, (path,))
+        row = cursor.fetchone()
+        return row[0] if row else ""
 
     def set_conversion_cache(self, path: str, data: str) -> None:
-        with closing(self._get_connection()) as conn:
-            with conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT OR REPLACE INTO conversion_cache (path, data)
-                    VALUES (?, ?)
-                ''', (path, data))
\ No newline at end of file
+        conn = self._get_connection()
+        with conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT OR REPLACE INTO conversion_cache (path, data)
+                VALUES (?, ?)
+            ''', (path, data))
@@ -0,0 +1,161 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+MANIFEST_NAME = "manifest.json"
+_COPY_CHUNK_BYTES = 256 * 1024
+
+
+class SFTPLogDownloader:
+    """
+    Fetches conversion logs over SFTP channels that are reused across polls.
+    Files in a batch are transferred concurrently; each pool thread owns its own SFTPClient,
+    because paramiko's blocking calls match responses on a channel without coordinating between
+    threads. Every transfer prefetches the whole file, so a season's worth of logs costs one
+    round of pipelined reads instead of one blocking get() per file.
+    A per-directory manifest records the remote size/mtime each local copy was taken from;
+    files whose remote stat still matches are skipped without being read. Callers may tag a file
+    with the version of the telemetry row that named it: while that version and the remote path
+    are unchanged and the local copy exists, the file is not even stat'ed.
+    """
+    def __init__(self, open_sftp: Callable[[], object], max_workers: int = 4, timeout: float = 30.0):
+        self._open_sftp = open_sftp
+        self.timeout = timeout
+        # Pool thread ident -> that thread's SFTPClient.
+        self._channels: Dict[int, object] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sftp-log")
+
+    def _channel(self):
+        """The calling thread's SFTP channel, opened on first use with a read timeout."""
+        ident = threading.get_ident()
+        with self._lock:
+            sftp = self._channels.get(ident)
+        if sftp is None:
+            sftp = self._open_sftp()
+            channel = sftp.get_channel() if hasattr(sftp, "get_channel") else None
+            if channel is not None:
+                channel.settimeout(self.timeout)
+            with self._lock:
+                self._channels[ident] = sftp
+        return sftp
+
+    def _drop_channel(self) -> None:
+        with self._lock:
+            sftp = self._channels.pop(threading.get_ident(), None)
+        self._close_quietly(sftp)
+
+    @staticmethod
+    def _close_quietly(sftp) -> None:
+        try:
+            if sftp:
+                sftp.close()
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        """Closes every SFTP channel; the next download opens new ones."""
+        with self._lock:
+            channels, self._channels = list(self._channels.values()), {}
+        for sftp in channels:
+            self._close_quietly(sftp)
+
+    def shutdown(self) -> None:
+        self.close()
+        self._pool.shutdown(wait=True)
+
+    @staticmethod
+    def _load_manifest(local_dir: str) -> Dict[str, dict]:
+        try:
+            with open(os.path.join(local_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            return manifest if isinstance(manifest, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _save_manifest(local_dir: str, manifest: Dict[str, dict]) -> None:
+        tmp_path = os.path.join(local_dir, MANIFEST_NAME + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, os.path.join(local_dir, MANIFEST_NAME))
+
+    @staticmethod
+    def _is_current(known: Optional[dict], remote_path: str, version: Optional[str], local_path: str) -> bool:
+        """True when the local copy was taken for this exact row version and remote path."""
+        return (version is not None and known is not None and known.get("version") == version
+                and known.get("remote") == remote_path and os.path.exists(local_path))
+
+    def _fetch(self, remote_path: str, local_path: str, known: Optional[dict], version: Optional[str]) -> Tuple[bool, Optional[dict]]:
+        """Returns (ok, manifest entry). Skips the transfer when the remote stat matches `known`."""
+        if known is not None:
+            known = {key: value for key, value in known.items() if key != "version"}
+        try:
+            ok, entry = self._transfer(self._channel(), remote_path, local_path, known)
+        except (FileNotFoundError, PermissionError):
+            raise
+        except Exception:
+            # Anything but a per-file error may mean a dead or timed-out channel; reopen it next time.
+            self._drop_channel()
+            raise
+        if version is not None:
+            entry = dict(entry, version=version)
+        return ok, entry
+
+    @staticmethod
+    def _transfer(sftp, remote_path: str, local_path: str, known: Optional[dict]) -> Tuple[bool, Optional[dict]]:
+        attrs = sftp.stat(remote_path)
+        entry = {"remote": remote_path, "size": attrs.st_size, "mtime": attrs.st_mtime}
+        if known == entry and os.path.exists(local_path) and os.path.getsize(local_path) == attrs.st_size:
+            return True, entry
+
+        tmp_path = local_path + ".part"
+        with sftp.open(remote_path, 'rb') as remote_file:
+            remote_file.prefetch(attrs.st_size)
+            with open(tmp_path, 'wb') as local_file:
+                while True:
+                    chunk = remote_file.read(_COPY_CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    local_file.write(chunk)
+        os.replace(tmp_path, local_path)
+        return True, entry
+
+    def download(self, local_dir: str, files: List[Tuple[str, str, Optional[str]]]) -> Dict[str, bool]:
+        """
+        Mirrors (remote_path, local_name, row version or None) entries into local_dir concurrently.
+        Returns {local_name: ok}; a failed file never fails the rest of the batch.
+        """
+        if not files:
+            return {}
+        os.makedirs(local_dir, exist_ok=True)
+        manifest = self._load_manifest(local_dir)
+        outcome: Dict[str, bool] = {}
+        futures = {}
+        for remote_path, local_name, version in files:
+            local_path = os.path.join(local_dir, local_name)
+            known = manifest.get(local_name)
+            if self._is_current(known, remote_path, version, local_path):
+                outcome[local_name] = True
+            else:
+                futures[local_name] = self._pool.submit(self._fetch, remote_path, local_path, known, version)
+
+        changed = False
+        for local_name, future in futures.items():
+            try:
+                ok, entry = future.result()
+            except Exception:
+                ok, entry = False, None
+            outcome[local_name] = ok
+            if entry is not None and manifest.get(local_name) != entry:
+                manifest[local_name] = entry
+                changed = True
+
+        if changed:
+            try:
+                self._save_manifest(local_dir, manifest)
+            except OSError:
+                pass
+        return outcome
@@ -0,0 +1,97 @@
+import random
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Mapping, Optional
+
+# Activity classes an item can report after a poll.
+ACTIVE = "active"
+IDLE = "idle"
+DONE = "done"
+
+_IDLE_TORRENT_STATES = {
+    "pausedDL", "stoppedDL", "queuedDL", "stalledDL", "checkingResumeData",
+    "error", "missingFiles", "unknown",
+}
+# Statuses a job never leaves on its own; matches the finished check in media_grid.
+_TERMINAL_CONVERSION_STATUSES = {"COMPLETED", "FAILED", "REJECTED"}
+_IDLE_CONVERSION_STATUSES = {"QUEUED", "PENDING", "WAITING", "ERROR"} | _TERMINAL_CONVERSION_STATUSES
+
+
+def torrent_activity(qbit_state: Optional[str], progress: float) -> str:
+    """Downloading torrents poll fast; finished, queued, stalled or paused ones poll slowly."""
+    if progress >= 1.0 or (qbit_state or "unknown") in _IDLE_TORRENT_STATES:
+        return IDLE
+    return ACTIVE
+
+
+def conversion_activity(jobs: Iterable[Mapping[str, Any]]) -> str:
+    """Encoding jobs poll fast, waiting jobs slowly; once every job completed, failed or was rejected polling stops."""
+    statuses = [str(job.get("db_status", "") or "").upper() for job in jobs if isinstance(job, Mapping)]
+    if not statuses:
+        return IDLE
+    if all(status in _TERMINAL_CONVERSION_STATUSES for status in statuses):
+        return DONE
+    if any(status not in _IDLE_CONVERSION_STATUSES for status in statuses):
+        return ACTIVE
+    return IDLE
+
+
+class PollScheduler:
+    """
+    Per-item poll deadlines driven by each item's last reported activity.
+    Active items are due every `active_interval` seconds, idle ones every `idle_interval`, and done
+    items are never due again until forgotten. Failed polls back off exponentially up to
+    `max_backoff`. Every interval gets +/- `jitter` (a fraction) so items drift apart instead of
+    all firing on the same tick.
+    """
+    def __init__(self, active_interval: float, idle_interval: float, max_backoff: float = 300.0,
+                 jitter: float = 0.1, clock: Callable[[], float] = time.monotonic,
+                 rng: Callable[[], float] = random.random):
+        self.intervals: Dict[str, Optional[float]] = {ACTIVE: active_interval, IDLE: idle_interval, DONE: None}
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self._clock = clock
+        self._rng = rng
+        self._next_due: Dict[Hashable, Optional[float]] = {}
+        self._failures: Dict[Hashable, int] = {}
+
+    def _jittered(self, seconds: float) -> float:
+        return seconds * (1.0 + self.jitter * (2.0 * self._rng() - 1.0))
+
+    def is_due(self, key: Hashable) -> bool:
+        """Unseen items are due immediately; done items never are."""
+        if key not in self._next_due:
+            return True
+        deadline = self._next_due[key]
+        return deadline is not None and self._clock() >= deadline
+
+    def due(self, keys: Iterable[Hashable]) -> List[Hashable]:
+        return [key for key in keys if self.is_due(key)]
+
+    def record(self, key: Hashable, activity: str) -> None:
+        """Schedules the next poll of a successfully polled item from its activity class."""
+        self._failures.pop(key, None)
+        interval = self.intervals.get(activity, self.intervals[IDLE])
+        self._next_due[key] = None if interval is None else self._clock() + self._jittered(interval)
+
+    def record_error(self, key: Hashable) -> None:
+        """Backs a failing item off: active_interval * 2^failures, capped at max_backoff."""
+        failures = self._failures.get(key, 0) + 1
+        self._failures[key] = failures
+        delay = min(self.intervals[ACTIVE] * (2 ** failures), self.max_backoff)
+        self._next_due[key] = self._clock() + self._jittered(delay)
+
+    def forget(self, key: Hashable) -> None:
+        self._next_due.pop(key, None)
+        self._failures.pop(key, None)
+
+    def seconds_until_due(self, keys: Iterable[Hashable]) -> Optional[float]:
+        """Time until the earliest of `keys` is due (0 if one already is), or None if none will be."""
+        now = self._clock()
+        waits = []
+        for key in keys:
+            if key not in self._next_due:
+                return 0.0
+            deadline = self._next_due[key]
+            if deadline is not None:
+                waits.append(max(0.0, deadline - now))
+        return min(waits) if waits else None
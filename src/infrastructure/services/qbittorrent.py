@@ -1,33 +1,62 @@
 import os
 import json
-import qbittorrentapi
+import threading
+from typing import Dict, Iterable, List, Set, Tuple
+
 from PyQt6.QtCore import QThread, pyqtSignal
 
 from src.domain.repositories import IMediaRepository
-from src.application.use_cases.sync_use_cases import SyncTorrentStateUseCase
-from src.utils.formatting import format_size, format_speed
+from src.application.use_cases.sync_use_cases import SyncTorrentStatesBatchUseCase
+from src.infrastructure.services.qbittorrent_session import get_qbittorrent_session
+from src.infrastructure.services.torrent_file_cache import get_torrent_file_cache, torrent_stamp
+from src.infrastructure.services.poll_scheduler import ACTIVE, PollScheduler, torrent_activity
+from src.infrastructure.services.torrent_index import MaindataTorrentFeed, TorrentIndex, TrackedTorrentFeed
+from src.utils.formatting import format_active_state, format_size, format_speed
 
-class QBittorrentClient(QThread):
+class QBittorrentBatchAddWorker(QThread):
+    """
+    Submits queued torrents with one torrents_add call per save path (the API takes a single
+    save_path per request), all over the shared session.
+    """
     finished = pyqtSignal(str)
     error = pyqtSignal(str)
     added = pyqtSignal()
+    # File name stems qBittorrent accepted / refused (with the reason), per save path group.
+    submitted = pyqtSignal(list)
+    rejected = pyqtSignal(list, str)
 
-    def __init__(self, torrent_bytes: bytes, save_path: str, parent=None) -> None:
+    def __init__(self, torrents: List[Tuple[str, bytes, str]], parent=None) -> None:
         super().__init__(parent)
-        self.torrent_bytes = torrent_bytes
-        self.save_path = save_path
+        # (file name stem, torrent bytes, save path); the stem is the infohash when it could be computed
+        self.torrents = torrents
 
     def run(self) -> None:
-        host = os.getenv("QBIT_HOST")
-        port = os.getenv("QBIT_PORT")
-        try:
-            client = qbittorrentapi.Client(host=f"http://{host}:{port}", username=os.getenv("QBIT_USER"), password=os.getenv("QBIT_PASS"))
-            client.auth_log_in()
-            res = client.torrents_add(torrent_files={'downloaded.torrent': self.torrent_bytes}, save_path=self.save_path)
-            self.finished.emit(f"QBittorrent Push Success! Server Response: {res}")
+        by_save_path: Dict[str, Dict[str, bytes]] = {}
+        for name, torrent_bytes, save_path in self.torrents:
+            by_save_path.setdefault(save_path, {})[name] = torrent_bytes
+
+        failures = []
+        submitted = 0
+        for save_path, torrents in by_save_path.items():
+            names = list(torrents)
+            try:
+                res = get_qbittorrent_session().torrents_add(
+                    torrent_files={f"{name}.torrent": data for name, data in torrents.items()}, save_path=save_path
+                )
+                if str(res).strip().lower().startswith("fail"):
+                    raise RuntimeError(f"server refused the torrents ({res})")
+            except Exception as e:
+                failures.append(f"{save_path}: {str(e)}")
+                self.rejected.emit(names, str(e))
+                continue
+            submitted += len(names)
+            self.submitted.emit(names)
+            self.finished.emit(f"QBittorrent Push Success ({len(names)} torrent(s) to {save_path})! Server Response: {res}")
+
+        if submitted:
             self.added.emit()
-        except Exception as e:
-            self.error.emit(f"QBittorrent Upload Failed: {str(e)}")
+        if failures:
+            self.error.emit(f"QBittorrent Upload Failed: {'; '.join(failures)}")
 
 class QBittorrentDeleteWorker(QThread):
     finished = pyqtSignal(bool)
@@ -39,12 +68,8 @@ class QBittorrentDeleteWorker(QThread):
         self.delete_files = delete_files
 
     def run(self) -> None:
-        host = os.getenv("QBIT_HOST")
-        port = os.getenv("QBIT_PORT")
         try:
-            client = qbittorrentapi.Client(host=f"http://{host}:{port}", username=os.getenv("QBIT_USER"), password=os.getenv("QBIT_PASS"))
-            client.auth_log_in()
-            client.torrents_delete(delete_files=self.delete_files, torrent_hashes=self.torrent_hashes)
+            get_qbittorrent_session().torrents_delete(delete_files=self.delete_files, torrent_hashes=self.torrent_hashes)
             self.finished.emit(True)
         except Exception as e:
             self.error.emit(f"Delete Failed: {str(e)}")
@@ -58,38 +83,91 @@ class QBittorrentFilesWorker(QThread):
         self.torrent_hash = torrent_hash
 
     def run(self) -> None:
-        host = os.getenv("QBIT_HOST")
-        port = os.getenv("QBIT_PORT")
         try:
-            client = qbittorrentapi.Client(host=f"http://{host}:{port}", username=os.getenv("QBIT_USER"), password=os.getenv("QBIT_PASS"))
-            client.auth_log_in()
-            raw_files = client.torrents_files(torrent_hash=self.torrent_hash)
-            normalized_files = []
-            for f in raw_files:
-                try:
-                    size_val = f.get("size", 0)
-                except Exception:
-                    size_val = 0
-                normalized_files.append({
-                    "name": f.get("name", ""),
-                    "size": int(size_val or 0),
-                })
-            self.finished.emit(normalized_files)
+            files = get_torrent_file_cache().get_files(get_qbittorrent_session(), self.torrent_hash)
+            self.finished.emit(files)
         except Exception as e:
             self.error.emit(f"Fetch Files Failed: {str(e)}")
 
+class QBittorrentSizeWorker(QThread):
+    finished = pyqtSignal(int)
+    error = pyqtSignal(str)
+
+    def __init__(self, torrent_hash: str, parent=None):
+        super().__init__(parent)
+        self.torrent_hash = torrent_hash
+
+    def run(self) -> None:
+        try:
+            # Ask for this one hash instead of pulling the whole torrent list.
+            torrents = get_qbittorrent_session().torrents_info(torrent_hashes=self.torrent_hash)
+            matched = next((t for t in torrents if str(t.get("hash", "")) == self.torrent_hash), None)
+            if not matched:
+                self.finished.emit(0)
+                return
+            raw_size = matched.get("total_size")
+            if raw_size is None:
+                raw_size = matched.get("size", 0)
+            self.finished.emit(int(raw_size or 0))
+        except Exception as e:
+            self.error.emit(f"Fetch Size Failed: {str(e)}")
+
 class QBittorrentPollingThread(QThread):
     """
     Background infrastructure task that polls QBittorrent and updates the repository as the Source of Truth.
-    It calls the SyncTorrentStateUseCase which emits signals to the UI.
+    Each cycle's updates are committed together through SyncTorrentStatesBatchUseCase, which emits signals to the UI.
     """
-    def __init__(self, repo: IMediaRepository, sync_use_case: SyncTorrentStateUseCase, parent=None):
+    def __init__(self, repo: IMediaRepository, sync_use_case: SyncTorrentStatesBatchUseCase, parent=None):
         super().__init__(parent)
         self.active = True
         self.repo = repo
         self.sync_use_case = sync_use_case
-        self.host = os.getenv("QBIT_HOST")
-        self.port = os.getenv("QBIT_PORT")
+        # "maindata" follows incremental sync/maindata deltas; "tracked" (alias "full") asks torrents_info()
+        # for the linked hashes only and discovers unmatched items with a slower filtered scan.
+        self.poll_mode = (os.getenv("QBIT_POLL_MODE") or "maindata").strip().lower()
+        self.feed = MaindataTorrentFeed()
+        self.tracked_feed = TrackedTorrentFeed(
+            discovery_interval=float(os.getenv("QBIT_DISCOVERY_INTERVAL") or 30),
+            category=os.getenv("QBIT_DISCOVERY_CATEGORY") or None,
+            tag=os.getenv("QBIT_DISCOVERY_TAG") or None,
+        )
+        # Downloading and not yet matched torrents refresh every 2 s, queued/stalled/paused ones every 30 s.
+        self.scheduler = PollScheduler(active_interval=2.0, idle_interval=30.0)
+        # What qBittorrent reported in the last poll, for is_known_torrent(), minus hashes whose deletion
+        # was requested since; those are dropped from the set once the poll no longer sees them.
+        self._last_index = TorrentIndex()
+        self._deleted_hashes: Set[str] = set()
+        self._deleted_lock = threading.Lock()
+
+    def is_known_torrent(self, torrent_hash: str) -> bool:
+        """
+        Whether qBittorrent reported the hash during the last poll and it has not been deleted since.
+        Safe to call from the GUI thread: it only probes in-memory sets, never the DB or the network.
+        """
+        with self._deleted_lock:
+            if torrent_hash in self._deleted_hashes:
+                return False
+        return torrent_hash in self._last_index
+
+    def forget_torrents(self, hashes: Iterable[str]) -> None:
+        """Stops reporting torrents as known as soon as their deletion is requested, ahead of the next poll."""
+        with self._deleted_lock:
+            self._deleted_hashes.update(hashes)
+
+    @staticmethod
+    def _is_settled(item) -> bool:
+        """Completed movies, and completed seasons whose conversion also finished, need no further polling."""
+        # After conversion completes, torrent files are removed and qBittorrent reports MissingFiles.
+        # Freezing here keeps the UI at "Completed".
+        return item.torrent_state == "Completed" and (not item.is_season or item.conversion_completed)
+
+    def _refresh_index(self, client, media_items) -> TorrentIndex:
+        if self.poll_mode in ("tracked", "full"):
+            active = [item for item in media_items if not self._is_settled(item)]
+            tracked = {item.torrent_hash for item in active if item.torrent_hash}
+            has_unmatched = any(not item.torrent_hash for item in active)
+            return self.tracked_feed.refresh(client, tracked, has_unmatched)
+        return self.feed.refresh(client)
 
     def run(self) -> None:
         QBIT_STATE_MAP = {
@@ -103,56 +181,31 @@ class QBittorrentPollingThread(QThread):
             "error":                ("Error",         "PillDanger",      "PbUnknown"),
         }
 
-        client = None
+        client = get_qbittorrent_session()
+        file_cache = get_torrent_file_cache()
 
         while self.active:
+            pending_updates: List[Tuple[int, str]] = []
+            due_items = []
             try:
-                # 1. Self-healing connection. Re-authenticate if client is None
-                if not client:
-                    client = qbittorrentapi.Client(
-                        host=f"http://{self.host}:{self.port}", 
-                        username=os.getenv("QBIT_USER"), 
-                        password=os.getenv("QBIT_PASS")
-                    )
-                    client.auth_log_in()
+                # Projection only: conversion payloads (full logs) are never loaded by the poller.
+                media_items = self.repo.get_item_summaries()
+                # Completed items are never polled again (their DB state is final; nothing to rewrite or
+                # re-broadcast); the rest only when the scheduler says they are due.
+                due_items = [item for item in media_items if not self._is_settled(item) and self.scheduler.is_due(item.id)]
 
-                torrents = client.torrents_info()
-                media_items = self.repo.get_all_items()
+                # 1. Self-healing connection: the shared session logs in lazily and re-authenticates on 403.
+                # Each item resolves by dictionary lookup instead of scanning every torrent.
+                # An idle library makes no qBittorrent request at all.
+                index = self._refresh_index(client, due_items) if due_items else TorrentIndex()
 
-                known_hashes = set()
-                for item in media_items:
-                    t_data = item.torrent_data
-                    if t_data:
-                        try:
-                            t_info = json.loads(t_data)
-                            known_hashes.add(t_info.get("hash", ""))
-                        except: pass
+                known_hashes = {item.torrent_hash for item in media_items if item.torrent_hash}
 
-                for item in media_items:
+                for item in due_items:
                     t_data = item.torrent_data
                     t_info = json.loads(t_data) if t_data else {}
-                    
-                    # Prevent redundant qBittorrent processing if already completed
-                    if t_info.get("human_state") == "Completed":
-                        if not item.is_season:
-                            # Fully cached movie. Emit DB state directly and skip API evaluation.
-                            self.sync_use_case.execute(item.id, t_data)
-                            continue
-                        # TV series: also freeze if conversion is fully done.
-                        # After conversion completes, torrent files are removed and qBittorrent
-                        # reports MissingFiles. Freezing here keeps the UI at "Completed".
-                        if item.is_season and item.conversion_data:
-                            try:
-                                c_info = json.loads(item.conversion_data)
-                                if isinstance(c_info, dict): c_info = [c_info]
-                                if c_info and all(
-                                    str(r.get("db_status", "")).upper() == "COMPLETED"
-                                    for r in c_info
-                                ):
-                                    self.sync_use_case.execute(item.id, t_data)
-                                    continue
-                            except Exception:
-                                pass
+                    # The UI rendered this row from the DB, so only payloads that differ need a write/signal.
+                    self.sync_use_case.prime(item.id, t_data)
                     
                     current_hash = t_info.get("hash", "")
                     expected_name = t_info.get("name", "")
@@ -180,35 +233,24 @@ class QBittorrentPollingThread(QThread):
                     
                     matched_t = None
                     if current_hash:
-                        matched_t = next((t for t in torrents if t.get('hash') == current_hash), None)
+                        matched_t = index.by_hash(current_hash)
                         if matched_t and not _season_matches(matched_t):
                             matched_t = None
                     if not matched_t and expected_name:
-                        matched_t = next((t for t in torrents if t.get('name') == expected_name), None)
+                        matched_t = index.by_name(expected_name)
                         if matched_t and not _season_matches(matched_t):
                             matched_t = None
                     if not matched_t:
-                        target_suffix = item.relative_path.replace("\\", "/")
-                        candidates = []
-                        for t in torrents:
-                            sp = t.get('save_path', '').replace("\\", "/")
-                            # Do not block by known_hashes here: stale DB mappings can otherwise never self-heal.
-                            if (sp.endswith(target_suffix) or target_suffix in sp) and _season_matches(t):
-                                candidates.append(t)
-
+                        # Do not block by known_hashes here: stale DB mappings can otherwise never self-heal.
+                        path_candidates = index.by_path(item.relative_path)
                         # If no season-aware candidate is found, fallback to path-only candidates.
-                        if not candidates:
-                            for t in torrents:
-                                sp = t.get('save_path', '').replace("\\", "/")
-                                if sp.endswith(target_suffix) or target_suffix in sp:
-                                    candidates.append(t)
-
+                        candidates = [t for t in path_candidates if _season_matches(t)] or path_candidates
                         if candidates:
-                            candidates.sort(key=lambda x: x.get('added_on', 0), reverse=True)
-                            matched_t = candidates[0]
+                            matched_t = max(candidates, key=lambda x: x.get('added_on', 0))
                     
                     if matched_t:
                         new_hash = matched_t.get('hash', '')
+                        file_cache.observe(matched_t)
                         known_hashes.add(new_hash)
                         
                         prog_val = matched_t.get('progress', 0.0)
@@ -223,13 +265,13 @@ class QBittorrentPollingThread(QThread):
                         if is_completed:
                             human_state, pill_class, pb_style = "Completed", "PillSuccess", "PbSuccess"
                             target_path = item.relative_path.replace("\\", "/")
-                            if not self.repo.get_torrent_cache_by_path(target_path):
+                            if not self.repo.has_torrent_cache_for_path(target_path):
                                 self.repo.set_torrent_cache(new_hash, target_path, json.dumps(matched_t))
                         else:
                             fallback = (state.replace("DL","").replace("UP","").strip().capitalize(), "PillWarning", "PbWarning")
                             human_state, pill_class, pb_style = QBIT_STATE_MAP.get(state, fallback)
                             
-                        active_state_str = f"State: {human_state} | Progress: {int(prog_val * 100)}% | Size: {format_size(raw_size)}"
+                        active_state_str = format_active_state(human_state, prog_val, raw_size)
                         t_info.update({
                             "hash": new_hash,
                             "name": matched_t.get('name', ''),
@@ -240,36 +282,54 @@ class QBittorrentPollingThread(QThread):
                             "raw_size_bytes": int(raw_size or 0),
                             "size_str": format_size(raw_size),
                             "speed_str": format_speed(dlspeed),
-                            "active_state_str": active_state_str
+                            "active_state_str": active_state_str,
+                            "qbit_state": state,
+                            "save_path": matched_t.get('save_path', ''),
+                            "eta": int(matched_t.get('eta', 0) or 0),
+                            "dl_speed": int(dlspeed or 0),
                         })
                         
-                        # Fetch file list (with sizes) for TV series to enable accurate episode rows
-                        cached_files = t_info.get("files", [])
-                        files_need_refresh = (
-                            not isinstance(cached_files, list)
-                            or not cached_files
-                            or any(not isinstance(f, dict) or "size" not in f for f in cached_files)
-                        )
-                        if item.is_season and files_need_refresh and new_hash:
+                        # File list (with sizes) for TV series to enable accurate episode rows. The shared
+                        # cache only goes back to qBittorrent when the torrent's size/completion changed.
+                        if item.is_season and new_hash:
+                            stamp = list(torrent_stamp(matched_t))
+                            stored_files = t_info.get("files")
+                            if current_hash == new_hash and t_info.get("files_stamp") == stamp and isinstance(stored_files, list):
+                                # The list persisted with this item is still current; no need to fetch it after a restart.
+                                file_cache.seed(new_hash, stamp, stored_files)
                             try:
-                                raw_files = client.torrents_files(torrent_hash=new_hash)
-                                t_info["files"] = [
-                                    {
-                                        "name": f.get("name", ""),
-                                        "size": int(f.get("size", 0) or 0),
-                                    }
-                                    for f in raw_files
-                                ]
+                                files = file_cache.get_files(client, new_hash)
+                                if files:
+                                    t_info["files"] = files
+                                    t_info["files_stamp"] = stamp
                             except:
                                 pass
                         
-                        # Use Domain Case to update DB and emit via EventBus
-                        self.sync_use_case.execute(item.id, json.dumps(t_info))
+                        pending_updates.append((item.id, json.dumps(t_info)))
+                        self.scheduler.record(item.id, torrent_activity(state, prog_val))
+                    else:
+                        # Not in qBittorrent yet, typically an add from moments ago: keep looking on the fast
+                        # cadence so its first progress shows up within one cycle.
+                        self.scheduler.record(item.id, ACTIVE)
+
+                if due_items:
+                    self._last_index = index
+                    with self._deleted_lock:
+                        self._deleted_hashes = {h for h in self._deleted_hashes if h in index}
                         
             except Exception as e:
-                # If connection fails, set client to None so it tries to log in again next loop
-                client = None
+                # If the cycle fails, drop the login and the sync cursor so the next cycle starts clean
+                client.reset()
+                self.feed.reset()
+                for item in due_items:
+                    self.scheduler.record_error(item.id)
                 print(f"[QBitTracker] Polling cycle failed, will retry: {str(e)}")
+
+            # Use Domain Case to commit the whole cycle at once and emit via EventBus
+            try:
+                self.sync_use_case.execute(pending_updates)
+            except Exception as e:
+                print(f"[QBitTracker] Failed to persist torrent state: {str(e)}")
                 
             # 2. Responsive sleeping: Sleep in 100ms chunks to allow instant thread termination
             for _ in range(20):
@@ -277,6 +337,7 @@ class QBittorrentPollingThread(QThread):
                     break
                 self.msleep(100)
 
-    def stop(self):
+    def stop(self, wait: bool = True):
         self.active = False
-        self.wait()
\ No newline at end of file
+        if wait:
+            self.wait()
\ No newline at end of file
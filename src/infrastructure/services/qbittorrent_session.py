@@ -0,0 +1,85 @@
+import os
+import threading
+from typing import Any, Callable, Optional
+
+import qbittorrentapi
+
+# (connect, read) seconds for every Web API request.
+DEFAULT_TIMEOUT = (5.0, 30.0)
+
+
+class QBittorrentSession:
+    """
+    Process-wide qBittorrent Web API session shared by every worker.
+    One qbittorrentapi.Client (and with it one pooled, keep-alive requests.Session holding the SID
+    cookie) is created lazily and logged in once. Requests are serialized through a lock, so the
+    poller, the add/delete/files workers and the UI never log in side by side. A 403 (expired or
+    revoked SID) triggers one re-login and retry; a connection error drops the client so the next
+    call starts from a fresh login.
+    Attribute access proxies the client's API methods: session.torrents_info(...) is
+    session.call("torrents_info", ...).
+    """
+    def __init__(self, host: Optional[str], port: Optional[str], username: Optional[str], password: Optional[str],
+                 timeout=DEFAULT_TIMEOUT, client_factory: Optional[Callable[..., Any]] = None):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self._client_factory = client_factory or qbittorrentapi.Client
+        self._client = None
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_env(cls) -> "QBittorrentSession":
+        return cls(os.getenv("QBIT_HOST"), os.getenv("QBIT_PORT"), os.getenv("QBIT_USER"), os.getenv("QBIT_PASS"))
+
+    def is_configured(self) -> bool:
+        return all([self.host, self.port, self.username, self.password])
+
+    def _connected_client(self):
+        if self._client is None:
+            client = self._client_factory(
+                host=f"http://{self.host}:{self.port}",
+                username=self.username,
+                password=self.password,
+                REQUESTS_ARGS={"timeout": self.timeout},
+            )
+            client.auth_log_in()
+            self._client = client
+        return self._client
+
+    def reset(self) -> None:
+        """Forgets the current login; the next call logs in again."""
+        with self._lock:
+            self._client = None
+
+    def call(self, method: str, *args, **kwargs):
+        with self._lock:
+            client = self._connected_client()
+            try:
+                return getattr(client, method)(*args, **kwargs)
+            except qbittorrentapi.Forbidden403Error:
+                client.auth_log_in()
+                return getattr(client, method)(*args, **kwargs)
+            except qbittorrentapi.APIConnectionError:
+                self._client = None
+                raise
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return lambda *args, **kwargs: self.call(name, *args, **kwargs)
+
+
+_session: Optional[QBittorrentSession] = None
+_session_lock = threading.Lock()
+
+
+def get_qbittorrent_session() -> QBittorrentSession:
+    """Returns the shared session, created from QBIT_HOST/QBIT_PORT/QBIT_USER/QBIT_PASS on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = QBittorrentSession.from_env()
+        return _session
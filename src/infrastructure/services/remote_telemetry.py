@@ -2,9 +2,12 @@
 import sqlite3
 import json
 import os
-import glob
 import re
 import argparse
+import codecs
+import hashlib
+import base64
+import sys
 from datetime import datetime
 
 
@@ -19,252 +22,637 @@ def _parse_hms_to_seconds(match_obj):
     except Exception:
         return 0.0
 
-def main():
-    parser = argparse.ArgumentParser(description="Fetch telemetry data from SQLite and logs.")
-    parser.add_argument('--target', required=True, help="Target title")
-    parser.add_argument('--season', default="", help="Explicit season")
-    parser.add_argument('--dir', required=True, help="Remote app directory")
-    args = parser.parse_args()
 
-    results = []
-    try:
-        db_path = f"{args.dir}/conversion_data.db"
-        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, timeout=10.0)
-        cur = conn.cursor()
-        
-        # 1. Base words from the torrent name
-        clean_target = args.target.replace('_', ' ').replace('.', ' ')
-        words = [w for w in re.split(r'\W+', clean_target) if len(w) > 2]
-        words = [w for w in words if w.lower() not in ('season', 'episode')]
-        words = [w for w in words if not (w.isdigit() and len(w) == 4)]
-        
-        if not words:
-            words = [clean_target]
-            
-        # Fetch broadly first
-        query = "SELECT status, COALESCE(stage_results, '{}'), path FROM jobs WHERE " + " AND ".join(["path LIKE ?"] * len(words)) + " ORDER BY id DESC"
-        cur.execute(query, ['%' + w + '%' for w in words])
-        rows = cur.fetchall()
-        
-        # 2. Extract expected Season and Episode
-        s_num = None
-        e_num = None
-        
-        if args.season:
-            ex_s_match = re.search(r'\d+', str(args.season))
-            if ex_s_match:
-                s_num = int(ex_s_match.group())
-            
-        se_match = re.search(r'(?i)(?:season\s*0*(\d+)|s0*(\d+))(?:.*?(?:episode\s*0*(\d+)|e0*(\d+)))?', clean_target)
-        if se_match:
-            if s_num is None:
-                s_num = int(se_match.group(1) or se_match.group(2))
-            if se_match.group(3) or se_match.group(4):
-                e_num = int(se_match.group(3) or se_match.group(4))
-                
-        filtered_rows = []
-        
-        # 3. Apply strict Python Filtering
-        if s_num is not None:
-            for r in rows:
-                path_str = r[2].lower()
-                path_se = re.search(r'(?i)(?:season\s*0*(\d+)|s0*(\d+))(?:.*?(?:episode\s*0*(\d+)|e0*(\d+)))?', path_str)
-                
-                if path_se:
-                    p_s = int(path_se.group(1) or path_se.group(2))
-                    p_e = None
-                    if path_se.group(3) or path_se.group(4):
-                        p_e = int(path_se.group(3) or path_se.group(4))
-                        
-                    if p_s == s_num:
-                        if e_num is not None:
-                            if p_e == e_num:
-                                filtered_rows.append(r)
-                        else:
+GENERAL_LOG_DIR = "/var/log/conversion/general"
+FFMPEG_LOG_DIR = "/var/log/conversion/ffmpeg"
+
+LOG_KEYWORD_IGNORE = [
+    'action', 'comedy', 'movies', 'scratch', 'data', 'dvdrip',
+    'xvid', 'x264', '1080p', '720p', 'web', 'dl', 'aac2', 'h264',
+    'mkv', 'avi', 'mp4', 'bluray', 'brrip', 'webrip', 'x265',
+    'hevc', 'hdr', 'proper', 'repack'
+]
+
+
+class LogIndex:
+    """
+    Newest-first listing of one log directory with memoized keyword -> newest matching file lookups.
+    The directory is only re-listed when its own mtime changes (a log was created, removed or
+    renamed), so an agent keeping the index between requests costs one stat per poll.
+    """
+    def __init__(self, log_dir):
+        self.log_dir = log_dir
+        self._dir_mtime = None
+        self._entries = []
+        self._matches = {}
+
+    def refresh(self):
+        try:
+            dir_mtime = os.stat(self.log_dir).st_mtime_ns
+        except OSError:
+            dir_mtime = None
+        if dir_mtime is not None and dir_mtime == self._dir_mtime:
+            return
+        entries = []
+        if dir_mtime is not None:
+            try:
+                with os.scandir(self.log_dir) as it:
+                    for entry in it:
+                        if not entry.name.endswith(".log"):
+                            continue
+                        try:
+                            if entry.is_file():
+                                entries.append((entry.stat().st_mtime, entry.path, entry.name.lower()))
+                        except OSError:
+                            continue
+            except OSError:
+                entries = []
+        entries.sort(key=lambda e: e[0], reverse=True)
+        self._entries = [(path, name) for _, path, name in entries]
+        self._matches = {}
+        self._dir_mtime = dir_mtime
+
+    def find(self, keywords):
+        """Newest log whose basename contains any of the keywords, or None."""
+        key = tuple(keywords)
+        if key not in self._matches:
+            self._matches[key] = next((path for path, name in self._entries if any(k in name for k in key)), None)
+        return self._matches[key]
+
+
+GEN_TS_RE = re.compile(r'^(\d{4}-\d{2}-\d{2}_\d{2}:\d{2}:\d{2})\s+-')
+FF_DURATION_RE = re.compile(r"Duration:\s*(\d{2}):(\d{2}):(\d{2}(?:\.\d+)?)")
+FF_TIME_RE = re.compile(r"time=(\d{2}):(\d{2}):(\d{2}(?:\.\d+)?)")
+FF_SIZE_RE = re.compile(r"size=\s*([0-9]+)\s*kB")
+FF_BITRATE_RE = re.compile(r"bitrate:\s*([0-9]+(?:\.[0-9]+)?)\s*kb/s")
+FF_TAIL_LINES = 50
+READ_CHUNK_BYTES = 1024 * 1024
+
+
+def _normalize_newlines(text):
+    # Same translation as text-mode universal newlines: ffmpeg progress lines end in a bare \r.
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _hms_seconds(h, m, s):
+    return (int(h) * 3600.0) + (int(m) * 60.0) + float(s)
+
+
+class IncrementalLog:
+    """
+    Follows one log file by byte offset and hands only appended, complete lines to parse_lines().
+    The partial last line is held back until its newline arrives. Truncation or replacement
+    (smaller size or different inode) restarts parsing from the top.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._restart(None)
+
+    def _restart(self, inode):
+        self.inode = inode
+        self.offset = 0
+        self.remainder = ""
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+        self.reset_state()
+
+    def reset_state(self):
+        pass
+
+    def parse_lines(self, text):
+        pass
+
+    def update(self):
+        st = os.stat(self.path)
+        if st.st_ino != self.inode or st.st_size < self.offset:
+            self._restart(st.st_ino)
+        if st.st_size == self.offset:
+            return
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            while True:
+                data = f.read(READ_CHUNK_BYTES)
+                if not data:
+                    break
+                self.offset += len(data)
+                self._feed(self._decoder.decode(data))
+
+    def _feed(self, text):
+        pending = self.remainder + text
+        # A trailing \r may be the first half of \r\n; keep it until the next byte is known.
+        held = "\r" if pending.endswith("\r") else ""
+        if held:
+            pending = pending[:-1]
+        pending = _normalize_newlines(pending)
+        cut = pending.rfind("\n") + 1
+        self.remainder = pending[cut:] + held
+        if cut:
+            self.parse_lines(pending[:cut])
+
+    def pending_line(self):
+        """The unterminated last line, as a full re-read would see it."""
+        return _normalize_newlines(self.remainder)
+
+
+class GeneralLog(IncrementalLog):
+    """General pipeline log: keeps the text plus subtitle markers and pipeline start/end timestamps."""
+    def reset_state(self):
+        self.text = ""
+        self.markers = set()
+        self.start_ts = None
+        self.end_ts = None
+
+    def parse_lines(self, text):
+        self.text += text
+        self._scan(text)
+
+    def _scan(self, text):
+        for marker in ("Extracting subtitle", "Extracted", "Converted", "No subtitle", "Continuing with video only"):
+            if marker in text:
+                self.markers.add(marker)
+        if "PIPELINE" not in text:
+            return
+        for line in text.splitlines():
+            ts_match = GEN_TS_RE.match(line)
+            if not ts_match:
+                continue
+            if "PIPELINE STARTED" in line and self.start_ts is None:
+                try:
+                    self.start_ts = datetime.strptime(ts_match.group(1), "%Y-%m-%d_%H:%M:%S")
+                except Exception:
+                    self.start_ts = None
+            if "PIPELINE SUCCESS" in line:
+                try:
+                    self.end_ts = datetime.strptime(ts_match.group(1), "%Y-%m-%d_%H:%M:%S")
+                except Exception:
+                    self.end_ts = None
+
+    def snapshot(self):
+        """Returns (content, sub_status or None, conversion minutes or 0.0), counting the pending line."""
+        saved = (set(self.markers), self.start_ts, self.end_ts)
+        pending = self.pending_line()
+        self._scan(pending)
+        markers, start_ts, end_ts = self.markers, self.start_ts, self.end_ts
+        self.markers, self.start_ts, self.end_ts = saved
+
+        sub_status = None
+        if "Extracting subtitle" in markers: sub_status = "In Progress"
+        if "Extracted" in markers or "Converted" in markers: sub_status = "Completed"
+        if "No subtitle" in markers or "Continuing with video only" in markers: sub_status = "None"
+
+        # Conversion time = PIPELINE STARTED -> PIPELINE SUCCESS timestamps from general log.
+        minutes = 0.0
+        if start_ts and end_ts and end_ts >= start_ts:
+            minutes = round((end_ts - start_ts).total_seconds() / 60.0, 2)
+        return (self.text + pending).strip(), sub_status, minutes
+
+
+class FfmpegLog(IncrementalLog):
+    """ffmpeg progress log: keeps only the first Duration/bitrate and the latest time=/size= values."""
+    def reset_state(self):
+        self.duration_s = None
+        self.bitrate_kbps = None
+        self.last_time_s = None
+        self.last_size_kb = None
+
+    def parse_lines(self, text):
+        self._scan(text)
+
+    def _scan(self, text):
+        if self.duration_s is None:
+            duration_match = FF_DURATION_RE.search(text)
+            if duration_match:
+                self.duration_s = _parse_hms_to_seconds(duration_match)
+        if self.bitrate_kbps is None:
+            bitrate_match = FF_BITRATE_RE.search(text)
+            if bitrate_match:
+                self.bitrate_kbps = float(bitrate_match.group(1))
+        time_matches = FF_TIME_RE.findall(text)
+        if time_matches:
+            self.last_time_s = _hms_seconds(*time_matches[-1])
+        size_matches = FF_SIZE_RE.findall(text)
+        if size_matches:
+            self.last_size_kb = int(size_matches[-1])
+
+    def snapshot(self):
+        """Returns (duration_s or 0.0, last time_s, last size_kb, bitrate_kbps), counting the pending line."""
+        saved = (self.duration_s, self.bitrate_kbps, self.last_time_s, self.last_size_kb)
+        self._scan(self.pending_line())
+        current = (self.duration_s or 0.0, self.last_time_s, self.last_size_kb, self.bitrate_kbps)
+        self.duration_s, self.bitrate_kbps, self.last_time_s, self.last_size_kb = saved
+        return current
+
+
+def read_tail(path, max_lines=FF_TAIL_LINES, window=64 * 1024):
+    """Last max_lines lines of a file, read backwards from the end in growing windows."""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        window = min(size, window)
+        while True:
+            f.seek(size - window)
+            lines = _normalize_newlines(f.read(window).decode('utf-8', errors='ignore')).split("\n")
+            # One extra line is needed because the first line of a partial window may be cut.
+            if window >= size or len(lines) > max_lines + 2:
+                break
+            window = min(size, window * 2)
+    if window < size:
+        lines = lines[1:]
+    if lines and lines[-1] == "":
+        lines = lines[:-1]
+    return "\n".join(lines[-max_lines:]).strip()
+
+
+class LogReaders:
+    """Incremental readers per log path; the agent keeps them across requests and sweeps unused ones."""
+    def __init__(self):
+        self._readers = {}
+        self._touched = set()
+
+    def _get(self, path, kind):
+        reader = self._readers.get(path)
+        if not isinstance(reader, kind):
+            reader = kind(path)
+            self._readers[path] = reader
+        self._touched.add(path)
+        reader.update()
+        return reader
+
+    def general(self, path):
+        return self._get(path, GeneralLog)
+
+    def ffmpeg(self, path):
+        return self._get(path, FfmpegLog)
+
+    def sweep(self):
+        """Drops readers for logs no request touched since the previous sweep."""
+        for path in set(self._readers) - self._touched:
+            del self._readers[path]
+        self._touched = set()
+
+
+def scan_jobs(cur):
+    """Single pass over the jobs table shared by every target of a batch."""
+    cur.execute("SELECT status, COALESCE(stage_results, '{}'), path FROM jobs ORDER BY id DESC")
+    return [(status, flags, path or "", (path or "").lower()) for status, flags, path in cur.fetchall()]
+
+
+def match_target_rows(scan_rows, target, season=""):
+    """Selects one media item's (status, stage_results, path) rows from the shared jobs scan."""
+    # 1. Base words from the torrent name
+    clean_target = target.replace('_', ' ').replace('.', ' ')
+    words = [w for w in re.split(r'\W+', clean_target) if len(w) > 2]
+    words = [w for w in words if w.lower() not in ('season', 'episode')]
+    words = [w for w in words if not (w.isdigit() and len(w) == 4)]
+
+    if not words:
+        words = [clean_target]
+
+    # Fetch broadly first: every word must appear in the path (case-insensitive, like SQL LIKE)
+    lowered_words = [w.lower() for w in words]
+    rows = [r[:3] for r in scan_rows if all(w in r[3] for w in lowered_words)]
+
+    # 2. Extract expected Season and Episode
+    s_num = None
+    e_num = None
+
+    if season:
+        ex_s_match = re.search(r'\d+', str(season))
+        if ex_s_match:
+            s_num = int(ex_s_match.group())
+
+    se_match = re.search(r'(?i)(?:season\s*0*(\d+)|s0*(\d+))(?:.*?(?:episode\s*0*(\d+)|e0*(\d+)))?', clean_target)
+    if se_match:
+        if s_num is None:
+            s_num = int(se_match.group(1) or se_match.group(2))
+        if se_match.group(3) or se_match.group(4):
+            e_num = int(se_match.group(3) or se_match.group(4))
+
+    filtered_rows = []
+
+    # 3. Apply strict Python Filtering
+    if s_num is not None:
+        for r in rows:
+            path_str = r[2].lower()
+            path_se = re.search(r'(?i)(?:season\s*0*(\d+)|s0*(\d+))(?:.*?(?:episode\s*0*(\d+)|e0*(\d+)))?', path_str)
+
+            if path_se:
+                p_s = int(path_se.group(1) or path_se.group(2))
+                p_e = None
+                if path_se.group(3) or path_se.group(4):
+                    p_e = int(path_se.group(3) or path_se.group(4))
+
+                if p_s == s_num:
+                    if e_num is not None:
+                        if p_e == e_num:
                             filtered_rows.append(r)
-        else:
-            digits = [w for w in re.split(r'\W+', clean_target) if w.isdigit() and len(w) <= 2]
-            if digits:
-                for r in rows:
-                    path_nums = [n for n in re.split(r'\W+', r[2]) if n.isdigit()]
-                    if all((d in path_nums or f"{int(d):02d}" in path_nums) for d in digits):
+                    else:
                         filtered_rows.append(r)
+    else:
+        digits = [w for w in re.split(r'\W+', clean_target) if w.isdigit() and len(w) <= 2]
+        if digits:
+            for r in rows:
+                path_nums = [n for n in re.split(r'\W+', r[2]) if n.isdigit()]
+                if all((d in path_nums or f"{int(d):02d}" in path_nums) for d in digits):
+                    filtered_rows.append(r)
+        else:
+            filtered_rows = rows
+
+    rows = filtered_rows
+
+    return rows
+
+
+def build_job_result(db_status, stage_flags, db_path, clean_target, gen_index, ff_index, readers):
+    """Assembles the telemetry row of one conversion job from its DB flags and matching logs."""
+    try:
+        flags = json.loads(stage_flags)
+    except:
+        flags = {}
+
+    initial_size_bytes = 0
+    final_size_bytes = 0
+    size_diff_pct = 0.0
+    conversion_total_minutes = 0.0
+
+    linear_path = [
+        "p1-input", "p1-queue", "p2-dequeue", "p2-pass", "p3-router",
+        "p5-check", "p5-pass", "p6-discovery", "p7-heuristics",
+        "p7-audio", "p7-tiers", "p7-outcome", "p8-relocate",
+        "p8-cleanup", "p8-complete"
+    ]
+
+    max_idx = -1
+    for i, node in enumerate(linear_path):
+        if node in flags: max_idx = i
+
+    if max_idx >= 0:
+        for i in range(max_idx):
+            if linear_path[i] not in flags:
+                flags[linear_path[i]] = 'pass'
+
+    # Always infer movie vs tv if we have passed the router
+    if max_idx >= linear_path.index("p3-router"):
+        if not any(k in flags for k in ["p3-movie", "p3-tv"]):
+            if "tv" in db_path.lower() or "season" in db_path.lower() or re.search(r's\d{2}e\d{2}', db_path.lower()):
+                flags["p3-tv"] = 'pass'; flags["p4-tv"] = 'pass'
+                if db_status.upper() == "COMPLETED": flags["p8-tv"] = 'pass'
             else:
-                filtered_rows = rows
-                
-        rows = filtered_rows
-        
-        unique_jobs = {}
-        for db_status, stage_flags, db_path in rows:
-            if db_path not in unique_jobs:
-                unique_jobs[db_path] = (db_status, stage_flags)
-            
-        for db_path, (db_status, stage_flags) in unique_jobs.items():
-            try:
-                flags = json.loads(stage_flags)
-            except:
-                flags = {}
-
-            initial_size_bytes = 0
-            final_size_bytes = 0
-            size_diff_pct = 0.0
-            conversion_total_minutes = 0.0
-
-            linear_path = [
-                "p1-input", "p1-queue", "p2-dequeue", "p2-pass", "p3-router",
-                "p5-check", "p5-pass", "p6-discovery", "p7-heuristics",
-                "p7-audio", "p7-tiers", "p7-outcome", "p8-relocate",
-                "p8-cleanup", "p8-complete"
-            ]
-            
-            max_idx = -1
-            for i, node in enumerate(linear_path):
-                if node in flags: max_idx = i
-                
-            if max_idx >= 0:
-                for i in range(max_idx):
-                    if linear_path[i] not in flags:
-                        flags[linear_path[i]] = 'pass'
-
-            # Always infer movie vs tv if we have passed the router
-            if max_idx >= linear_path.index("p3-router"):
-                if not any(k in flags for k in ["p3-movie", "p3-tv"]):
-                    if "tv" in db_path.lower() or "season" in db_path.lower() or re.search(r's\d{2}e\d{2}', db_path.lower()):
-                        flags["p3-tv"] = 'pass'; flags["p4-tv"] = 'pass'
-                        if db_status.upper() == "COMPLETED": flags["p8-tv"] = 'pass'
-                    else:
-                        flags["p3-movie"] = 'pass'; flags["p4-movie"] = 'pass'
-                        if db_status.upper() == "COMPLETED": flags["p8-movie"] = 'pass'
-
-            if db_status.upper() == "COMPLETED":
-                for c in linear_path:
-                    if c not in flags:
-                        flags[c] = 'pass'
-
-            # Build stable keyword list for log matching.
-            words = [w.lower() for w in re.split(r'\W+', db_path) if len(w) > 3 and not w.isdigit()]
-            ignore = [
-                'action', 'comedy', 'movies', 'scratch', 'data', 'dvdrip',
-                'xvid', 'x264', '1080p', '720p', 'web', 'dl', 'aac2', 'h264',
-                'mkv', 'avi', 'mp4', 'bluray', 'brrip', 'webrip', 'x265',
-                'hevc', 'hdr', 'proper', 'repack'
-            ]
-            keywords = [w for w in words if w not in ignore]
-
-            # Fallback to meaningful target words if path is too generic.
-            if not keywords:
-                target_words = [w.lower() for w in re.split(r'\W+', clean_target) if len(w) > 2 and not w.isdigit()]
-                keywords = [w for w in target_words if w not in ignore]
-
-            gen_log_content = "Pending..."
-            sub_status = "Pending"
-            ff_tail = "Pending..."
-            ff_prog = 0
+                flags["p3-movie"] = 'pass'; flags["p4-movie"] = 'pass'
+                if db_status.upper() == "COMPLETED": flags["p8-movie"] = 'pass'
+
+    if db_status.upper() == "COMPLETED":
+        for c in linear_path:
+            if c not in flags:
+                flags[c] = 'pass'
+
+    # Build stable keyword list for log matching.
+    words = [w.lower() for w in re.split(r'\W+', db_path) if len(w) > 3 and not w.isdigit()]
+    ignore = LOG_KEYWORD_IGNORE
+    keywords = [w for w in words if w not in ignore]
+
+    # Fallback to meaningful target words if path is too generic.
+    if not keywords:
+        target_words = [w.lower() for w in re.split(r'\W+', clean_target) if len(w) > 2 and not w.isdigit()]
+        keywords = [w for w in target_words if w not in ignore]
+
+    gen_log_content = "Pending..."
+    sub_status = "Pending"
+    ff_tail = "Pending..."
+    ff_prog = 0
+
+    try:
+        if os.path.exists(db_path):
+            initial_size_bytes = int(os.path.getsize(db_path))
+    except Exception:
+        pass
+
+    matched_gen = gen_index.find(keywords)
+
+    if matched_gen:
+        try:
+            gen_log_content, gen_sub_status, conversion_total_minutes = readers.general(matched_gen).snapshot()
+            if gen_sub_status: sub_status = gen_sub_status
+        except: pass
+
+    matched_ff = ff_index.find(keywords)
+
+    if matched_ff:
+        try:
+            ff_tail = read_tail(matched_ff)
+            total_s, curr_s, last_size_kb, bitrate_kbps = readers.ffmpeg(matched_ff).snapshot()
+            if total_s > 0 and curr_s is not None:
+                ff_prog = min(int((curr_s / total_s) * 100), 100)
+
+                flags["p7-heuristics"] = 'pass'
+                flags["p7-audio"] = 'pass'
+                flags["p7-t2"] = 'pass' 
+
+            if last_size_kb is not None:
+                final_size_bytes = last_size_kb * 1024
+
+            if initial_size_bytes <= 0 and bitrate_kbps is not None and total_s > 0:
+                initial_size_bytes = int((bitrate_kbps * 1000.0 / 8.0) * total_s)
+
+        except: pass
+
+    if db_status.upper() == "COMPLETED" and final_size_bytes <= 0:
+        try:
+            if os.path.exists(db_path):
+                final_size_bytes = int(os.path.getsize(db_path))
+        except Exception:
+            pass
+
+    if initial_size_bytes > 0 and final_size_bytes > 0:
+        size_diff_pct = round(((initial_size_bytes - final_size_bytes) / float(initial_size_bytes)) * 100.0, 2)
 
+    return {
+        "path": db_path,
+        "db_status": db_status,
+        "stage_results": json.dumps(flags),
+        "sub_status": sub_status,
+        "gen_log": gen_log_content,
+        "ff_tail": ff_tail,
+        "prog": ff_prog,
+        "initial_size_bytes": int(initial_size_bytes),
+        "final_size_bytes": int(final_size_bytes),
+        "size_diff_pct": float(size_diff_pct),
+        "conversion_total_minutes": float(conversion_total_minutes),
+        "gen_log_remote_path": matched_gen or "",
+        "ff_log_remote_path": matched_ff or "",
+    }
+
+
+def collect_target_results(scan_rows, target, season, gen_index, ff_index, readers):
+    clean_target = target.replace('_', ' ').replace('.', ' ')
+    unique_jobs = {}
+    for db_status, stage_flags, db_path in match_target_rows(scan_rows, target, season):
+        if db_path not in unique_jobs:
+            unique_jobs[db_path] = (db_status, stage_flags)
+    return [
+        build_job_result(db_status, stage_flags, db_path, clean_target, gen_index, ff_index, readers)
+        for db_path, (db_status, stage_flags) in unique_jobs.items()
+    ]
+
+
+def collect_target_jobs(cur, target, season=""):
+    """Returns the telemetry rows of every conversion job matching one media item's target."""
+    return collect_batch(cur, [{"key": "", "target": target, "season": season}])[""]
+
+
+def open_jobs_db(app_dir):
+    db_path = f"{app_dir}/conversion_data.db"
+    return sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, timeout=10.0)
+
+
+def row_version(row):
+    return hashlib.sha1(json.dumps(row, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class DeltaEncoder:
+    """
+    Encodes each target's rows against the versions the client already holds ({path: version}):
+      {"path", "v"}                      unchanged row
+      {"path", "v", "base", <fields>}    only the fields that differ from version `base`, with
+                                         "gen_log_append" replacing gen_log when the log only grew
+      {"path", "v", "full": true, ...}   the whole row, when `base` is not the last row sent here
+    The agent keeps one encoder for its lifetime; one-shot runs start empty, so they can only
+    elide unchanged rows.
+    """
+    def __init__(self):
+        self._sent = {}
+
+    def encode(self, key, rows, known):
+        previous = self._sent.get(key, {})
+        current = {}
+        entries = []
+        for row in rows:
+            path = row.get("path")
+            version = row_version(row)
+            current[path] = (version, row)
+            base = known.get(path)
+            if base == version:
+                entries.append({"path": path, "v": version})
+                continue
+            prev = previous.get(path)
+            if base and prev and prev[0] == base:
+                prev_row = prev[1]
+                entry = {"path": path, "v": version, "base": base}
+                for field, value in row.items():
+                    if prev_row.get(field) != value:
+                        entry[field] = value
+                old_log = prev_row.get("gen_log") or ""
+                if "gen_log" in entry and old_log and entry["gen_log"].startswith(old_log):
+                    entry["gen_log_append"] = entry.pop("gen_log")[len(old_log):]
+            else:
+                entry = dict(row, v=version, full=True)
+            entries.append(entry)
+        self._sent[key] = current
+        return entries
+
+
+def collect_batch(cur, targets, gen_index=None, ff_index=None, readers=None, encoder=None):
+    """
+    Answers a list of {key, target, season[, known]} with one jobs-table scan and one log index per
+    directory. Callers that live across requests pass their own LogIndex/LogReaders/DeltaEncoder
+    instances to keep them warm. With an encoder, each target's rows are delta-encoded against
+    its `known` versions; without one, full rows are returned.
+    A failing target only empties its own entry.
+    """
+    scan_rows = scan_jobs(cur)
+    gen_index = gen_index or LogIndex(GENERAL_LOG_DIR)
+    ff_index = ff_index or LogIndex(FFMPEG_LOG_DIR)
+    readers = readers or LogReaders()
+    gen_index.refresh()
+    ff_index.refresh()
+
+    batch_results = {}
+    for t in targets:
+        if not isinstance(t, dict):
+            continue
+        key = str(t.get("key"))
+        batch_results[key] = []
+        try:
+            rows = collect_target_results(scan_rows, str(t.get("target", "")), str(t.get("season", "")), gen_index, ff_index, readers)
+            known = t.get("known") if isinstance(t.get("known"), dict) else {}
+            batch_results[key] = encoder.encode(key, rows, known) if encoder is not None else rows
+        except Exception:
+            pass
+    return batch_results
+
+
+def serve_agent(app_dir):
+    """
+    Long-lived mode: reads one JSON request per stdin line ({"id", "targets"}) and writes one
+    {"id", "results"} line per request. The jobs DB connection, log indexes and log readers stay warm between
+    requests. Exits when the client closes stdin (i.e. the SSH channel goes away).
+    """
+    conn = None
+    gen_index = LogIndex(GENERAL_LOG_DIR)
+    ff_index = LogIndex(FFMPEG_LOG_DIR)
+    readers = LogReaders()
+    encoder = DeltaEncoder()
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+        except ValueError:
+            continue
+        results = {}
+        try:
+            if conn is None:
+                conn = open_jobs_db(app_dir)
+            results = collect_batch(conn.cursor(), request.get("targets") or [], gen_index, ff_index, readers, encoder)
+            readers.sweep()
+        except Exception:
+            # Reopen on the next request, e.g. after the DB file was replaced.
             try:
-                if os.path.exists(db_path):
-                    initial_size_bytes = int(os.path.getsize(db_path))
+                conn.close()
             except Exception:
                 pass
-            
-            logs = sorted(glob.glob("/var/log/conversion/general/*.log"), key=os.path.getmtime, reverse=True)
-            matched_gen = next((log for log in logs if any(k in os.path.basename(log).lower() for k in keywords)), None)
-            
-            if matched_gen:
-                try:
-                    with open(matched_gen, 'r', encoding='utf-8', errors='ignore') as f:
-                        gen_log_content = f.read().strip()
-                    if "Extracting subtitle" in gen_log_content: sub_status = "In Progress"
-                    if "Extracted" in gen_log_content or "Converted" in gen_log_content: sub_status = "Completed"
-                    if "No subtitle" in gen_log_content or "Continuing with video only" in gen_log_content: sub_status = "None"
-
-                    # Conversion time = PIPELINE STARTED -> PIPELINE SUCCESS timestamps from general log.
-                    start_ts = None
-                    end_ts = None
-                    for line in gen_log_content.splitlines():
-                        ts_match = re.match(r'^(\d{4}-\d{2}-\d{2}_\d{2}:\d{2}:\d{2})\s+-', line)
-                        if not ts_match:
-                            continue
-                        if "PIPELINE STARTED" in line and start_ts is None:
-                            try:
-                                start_ts = datetime.strptime(ts_match.group(1), "%Y-%m-%d_%H:%M:%S")
-                            except Exception:
-                                start_ts = None
-                        if "PIPELINE SUCCESS" in line:
-                            try:
-                                end_ts = datetime.strptime(ts_match.group(1), "%Y-%m-%d_%H:%M:%S")
-                            except Exception:
-                                end_ts = None
-
-                    if start_ts and end_ts and end_ts >= start_ts:
-                        conversion_total_minutes = round((end_ts - start_ts).total_seconds() / 60.0, 2)
-                except: pass
-                
-            ff_logs = sorted(glob.glob("/var/log/conversion/ffmpeg/*.log"), key=os.path.getmtime, reverse=True)
-            matched_ff = next((log for log in ff_logs if any(k in os.path.basename(log).lower() for k in keywords)), None)
-
-            if matched_ff:
-                try:
-                    ff_full = ""
-                    with open(matched_ff, 'r', encoding='utf-8', errors='ignore') as f:
-                        ff_lines = f.readlines()
-                        ff_tail = "".join(ff_lines[-50:]).strip()
-                        ff_full = "".join(ff_lines)
-
-                    duration_match = re.search(r"Duration:\s*(\d{2}):(\d{2}):(\d{2}(?:\.\d+)?)", ff_full)
-                    total_s = _parse_hms_to_seconds(duration_match)
-                    if total_s > 0:
-                        time_matches = re.findall(r"time=(\d{2}):(\d{2}):(\d{2}(?:\.\d+)?)", ff_full)
-                        if time_matches and total_s > 0:
-                            ch, cm, cs = time_matches[-1]
-                            curr_s = (int(ch) * 3600.0) + (int(cm) * 60.0) + float(cs)
-                            ff_prog = min(int((curr_s / total_s) * 100), 100)
-                            
-                            flags["p7-heuristics"] = 'pass'
-                            flags["p7-audio"] = 'pass'
-                            flags["p7-t2"] = 'pass' 
-
-                    size_matches = re.findall(r"size=\s*([0-9]+)\s*kB", ff_full)
-                    if size_matches:
-                        final_size_bytes = int(size_matches[-1]) * 1024
-
-                    bitrate_match = re.search(r"bitrate:\s*([0-9]+(?:\.[0-9]+)?)\s*kb/s", ff_full)
-                    if initial_size_bytes <= 0 and bitrate_match and total_s > 0:
-                        kbps = float(bitrate_match.group(1))
-                        initial_size_bytes = int((kbps * 1000.0 / 8.0) * total_s)
-
-                except: pass
-
-            if db_status.upper() == "COMPLETED" and final_size_bytes <= 0:
-                try:
-                    if os.path.exists(db_path):
-                        final_size_bytes = int(os.path.getsize(db_path))
-                except Exception:
-                    pass
-
-            if initial_size_bytes > 0 and final_size_bytes > 0:
-                size_diff_pct = round(((initial_size_bytes - final_size_bytes) / float(initial_size_bytes)) * 100.0, 2)
-                
-            results.append({
-                "path": db_path,
-                "db_status": db_status,
-                "stage_results": json.dumps(flags),
-                "sub_status": sub_status,
-                "gen_log": gen_log_content,
-                "ff_tail": ff_tail,
-                "prog": ff_prog,
-                "initial_size_bytes": int(initial_size_bytes),
-                "final_size_bytes": int(final_size_bytes),
-                "size_diff_pct": float(size_diff_pct),
-                "conversion_total_minutes": float(conversion_total_minutes),
-                "gen_log_remote_path": matched_gen or "",
-                "ff_log_remote_path": matched_ff or "",
-            })
+            conn = None
+        sys.stdout.write(json.dumps({"id": request.get("id"), "results": results}) + "\n")
+        sys.stdout.flush()
 
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch telemetry data from SQLite and logs.")
+    parser.add_argument('--target', default="", help="Target title")
+    parser.add_argument('--season', default="", help="Explicit season")
+    parser.add_argument('--batch', default="", help="Base64 JSON list of {key, target, season} ('-' reads it from stdin); prints {key: rows}")
+    parser.add_argument('--agent', action='store_true', help="Serve line-delimited JSON batch requests on stdin")
+    parser.add_argument('--dir', required=True, help="Remote app directory")
+    args = parser.parse_args()
+
+    if args.agent:
+        serve_agent(args.dir)
+        return
+
+    if args.batch:
+        try:
+            raw_batch = sys.stdin.read() if args.batch == "-" else args.batch
+            targets = json.loads(base64.b64decode(raw_batch).decode('utf-8'))
+        except Exception:
+            targets = []
+        if not isinstance(targets, list):
+            targets = []
+        output = {str(t.get("key")): [] for t in targets if isinstance(t, dict)}
+    else:
+        targets = None
+        output = []
+
+    try:
+        conn = open_jobs_db(args.dir)
+        cur = conn.cursor()
+        if targets is None:
+            output = collect_target_jobs(cur, args.target, args.season)
+        else:
+            output = collect_batch(cur, targets, encoder=DeltaEncoder())
     except Exception:
         pass
 
-    print(json.dumps(results))
+    print(json.dumps(output))
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,33 +1,155 @@
 import os
 import re
 import json
+import threading
 import paramiko
 import time
 import base64
 import shlex
+from dataclasses import dataclass
+from typing import Dict, List, Optional
 from PyQt6.QtCore import QThread
 
 from src.domain.repositories import IMediaRepository
 from src.application.use_cases.sync_use_cases import SyncConversionStateUseCase
+from src.infrastructure.services.poll_scheduler import DONE, IDLE, PollScheduler, conversion_activity
+from src.infrastructure.services.log_downloader import SFTPLogDownloader
+from src.infrastructure.services.telemetry_delta import JobCache, known_versions, merge_rows
 
-class SSHTelemetryClient(QThread):
+
+def _script_command(b64_script: str, *args: str) -> str:
+    """
+    Command line running the telemetry script with `args`. The script travels inside -c so stdin
+    stays free for input; -u keeps responses unbuffered. Base64 output contains no quote
+    characters, so it is safe inside both quoting layers.
+    """
+    return f"python3 -u -c \"import base64;exec(base64.b64decode('{b64_script}'))\" " + " ".join(args)
+
+
+def _open_command(client: paramiko.SSHClient, command: str):
+    """
+    Starts a remote command with stderr merged into stdout, so a chatty or failing script can never
+    stall on a stderr window nobody reads. Returns (channel, stdin, stdout).
     """
-    Background infrastructure task that polls SSH Conversion Telemetry for a specific media item.
-    Updates the repository and triggers UseCase signals over the EventBus.
+    channel = client.get_transport().open_session()
+    channel.set_combine_stderr(True)
+    channel.exec_command(command)
+    return channel, channel.makefile_stdin("wb"), channel.makefile("r")
+
+
+def _last_json_object(output: str) -> dict:
+    """The script prints its answer last; merged stderr lines before it are skipped."""
+    for line in reversed(output.splitlines()):
+        try:
+            parsed = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(parsed, dict):
+            return parsed
+    return {}
+
+
+class RemoteTelemetryAgent:
     """
-    def __init__(self, repo: IMediaRepository, sync_use_case: SyncConversionStateUseCase, item_id: int, target_title: str, run_once: bool = False, parent=None) -> None:
+    A long-lived `remote_telemetry.py --agent` process on the conversion host.
+    The script is sent once at start-up; each query is then one JSON line on the channel's stdin
+    answered by one JSON line on stdout, with no interpreter spawn or DB reconnect per poll.
+    """
+    _STARTUP_TIMEOUT_S = 15.0
+    _QUERY_TIMEOUT_S = 60.0
+
+    def __init__(self, client: paramiko.SSHClient, b64_script: str, remote_app_dir: str) -> None:
+        agent_cmd = _script_command(b64_script, "--agent", "--dir", shlex.quote(remote_app_dir))
+        self._channel, self._stdin, self._stdout = _open_command(client, agent_cmd)
+        self._next_id = 0
+        self._started = False
+
+    def query(self, batch: list) -> Dict[str, list]:
+        self._next_id += 1
+        request_id = self._next_id
+        self._stdin.write(json.dumps({"id": request_id, "targets": batch}) + "\n")
+        self._stdin.flush()
+        self._channel.settimeout(self._QUERY_TIMEOUT_S if self._started else self._STARTUP_TIMEOUT_S)
+        while True:
+            line = self._stdout.readline()
+            if not line:
+                raise EOFError("telemetry agent exited")
+            try:
+                response = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(response, dict) and response.get("id") == request_id:
+                self._started = True
+                results = response.get("results")
+                return results if isinstance(results, dict) else {}
+
+    def close(self) -> None:
+        try:
+            # EOF on stdin ends the agent's read loop; closing the channel covers a hung agent.
+            self._channel.shutdown_write()
+            self._channel.close()
+        except Exception:
+            pass
+
+
+@dataclass
+class TelemetryTarget:
+    """A media item registered for conversion telemetry, with its remote search parameters."""
+    item_id: int
+    search_target: str
+    season: str = ""
+    run_once: bool = False
+
+
+class SSHTelemetryService(QThread):
+    """
+    Background infrastructure task that polls SSH Conversion Telemetry for every registered media item.
+    Owns a single SSH connection and sends one batched query per cycle covering all items that are
+    due, then fans the rows back out per item through the sync UseCase (EventBus). Queries go to a
+    persistent remote agent; one-shot script invocations are the fallback if the agent cannot run.
+    """
+    def __init__(self, repo: IMediaRepository, sync_use_case: SyncConversionStateUseCase, parent=None) -> None:
         super().__init__(parent)
         self.repo = repo
         self.sync_use_case = sync_use_case
-        self.item_id = item_id
-        self.target_title = target_title
-        self.safe_title = re.sub(r'[\\/*?:"<>| \']', "_", self.target_title)
+        self._targets: Dict[int, TelemetryTarget] = {}
+        # Last full rows per item, keyed by job path with the remote's row version; lets the remote
+        # answer with only the rows and fields that changed.
+        self._job_cache: Dict[int, JobCache] = {}
+        # Guards _targets, _job_cache and the scheduler, which register()/unregister() touch from the GUI thread.
+        self._lock = threading.Lock()
+        # Encoding jobs refresh every 3 s, queued ones every 30 s; failures back off exponentially.
+        self._scheduler = PollScheduler(active_interval=3.0, idle_interval=30.0)
         self._is_running = True
-        self._run_once = run_once
+        # Consecutive agent failures on the current connection; past the limit, one-shot mode is used.
+        self._agent_failures = 0
+
+    def register(self, item_id: int, target_title: str, run_once: bool = False) -> None:
+        """Starts (or restarts) telemetry for an item; it is polled on the next cycle."""
+        search_target = target_title
+        explicit_season = ""
+        try:
+            item = self.repo.get_item(item_id)
+            if item:
+                search_target = item.relative_path if getattr(item, 'relative_path', None) else target_title
+                explicit_season = str(getattr(item, 'season', ''))
+        except Exception:
+            pass
+
+        with self._lock:
+            self._targets[item_id] = TelemetryTarget(item_id, search_target, explicit_season, run_once)
+            self._scheduler.forget(item_id)
+
+    def unregister(self, item_id: int) -> None:
+        with self._lock:
+            self._targets.pop(item_id, None)
+            self._job_cache.pop(item_id, None)
+            self._scheduler.forget(item_id)
 
-    def stop(self):
+    def stop(self, wait: bool = True):
         self._is_running = False
-        self.wait()
+        if wait:
+            self.wait()
 
     def _get_remote_script_b64(self) -> str:
         """Reads the companion telemetry script from disk and base64 encodes it."""
@@ -36,73 +158,159 @@ class SSHTelemetryClient(QThread):
             script_content = f.read()
         return base64.b64encode(script_content.encode('utf-8')).decode('utf-8')
 
-    def _download_logs_for_completed_jobs(self, client: paramiko.SSHClient, results: list) -> None:
+    def _download_logs_for_completed_jobs(self, downloader: SFTPLogDownloader, item_id: int, results: list,
+                                          versions: Optional[Dict[str, str]] = None) -> None:
         """Fetches remote logs only after conversion completion and stores local file paths in payload."""
-        try:
-            sftp = client.open_sftp()
-        except Exception:
-            sftp = None
-
         app_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
-        logs_root = os.path.join(app_root, "temp_torrents", "conversion_logs", f"item_{self.item_id}")
+        logs_root = os.path.join(app_root, "temp_torrents", "conversion_logs", f"item_{item_id}")
         os.makedirs(logs_root, exist_ok=True)
 
-        try:
-            for idx, row in enumerate(results):
-                status = str(row.get("db_status", "")).upper()
-                if status != "COMPLETED":
+        # Collect every completed row's logs first so they transfer as one concurrent batch.
+        wanted = []
+        for idx, row in enumerate(results):
+            status = str(row.get("db_status", "")).upper()
+            if status != "COMPLETED":
+                continue
+
+            for remote_key, local_key, prefix in (
+                ("gen_log_remote_path", "gen_log_local_path", "general"),
+                ("ff_log_remote_path", "ff_log_local_path", "ffmpeg"),
+            ):
+                remote_path = str(row.get(remote_key, "") or "").strip()
+                if not remote_path:
                     continue
 
-                for remote_key, local_key, prefix in (
-                    ("gen_log_remote_path", "gen_log_local_path", "general"),
-                    ("ff_log_remote_path", "ff_log_local_path", "ffmpeg"),
-                ):
-                    remote_path = str(row.get(remote_key, "") or "").strip()
-                    if not remote_path:
-                        continue
+                base_name = os.path.basename(remote_path) or f"{prefix}_{idx + 1}.log"
+                safe_name = re.sub(r'[^A-Za-z0-9._-]+', '_', base_name)
+                local_name = f"{idx + 1:02d}_{prefix}_{safe_name}"
+                wanted.append((row, local_key, remote_path, local_name))
 
-                    base_name = os.path.basename(remote_path) or f"{prefix}_{idx + 1}.log"
-                    safe_name = re.sub(r'[^A-Za-z0-9._-]+', '_', base_name)
-                    local_name = f"{idx + 1:02d}_{prefix}_{safe_name}"
-                    local_path = os.path.join(logs_root, local_name)
+        # The row version lets unchanged completed jobs skip the remote stat entirely.
+        versions = versions or {}
+        downloaded = downloader.download(logs_root, [
+            (remote_path, local_name, versions.get(str(row.get("path", ""))))
+            for row, _key, remote_path, local_name in wanted
+        ])
+        for row, local_key, _remote_path, local_name in wanted:
+            row[local_key] = os.path.join(logs_root, local_name) if downloaded.get(local_name) else ""
 
+        for idx, row in enumerate(results):
+            if str(row.get("db_status", "")).upper() != "COMPLETED":
+                continue
+
+            # Fallback persistence: if remote-path download failed, store available payload logs locally.
+            fallback_gen_path = str(row.get("gen_log_local_path", "") or "")
+            if not fallback_gen_path:
+                gen_content = str(row.get("gen_log", "") or "").strip()
+                if gen_content:
+                    fallback_gen_path = os.path.join(logs_root, f"{idx + 1:02d}_general_payload.log")
                     try:
-                        if sftp and not os.path.exists(local_path):
-                            sftp.get(remote_path, local_path)
-                        row[local_key] = local_path
+                        with open(fallback_gen_path, 'w', encoding='utf-8', errors='ignore') as f:
+                            f.write(gen_content)
+                        row["gen_log_local_path"] = fallback_gen_path
                     except Exception:
-                        row[local_key] = ""
-
-                # Fallback persistence: if remote-path download failed, store available payload logs locally.
-                fallback_gen_path = str(row.get("gen_log_local_path", "") or "")
-                if not fallback_gen_path:
-                    gen_content = str(row.get("gen_log", "") or "").strip()
-                    if gen_content:
-                        fallback_gen_path = os.path.join(logs_root, f"{idx + 1:02d}_general_payload.log")
-                        try:
-                            with open(fallback_gen_path, 'w', encoding='utf-8', errors='ignore') as f:
-                                f.write(gen_content)
-                            row["gen_log_local_path"] = fallback_gen_path
-                        except Exception:
-                            row["gen_log_local_path"] = ""
-
-                fallback_ff_path = str(row.get("ff_log_local_path", "") or "")
-                if not fallback_ff_path:
-                    ff_content = str(row.get("ff_tail", "") or "").strip()
-                    if ff_content:
-                        fallback_ff_path = os.path.join(logs_root, f"{idx + 1:02d}_ffmpeg_payload.log")
-                        try:
-                            with open(fallback_ff_path, 'w', encoding='utf-8', errors='ignore') as f:
-                                f.write(ff_content)
-                            row["ff_log_local_path"] = fallback_ff_path
-                        except Exception:
-                            row["ff_log_local_path"] = ""
+                        row["gen_log_local_path"] = ""
+
+            fallback_ff_path = str(row.get("ff_log_local_path", "") or "")
+            if not fallback_ff_path:
+                ff_content = str(row.get("ff_tail", "") or "").strip()
+                if ff_content:
+                    fallback_ff_path = os.path.join(logs_root, f"{idx + 1:02d}_ffmpeg_payload.log")
+                    try:
+                        with open(fallback_ff_path, 'w', encoding='utf-8', errors='ignore') as f:
+                            f.write(ff_content)
+                        row["ff_log_local_path"] = fallback_ff_path
+                    except Exception:
+                        row["ff_log_local_path"] = ""
+
+    def _due_targets(self) -> List[TelemetryTarget]:
+        with self._lock:
+            return [t for t in self._targets.values() if self._scheduler.is_due(t.item_id)]
+
+    _MAX_AGENT_FAILURES = 3
+
+    def _batch_payload(self, targets: List[TelemetryTarget]) -> list:
+        with self._lock:
+            return [
+                {"key": t.item_id, "target": t.search_target, "season": t.season,
+                 "known": known_versions(self._job_cache.get(t.item_id, {}))}
+                for t in targets
+            ]
+
+    def _query_via_agent(self, agent: Optional[RemoteTelemetryAgent], client: paramiko.SSHClient, b64_script: str,
+                         remote_app_dir: str, targets: List[TelemetryTarget]):
+        """
+        Queries through the persistent agent, starting it if needed.
+        Returns (agent, results); results is None when the agent is unavailable and the caller should
+        fall back to a one-shot invocation.
+        """
+        if self._agent_failures >= self._MAX_AGENT_FAILURES:
+            return None, None
+        try:
+            if agent is None:
+                agent = RemoteTelemetryAgent(client, b64_script, remote_app_dir)
+            results = agent.query(self._batch_payload(targets))
+            self._agent_failures = 0
+            return agent, results
+        except Exception:
+            if agent is not None:
+                agent.close()
+            self._agent_failures += 1
+            return None, None
+
+    def _query_targets(self, client: paramiko.SSHClient, b64_script: str, remote_app_dir: str, targets: List[TelemetryTarget]) -> Dict[str, list]:
+        """Runs the remote telemetry script once for all targets and returns its {item_id: rows} map."""
+        batch = self._batch_payload(targets)
+        b64_batch = base64.b64encode(json.dumps(batch).encode('utf-8')).decode('utf-8')
+
+        # The batch (known-version maps included) grows with the library, so it goes over stdin rather
+        # than the command line, which the kernel caps per argument. shlex.quote guards the directory.
+        db_cmd = _script_command(b64_script, "--batch", "-", "--dir", shlex.quote(remote_app_dir))
+        channel, stdin, stdout = _open_command(client, db_cmd)
+        try:
+            stdin.write(b64_batch + "\n")
+            stdin.flush()
+            channel.shutdown_write()
+            raw_output = stdout.read().decode('utf-8', errors='ignore')
         finally:
-            try:
-                if sftp:
-                    sftp.close()
-            except Exception:
-                pass
+            channel.close()
+        return _last_json_object(raw_output)
+
+    def _merge_results(self, item_id: int, entries: list) -> list:
+        """Expands the remote's delta entries into full rows and remembers them for the next poll."""
+        with self._lock:
+            cache = self._job_cache.get(item_id, {})
+        try:
+            results, new_cache = merge_rows(cache, entries)
+        except ValueError:
+            # Out of step with the remote; the next poll sends no versions and gets full rows back.
+            with self._lock:
+                self._job_cache.pop(item_id, None)
+            raise
+        with self._lock:
+            if item_id in self._targets:
+                self._job_cache[item_id] = new_cache
+        return results
+
+    def _apply_results(self, downloader: SFTPLogDownloader, target: TelemetryTarget, results: Optional[list]) -> None:
+        activity = IDLE
+        if isinstance(results, list):
+            results = self._merge_results(target.item_id, results)
+            if results:
+                # Persist logs to disk for rows already completed.
+                if any(str(r.get("db_status", "")).upper() == "COMPLETED" for r in results):
+                    with self._lock:
+                        versions = known_versions(self._job_cache.get(target.item_id, {}))
+                    self._download_logs_for_completed_jobs(downloader, target.item_id, results, versions)
+                activity = conversion_activity(results)
+            self.sync_use_case.execute(target.item_id, json.dumps(results))
+
+        # Stop polling once every row is completed, failed or rejected.
+        if activity == DONE or target.run_once:
+            self.unregister(target.item_id)
+        else:
+            with self._lock:
+                self._scheduler.record(target.item_id, activity)
 
     def run(self) -> None:
         host = os.getenv("SSH_HOST")
@@ -113,86 +321,62 @@ class SSHTelemetryClient(QThread):
         if not all([host, user, password, remote_app_dir]):
             return
 
-        search_target = self.target_title
-        explicit_season = ""
-        
-        try:
-            item = self.repo.get_item(self.item_id)
-            if item:
-                search_target = item.relative_path if getattr(item, 'relative_path', None) else self.target_title
-                explicit_season = str(getattr(item, 'season', ''))
-        except Exception:
-            pass
+        b64_script = self._get_remote_script_b64()
+        client = None
+        agent = None
+        # One SFTP channel per connection, shared by every log download on it.
+        downloader = SFTPLogDownloader(lambda: client.open_sftp())
 
         try:
-            client = paramiko.SSHClient()
-            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            client.connect(hostname=host, username=user, password=password, timeout=5.0)
-
-            # 1. Get the base64 encoded payload of our cleanly separated file
-            b64_script = self._get_remote_script_b64()
-
-            # 2. Use shlex.quote to prevent command injection via file names or titles
-            safe_target = shlex.quote(search_target)
-            safe_season = shlex.quote(explicit_season)
-            safe_dir = shlex.quote(remote_app_dir)
-
-            # 3. Construct the execution command. 
-            # `python3 -` tells Python to execute the script from standard input while still accepting CLI args.
-            db_cmd = (
-                f"echo {b64_script} | base64 -d | "
-                f"python3 - --target {safe_target} --season {safe_season} --dir {safe_dir}"
-            )
-
             while self._is_running:
-                stdin, stdout, stderr = client.exec_command(db_cmd)
-                raw_output = stdout.read().decode('utf-8').strip()
-                
-                stdin.close()
-                stdout.close()
-                stderr.close()
-                
-                try:
-                    match = re.search(r'\[.*\]', raw_output, re.DOTALL)
-                    if match:
-                        json_str = match.group()
-                        
-                        try:
-                            results = json.loads(json_str)
-                            if results and isinstance(results, list):
-                                # Persist logs to disk for rows already completed.
-                                if any(str(r.get("db_status", "")).upper() == "COMPLETED" for r in results):
-                                    self._download_logs_for_completed_jobs(client, results)
-
-                                self.sync_use_case.execute(self.item_id, json.dumps(results))
-
-                                # Stop polling once every row is completed.
-                                if all(str(r.get("db_status", "")).upper() == "COMPLETED" for r in results):
-                                    self._is_running = False
-                                    break
-                            else:
-                                self.sync_use_case.execute(self.item_id, json_str)
-                        except json.JSONDecodeError:
-                            self.sync_use_case.execute(self.item_id, json_str)
-                    elif raw_output:
-                        self.sync_use_case.execute(self.item_id, raw_output)
-                except json.JSONDecodeError:
-                    pass
-
-                if self._run_once:
-                    self._is_running = False
-                    break
-                    
-                for _ in range(30):
-                    if not self._is_running:
-                        break
+                targets = self._due_targets()
+                if not targets:
                     time.sleep(0.1)
+                    continue
 
-        except Exception:
-            pass
+                try:
+                    if client is None:
+                        client = paramiko.SSHClient()
+                        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+                        # Transport-level zlib: telemetry JSON and text logs shrink several-fold on the wire.
+                        client.connect(hostname=host, username=user, password=password, timeout=5.0, compress=True)
+                        self._agent_failures = 0
+                    agent, results_by_item = self._query_via_agent(agent, client, b64_script, remote_app_dir, targets)
+                    if results_by_item is None:
+                        results_by_item = self._query_targets(client, b64_script, remote_app_dir, targets)
+                except Exception:
+                    # Drop the connection; it is re-established once the backoff expires.
+                    if agent is not None:
+                        agent.close()
+                        agent = None
+                    downloader.close()
+                    self._close_client(client)
+                    client = None
+                    for target in targets:
+                        if target.run_once:
+                            self.unregister(target.item_id)
+                        else:
+                            with self._lock:
+                                self._scheduler.record_error(target.item_id)
+                    continue
+
+                for target in targets:
+                    try:
+                        self._apply_results(downloader, target, results_by_item.get(str(target.item_id)))
+                    except Exception:
+                        with self._lock:
+                            self._scheduler.record_error(target.item_id)
         finally:
-            # Ensure the connection actually closes if the thread is stopped or fails
-            try:
+            # Ensure the agent and connection actually close if the thread is stopped or fails
+            if agent is not None:
+                agent.close()
+            downloader.shutdown()
+            self._close_client(client)
+
+    @staticmethod
+    def _close_client(client) -> None:
+        try:
+            if client:
                 client.close()
-            except:
-                pass
\ No newline at end of file
+        except Exception:
+            pass
@@ -0,0 +1,47 @@
+from typing import Any, Dict, List, Mapping, Tuple
+
+# Bookkeeping keys of a delta entry; everything else is a job field.
+_ENTRY_KEYS = ("v", "base", "full", "gen_log_append")
+
+JobCache = Dict[str, Tuple[str, Dict[str, Any]]]
+
+
+def known_versions(cache: JobCache) -> Dict[str, str]:
+    """The {path: version} map sent to the remote so it can elide rows the client already holds."""
+    return {path: version for path, (version, _row) in cache.items()}
+
+
+def merge_rows(cache: JobCache, entries: List[Mapping[str, Any]]) -> Tuple[List[Dict[str, Any]], JobCache]:
+    """
+    Rebuilds full job rows from the remote's delta entries (see remote_telemetry.DeltaEncoder).
+    Returns the rows in remote order and the cache to keep for the next poll; rows that vanished
+    remotely drop out of it. Raises ValueError when an entry references a version the cache does
+    not hold, in which case the caller should clear its cache and poll again.
+    Entries without a "v" are treated as full rows (older remote scripts).
+    """
+    rows: List[Dict[str, Any]] = []
+    new_cache: JobCache = {}
+    for entry in entries:
+        if not isinstance(entry, Mapping):
+            continue
+        path = entry.get("path")
+        version = entry.get("v")
+        if version is None:
+            rows.append(dict(entry))
+            continue
+
+        if entry.get("full"):
+            row = {key: value for key, value in entry.items() if key not in _ENTRY_KEYS}
+        else:
+            held = cache.get(path)
+            expected = entry.get("base", version)
+            if held is None or held[0] != expected:
+                raise ValueError(f"Telemetry delta for {path!r} references unknown version {expected!r}")
+            row = dict(held[1])
+            row.update((key, value) for key, value in entry.items() if key not in _ENTRY_KEYS)
+            if "gen_log_append" in entry:
+                row["gen_log"] = (row.get("gen_log") or "") + entry["gen_log_append"]
+
+        new_cache[path] = (version, row)
+        rows.append(dict(row))
+    return rows, new_cache
@@ -0,0 +1,90 @@
+import threading
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+Stamp = Tuple[Any, Any]
+
+
+def torrent_stamp(torrent: Mapping[str, Any]) -> Stamp:
+    """A torrent's file list only changes when its total size or completion time does."""
+    return (torrent.get("total_size"), torrent.get("completion_on"))
+
+
+def _normalize_files(raw_files) -> List[Dict[str, Any]]:
+    normalized = []
+    for f in raw_files or []:
+        try:
+            size_val = f.get("size", 0)
+        except Exception:
+            size_val = 0
+        normalized.append({
+            "name": f.get("name", ""),
+            "size": int(size_val or 0),
+        })
+    return normalized
+
+
+class TorrentFileListCache:
+    """
+    Process-wide torrent file lists keyed by hash, shared by the poller, the files worker and the
+    media cards. Each entry carries the stamp (total_size, completion_on) it was fetched under;
+    the poller reports fresh stamps through observe(), and a differing stamp drops the entry so
+    the next caller fetches it again. Season packs are therefore listed once per torrent instead
+    of once per caller.
+    """
+    def __init__(self):
+        self._entries: Dict[str, Tuple[Optional[Stamp], List[Dict[str, Any]]]] = {}
+        self._stamps: Dict[str, Stamp] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, torrent: Mapping[str, Any]) -> None:
+        """Records a torrent's current stamp, invalidating its cached file list if it changed."""
+        torrent_hash = torrent.get("hash")
+        if not torrent_hash:
+            return
+        stamp = torrent_stamp(torrent)
+        with self._lock:
+            self._stamps[torrent_hash] = stamp
+            entry = self._entries.get(torrent_hash)
+            if entry is not None and entry[0] != stamp:
+                del self._entries[torrent_hash]
+
+    def peek(self, torrent_hash: str) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            entry = self._entries.get(torrent_hash)
+        return list(entry[1]) if entry is not None else None
+
+    def seed(self, torrent_hash: str, stamp: Stamp, files: List[Dict[str, Any]]) -> None:
+        """Adopts a previously persisted file list if it was fetched under the current stamp."""
+        with self._lock:
+            if torrent_hash not in self._entries and self._stamps.get(torrent_hash) == tuple(stamp):
+                self._entries[torrent_hash] = (tuple(stamp), list(files))
+
+    def invalidate(self, torrent_hash: str) -> None:
+        with self._lock:
+            self._entries.pop(torrent_hash, None)
+
+    def get_files(self, client, torrent_hash: str) -> List[Dict[str, Any]]:
+        """Cached file list for the torrent, fetched through `client` on a miss."""
+        cached = self.peek(torrent_hash)
+        if cached is not None:
+            return cached
+        with self._lock:
+            stamp = self._stamps.get(torrent_hash)
+        files = _normalize_files(client.torrents_files(torrent_hash=torrent_hash))
+        with self._lock:
+            # Only keep the result if no newer stamp was observed while fetching.
+            if self._stamps.get(torrent_hash) == stamp:
+                self._entries[torrent_hash] = (stamp, files)
+        return list(files)
+
+
+_cache: Optional[TorrentFileListCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_torrent_file_cache() -> TorrentFileListCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = TorrentFileListCache()
+        return _cache
@@ -0,0 +1,177 @@
+import time
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Set
+
+
+def _normalize_path(path: Optional[str]) -> str:
+    """Forward-slash form of a path without leading/trailing separators, so Windows and POSIX paths compare equal."""
+    return "/".join(part for part in str(path or "").replace("\\", "/").split("/") if part)
+
+
+def _path_keys(save_path: Optional[str]) -> List[str]:
+    """
+    Every contiguous run of components of a save path, e.g. "/data/movies/Up" ->
+    "data", "data/movies", "data/movies/Up", "movies", "movies/Up", "Up".
+    A media item's relative path matches a torrent when it is one of these runs.
+    """
+    parts = _normalize_path(save_path).split("/")
+    if parts == [""]:
+        return []
+    return ["/".join(parts[start:end]) for start in range(len(parts)) for end in range(start + 1, len(parts) + 1)]
+
+
+class TorrentIndex:
+    """
+    Hash, name and save-path lookup tables over a qBittorrent torrent list.
+    Replaces per-item linear scans in the poller with dictionary lookups. Supports incremental
+    upsert/remove so a long-lived index can follow partial sync updates.
+    """
+    def __init__(self, torrents: Iterable[Mapping[str, Any]] = ()):
+        self._by_hash: Dict[str, Mapping[str, Any]] = {}
+        # Values are insertion-ordered hash sets (dict keys) so lookups keep the torrent list's order.
+        self._by_name: Dict[str, Dict[str, None]] = {}
+        self._by_path: Dict[str, Dict[str, None]] = {}
+        self.rebuild(torrents)
+
+    def __len__(self) -> int:
+        return len(self._by_hash)
+
+    def __contains__(self, torrent_hash: str) -> bool:
+        return torrent_hash in self._by_hash
+
+    def torrents(self) -> List[Mapping[str, Any]]:
+        return list(self._by_hash.values())
+
+    def rebuild(self, torrents: Iterable[Mapping[str, Any]]) -> None:
+        self._by_hash.clear()
+        self._by_name.clear()
+        self._by_path.clear()
+        for torrent in torrents:
+            self.upsert(torrent)
+
+    def upsert(self, torrent: Mapping[str, Any]) -> None:
+        torrent_hash = torrent.get("hash")
+        if not torrent_hash:
+            return
+        previous = self._by_hash.get(torrent_hash)
+        if previous is not None:
+            # Progress/speed ticks leave the lookup keys untouched; only swap the stored record.
+            if previous.get("name") == torrent.get("name") and previous.get("save_path") == torrent.get("save_path"):
+                self._by_hash[torrent_hash] = torrent
+                return
+            self._unlink(torrent_hash)
+        self._by_hash[torrent_hash] = torrent
+        name = torrent.get("name")
+        if name:
+            self._by_name.setdefault(name, {})[torrent_hash] = None
+        for key in _path_keys(torrent.get("save_path")):
+            self._by_path.setdefault(key, {})[torrent_hash] = None
+
+    def remove(self, torrent_hash: str) -> None:
+        if torrent_hash in self._by_hash:
+            self._unlink(torrent_hash)
+            del self._by_hash[torrent_hash]
+
+    def _unlink(self, torrent_hash: str) -> None:
+        torrent = self._by_hash[torrent_hash]
+        name = torrent.get("name")
+        if name:
+            self._discard(self._by_name, name, torrent_hash)
+        for key in _path_keys(torrent.get("save_path")):
+            self._discard(self._by_path, key, torrent_hash)
+
+    @staticmethod
+    def _discard(table: Dict[str, Dict[str, None]], key: str, torrent_hash: str) -> None:
+        hashes = table.get(key)
+        if hashes is None:
+            return
+        hashes.pop(torrent_hash, None)
+        if not hashes:
+            del table[key]
+
+    def by_hash(self, torrent_hash: Optional[str]) -> Optional[Mapping[str, Any]]:
+        return self._by_hash.get(torrent_hash) if torrent_hash else None
+
+    def by_name(self, name: Optional[str]) -> Optional[Mapping[str, Any]]:
+        """First torrent carrying this exact name, matching the old next(...) scan order."""
+        hashes = self._by_name.get(name) if name else None
+        return self._by_hash[next(iter(hashes))] if hashes else None
+
+    def by_path(self, relative_path: Optional[str]) -> List[Mapping[str, Any]]:
+        """Torrents whose save path contains relative_path as whole path components."""
+        key = _normalize_path(relative_path)
+        if not key:
+            return []
+        return [self._by_hash[torrent_hash] for torrent_hash in self._by_path.get(key, ())]
+
+
+class MaindataTorrentFeed:
+    """
+    Local torrent table kept current through qBittorrent's sync/maindata endpoint.
+    Each refresh sends the last response id (rid), so the server only returns torrents and fields
+    that changed since then, plus removed hashes; an idle cycle is a few hundred bytes instead of
+    the full torrents_info() list.
+    """
+    def __init__(self):
+        self.index = TorrentIndex()
+        self._torrents: Dict[str, Dict[str, Any]] = {}
+        self._rid = 0
+
+    def reset(self) -> None:
+        """Forgets the cursor so the next refresh requests a full update (e.g. after a reconnect)."""
+        self._rid = 0
+
+    def refresh(self, client) -> TorrentIndex:
+        data = client.sync_maindata(rid=self._rid)
+        if data.get("full_update"):
+            self._torrents.clear()
+            self.index.rebuild(())
+
+        for torrent_hash, fields in (data.get("torrents") or {}).items():
+            merged = dict(self._torrents.get(torrent_hash, {}))
+            merged.update(fields)
+            merged["hash"] = torrent_hash
+            self._torrents[torrent_hash] = merged
+            self.index.upsert(merged)
+
+        for torrent_hash in data.get("torrents_removed") or ():
+            self._torrents.pop(torrent_hash, None)
+            self.index.remove(torrent_hash)
+
+        self._rid = data.get("rid", self._rid)
+        return self.index
+
+
+class TrackedTorrentFeed:
+    """
+    torrents_info()-based feed whose per-cycle cost scales with the tracked items, not the seedbox.
+    Each refresh fetches only the hashes already linked to media items. A full (optionally
+    category/tag-filtered) discovery scan runs on a slower cadence, and only while some item is
+    still unmatched or a tracked hash has disappeared from the client.
+    """
+    def __init__(self, discovery_interval: float = 30.0, category: Optional[str] = None,
+                 tag: Optional[str] = None, clock: Callable[[], float] = time.monotonic):
+        self.discovery_interval = discovery_interval
+        self.category = category
+        self.tag = tag
+        self._clock = clock
+        self._last_discovery: Optional[float] = None
+        self._discovered: List[Mapping[str, Any]] = []
+
+    def refresh(self, client, tracked_hashes: Set[str], has_unmatched: bool) -> TorrentIndex:
+        tracked = client.torrents_info(torrent_hashes="|".join(sorted(tracked_hashes))) if tracked_hashes else []
+        index = TorrentIndex(tracked)
+        lost_hashes = any(torrent_hash not in index for torrent_hash in tracked_hashes)
+
+        if has_unmatched or lost_hashes:
+            now = self._clock()
+            if self._last_discovery is None or now - self._last_discovery >= self.discovery_interval:
+                filters = {key: value for key, value in (("category", self.category), ("tag", self.tag)) if value}
+                self._discovered = list(client.torrents_info(**filters))
+                self._last_discovery = now
+            # Discovery results only fill gaps; tracked torrents keep this cycle's fresh data.
+            for torrent in self._discovered:
+                if torrent.get("hash") not in index:
+                    index.upsert(torrent)
+        else:
+            self._discovered = []
+        return index
@@ -1,8 +1,7 @@
-import os
-
-import qbittorrentapi
 from PyQt6.QtCore import QThread, pyqtSignal
 
+from src.infrastructure.services.qbittorrent_session import get_qbittorrent_session
+
 class TorrentPollingThread(QThread):
     data_updated = pyqtSignal(list)
     error = pyqtSignal(str)
@@ -10,14 +9,11 @@ class TorrentPollingThread(QThread):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.active = True
-        self.host = os.getenv("QBIT_HOST")
-        self.port = os.getenv("QBIT_PORT")
 
     def run(self) -> None:
         try:
-            # FIX: Added http:// to the host string
-            client = qbittorrentapi.Client(host=f"http://{self.host}:{self.port}", username=os.getenv("QBIT_USER"), password=os.getenv("QBIT_PASS"))
-            client.auth_log_in()
+            client = get_qbittorrent_session()
+            client.app_version()
         except Exception as e:
             self.error.emit(f"Polling Auth Failed: {str(e)}")
             return
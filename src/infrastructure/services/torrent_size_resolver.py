@@ -0,0 +1,91 @@
+import time
+from typing import Callable, Dict, List, Optional
+
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+
+from src.infrastructure.services.qbittorrent import QBittorrentFilesWorker, QBittorrentSizeWorker
+from src.infrastructure.services.torrent_file_cache import get_torrent_file_cache
+
+
+class TorrentSizeResolver(QObject):
+    """
+    Asynchronous qBittorrent size lookups for the media cards.
+    File lists come from the shared, stamp-invalidated TorrentFileListCache; total sizes are kept
+    here. Cached answers are returned immediately; a miss starts at most one worker per torrent and kind
+    (file list or total size) and the result arrives later through files_resolved/size_resolved,
+    so the GUI thread never waits on qBittorrent. Lookups, including failed ones, are not repeated
+    within `refresh_interval` seconds, which keeps a season's telemetry burst to a single request.
+    """
+    files_resolved = pyqtSignal(str, list)
+    size_resolved = pyqtSignal(str, int)
+
+    def __init__(self, refresh_interval: float = 30.0, clock: Callable[[], float] = time.monotonic, parent=None):
+        super().__init__(parent)
+        self.refresh_interval = refresh_interval
+        self._clock = clock
+        self._sizes: Dict[str, int] = {}
+        self._requested: Dict[tuple, float] = {}
+        self._workers: Dict[tuple, QObject] = {}
+
+    def cached_files(self, torrent_hash: str) -> Optional[List[dict]]:
+        return get_torrent_file_cache().peek(torrent_hash) if torrent_hash else None
+
+    def cached_size(self, torrent_hash: str) -> Optional[int]:
+        return self._sizes.get(torrent_hash)
+
+    def _should_request(self, key: tuple) -> bool:
+        if not key[1] or key in self._workers:
+            return False
+        last = self._requested.get(key)
+        return last is None or self._clock() - last >= self.refresh_interval
+
+    def request_files(self, torrent_hash: str) -> None:
+        key = ("files", torrent_hash)
+        if not self._should_request(key):
+            return
+        worker = QBittorrentFilesWorker(torrent_hash, self)
+        worker.finished.connect(lambda files, h=torrent_hash: self._on_files(h, files))
+        self._start(key, worker)
+
+    def request_size(self, torrent_hash: str) -> None:
+        key = ("size", torrent_hash)
+        if not self._should_request(key):
+            return
+        worker = QBittorrentSizeWorker(torrent_hash, self)
+        worker.finished.connect(lambda size, h=torrent_hash: self._on_size(h, size))
+        self._start(key, worker)
+
+    def _start(self, key: tuple, worker) -> None:
+        self._requested[key] = self._clock()
+        self._workers[key] = worker
+        worker.finished.connect(lambda *_args, k=key: self._release(k))
+        worker.error.connect(lambda _err, k=key: self._release(k))
+        # The workers shadow QThread.finished with their result signal; the base signal fires once run()
+        # has returned, so the worker can be freed instead of piling up under this long-lived resolver.
+        QThread.finished.__get__(worker, QThread).connect(worker.deleteLater)
+        worker.start()
+
+    def _release(self, key: tuple) -> None:
+        # Workers are parented to the resolver; this only marks the lookup as no longer in flight.
+        self._workers.pop(key, None)
+
+    def _on_files(self, torrent_hash: str, files: list) -> None:
+        # QBittorrentFilesWorker already stored the list in the shared file cache.
+        if files:
+            self.files_resolved.emit(torrent_hash, files)
+
+    def _on_size(self, torrent_hash: str, size: int) -> None:
+        if size > 0:
+            self._sizes[torrent_hash] = size
+            self.size_resolved.emit(torrent_hash, size)
+
+
+_resolver: Optional[TorrentSizeResolver] = None
+
+
+def get_torrent_size_resolver() -> TorrentSizeResolver:
+    """Shared resolver; create and use it from the GUI thread so its signals are delivered there."""
+    global _resolver
+    if _resolver is None:
+        _resolver = TorrentSizeResolver()
+    return _resolver
@@ -1,10 +1,14 @@
 import json
+from dataclasses import asdict
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QScrollArea, QGraphicsOpacityEffect
 from PyQt6.QtCore import Qt, QPropertyAnimation, QEasingCurve
 
 from src.application.events import event_bus
 from src.domain.repositories import IMediaRepository
 from src.ui.components.media_card import MediaCardWidget, SeriesCardWidget
+from src.utils.formatting import format_active_state, format_size, format_speed
+
+_FINISHED_JOB_STATUSES = ("COMPLETED", "FAILED", "REJECTED")
 
 class MediaGridWidget(QWidget):
     """
@@ -57,8 +61,6 @@ class MediaGridWidget(QWidget):
                 "genre": item.genre,
                 "rating": item.rating,
                 "image_url": item.image_url,
-                "torrent_data": item.torrent_data,
-                "conversion_data": item.conversion_data,
             }
         for item in items:
             self._render_item(item)
@@ -67,22 +69,18 @@ class MediaGridWidget(QWidget):
         index = len(self.all_flows) + 1
         is_tv = item.media_type == 'tv-series'
         
-        hash_val = ""
-        cached_files = []
-        if item.torrent_data:
-            try:
-                t_info = json.loads(item.torrent_data)
-                hash_val = t_info.get("hash", "")
-                cached_files = t_info.get("files", [])
-            except: pass
-            
+        torrent = self.repo.get_torrent_state(item.id)
+        hash_val = torrent.hash if torrent else ""
+        cached_files = self._torrent_files(item.torrent_data) if is_tv else []
+
+        log_source = lambda path, item_id=item.id: self.repo.get_conversion_job_logs(item_id, path)
         if is_tv:
-            flow = SeriesCardWidget(index=index, relative_path=item.relative_path, title=item.title, season=item.season, is_season=bool(item.is_season), hash_val=hash_val, db_id=item.id, parent=self.scroll_content)
+            flow = SeriesCardWidget(index=index, relative_path=item.relative_path, title=item.title, season=item.season, is_season=bool(item.is_season), hash_val=hash_val, db_id=item.id, parent=self.scroll_content, log_source=log_source)
             if cached_files:
                 flow._cached_files = cached_files
                 flow.populate_episodes_from_files(cached_files)
         else:
-            flow = MediaCardWidget(index=index, relative_path=item.relative_path, title=item.title, season=item.season, hash_val=hash_val, db_id=item.id, parent=self.scroll_content)
+            flow = MediaCardWidget(index=index, relative_path=item.relative_path, title=item.title, season=item.season, hash_val=hash_val, db_id=item.id, parent=self.scroll_content, log_source=log_source)
             
         # Hydrate description visually
         state = self._state_cache.get(item.id, {})
@@ -92,45 +90,62 @@ class MediaGridWidget(QWidget):
         flow.update_metadata(item.title, desc, genre, rating)
         
         # Determine conversion state visually
-        conversion_completed = False
-        c_data_str = state.get("conversion_data") or item.conversion_data or self.repo.get_conversion_cache(item.relative_path.replace("\\", "/"))
-        if c_data_str:
+        flow.conversion_completed = False
+        c_info = self._conversion_telemetry(item.id) or self._cached_conversion(item.relative_path)
+        if c_info:
             try:
-                c_info = json.loads(c_data_str)
-                if isinstance(c_info, dict): c_info = [c_info]
                 flow.update_telemetry_ui(c_info)
-                if c_info and all(ep.get("db_status", "NOT STARTED").upper() in ["COMPLETED", "FAILED", "REJECTED"] for ep in c_info):
-                    conversion_completed = True
+                flow.conversion_completed = self._all_jobs_finished(c_info)
             except: pass
-            
-        flow.conversion_completed = conversion_completed
-            
+
         # Determine torrent state visually
-        torrent_completed = False
-        t_data_str = state.get("torrent_data") or item.torrent_data
-        if t_data_str:
-            try:
-                t_info = json.loads(t_data_str)
-                flow.update_torrent_ui(
-                    human_state=t_info.get("human_state", "Unknown"),
-                    pill_class=t_info.get("pill_class", "PillUnknown"),
-                    pb_style=t_info.get("pb_style", "PbUnknown"),
-                    prog_val=t_info.get("prog_val", 0.0),
-                    size_str=t_info.get("size_str", "0 B"),
-                    speed_str=t_info.get("speed_str", "0.0 MB/s"),
-                    active_state_str=t_info.get("active_state_str", ""),
-                    hash_val=t_info.get("hash", ""),
-                    raw_size_bytes=t_info.get("raw_size_bytes", 0),
-                )
-                if t_info.get("prog_val", 0.0) >= 1.0:
-                    torrent_completed = True
-            except: pass
-            
-        flow.torrent_completed = torrent_completed
-        
+        flow.torrent_completed = False
+        if torrent:
+            self._apply_torrent_state(flow, torrent)
+
         self.all_flows.append(flow)
         self.flows_layout.addWidget(flow)
 
+    def _conversion_telemetry(self, item_id: int) -> list:
+        """Job dicts for update_telemetry_ui, read from the typed conversion_jobs rows (log bodies stay in the store)."""
+        return [asdict(job) for job in self.repo.get_conversion_jobs(item_id, include_logs=False)]
+
+    def _cached_conversion(self, relative_path: str) -> list:
+        """Telemetry remembered for this path from an earlier item, shown until the item's own jobs arrive."""
+        try:
+            c_info = json.loads(self.repo.get_conversion_cache(relative_path.replace("\\", "/")) or "[]")
+        except (TypeError, ValueError):
+            return []
+        return [c_info] if isinstance(c_info, dict) else c_info if isinstance(c_info, list) else []
+
+    @staticmethod
+    def _all_jobs_finished(c_info: list) -> bool:
+        return bool(c_info) and all(str(ep.get("db_status", "NOT STARTED")).upper() in _FINISHED_JOB_STATUSES for ep in c_info)
+
+    @staticmethod
+    def _torrent_files(torrent_data) -> list:
+        """The episode file list is the one part of the torrent payload without typed columns."""
+        try:
+            files = json.loads(torrent_data).get("files", []) if torrent_data else []
+        except (AttributeError, TypeError, ValueError):
+            return []
+        return files if isinstance(files, list) else []
+
+    def _apply_torrent_state(self, flow, torrent) -> None:
+        flow.update_torrent_ui(
+            human_state=torrent.human_state or "Unknown",
+            pill_class=torrent.pill_class or "PillUnknown",
+            pb_style=torrent.pb_style or "PbUnknown",
+            prog_val=torrent.progress,
+            size_str=format_size(torrent.total_size),
+            speed_str=format_speed(torrent.download_speed),
+            active_state_str=format_active_state(torrent.human_state, torrent.progress, torrent.total_size),
+            hash_val=torrent.hash,
+            raw_size_bytes=torrent.total_size,
+        )
+        if torrent.progress >= 1.0:
+            flow.torrent_completed = True
+
     def _get_flow_by_id(self, item_id: int):
         for f in self.all_flows:
             if getattr(f, 'db_id', None) == item_id:
@@ -184,31 +199,16 @@ class MediaGridWidget(QWidget):
     def _on_torrent_updated(self, item_id: int):
         flow = self._get_flow_by_id(item_id)
         if not flow: return
-        item = self.repo.get_item(item_id)
-        if not item or not item.torrent_data: return
-        
+        torrent = self.repo.get_torrent_state(item_id)
+        if not torrent: return
+
         try:
-            t_info = json.loads(item.torrent_data)
-            flow.update_torrent_ui(
-                human_state=t_info.get("human_state", "Unknown"),
-                pill_class=t_info.get("pill_class", "PillUnknown"),
-                pb_style=t_info.get("pb_style", "PbUnknown"),
-                prog_val=t_info.get("prog_val", 0.0),
-                size_str=t_info.get("size_str", "0 B"),
-                speed_str=t_info.get("speed_str", "0.0 MB/s"),
-                active_state_str=t_info.get("active_state_str", ""),
-                hash_val=t_info.get("hash", ""),
-                raw_size_bytes=t_info.get("raw_size_bytes", 0),
-            )
-            if t_info.get("prog_val", 0.0) >= 1.0:
-                flow.torrent_completed = True
-
-            cached = self._state_cache.setdefault(item_id, {})
-            cached["torrent_data"] = item.torrent_data
-            
+            self._apply_torrent_state(flow, torrent)
+
             # Populate episode rows when file list first arrives for TV series
-            cached_files = t_info.get("files", [])
-            if cached_files and hasattr(flow, 'populate_episodes_from_files'):
+            item = self.repo.get_item(item_id) if hasattr(flow, 'populate_episodes_from_files') else None
+            cached_files = self._torrent_files(item.torrent_data) if item else []
+            if cached_files:
                 existing_cached = getattr(flow, '_cached_files', None) or []
 
                 def _has_sizes(file_list):
@@ -231,17 +231,13 @@ class MediaGridWidget(QWidget):
     def _on_conversion_updated(self, item_id: int):
         flow = self._get_flow_by_id(item_id)
         if not flow: return
-        item = self.repo.get_item(item_id)
-        if not item or not item.conversion_data: return
-        
+        c_info = self._conversion_telemetry(item_id)
+        if not c_info: return
+
         try:
-            c_info = json.loads(item.conversion_data)
-            if isinstance(c_info, dict): c_info = [c_info]
             flow.update_telemetry_ui(c_info)
-            if c_info and all(ep.get("db_status", "NOT STARTED").upper() in ["COMPLETED", "FAILED", "REJECTED"] for ep in c_info):
+            if self._all_jobs_finished(c_info):
                 flow.conversion_completed = True
-            cached = self._state_cache.setdefault(item_id, {})
-            cached["conversion_data"] = item.conversion_data
         except: pass
 
     def _on_metadata_updated(self, item_id: int):
@@ -194,12 +194,12 @@ class MainDashboard(QMainWindow):
             if not pix or pix.isNull():
                 return False
 
-        if item.torrent_data:
+        if self.repo.get_torrent_state(item_id) is not None:
             state_val = getattr(getattr(flow, 'lbl_state_val', None), 'text', lambda: "")().strip().lower()
             if state_val in ("", "initializing"):
                 return False
 
-        if item.conversion_data:
+        if self.repo.get_conversion_jobs(item_id, include_logs=False):
             flowchart = getattr(flow, 'flowchart_view', None)
             # Only gate startup on the card-level chart. Episode-level charts initialize lazily.
             if flowchart and not getattr(flowchart, '_page_loaded', False):
@@ -355,6 +355,10 @@ class MainDashboard(QMainWindow):
 
     def closeEvent(self, event) -> None:
         if hasattr(self, 'shared_profile'): self.shared_profile.deleteLater()
+        # Pooled connections belong to the worker threads; close them only once none of those can be mid-query.
+        # If a thread does not stop in time, committed WAL transactions survive the hard exit below anyway.
+        if self.media_controller.shutdown() and hasattr(self.repo, 'close'):
+            self.repo.close()
         super().closeEvent(event)
         QApplication.quit()
         os._exit(0)
@@ -1,6 +1,5 @@
 import os
 import re
-import qbittorrentapi
 from datetime import datetime
 from PyQt6.QtCore import Qt, pyqtSignal, QPropertyAnimation, QEasingCurve, QEvent, QUrl
 from PyQt6.QtGui import QIcon, QPixmap, QPainter, QPainterPath, QDesktopServices
@@ -13,6 +12,7 @@ from PyQt6.QtWidgets import (
 from src.ui.dialogs.delete_torrent import DeleteTorrentDialog
 from src.ui.conversion_flowchart import ConversionFlowViewer
 from src.infrastructure.services.image_downloader import ImageDownloaderThread
+from src.infrastructure.services.torrent_size_resolver import get_torrent_size_resolver
 from src.presentation.utils.ui_helpers import apply_blur_effect, remove_blur_effect
 
 
@@ -72,6 +72,21 @@ def _format_size_text_two_decimals(size_text: str) -> str:
     return f"{value:.2f} {unit}"
 
 
+def _episode_file_size(files: list, telemetry_path: str):
+    """Size of the torrent file matching a telemetry path, or None when no file matches."""
+    normalized_telemetry_path = str(telemetry_path or '').replace('\\', '/').lower()
+    telemetry_basename = os.path.basename(normalized_telemetry_path)
+
+    # Use strict filename/suffix matching to avoid cross-season E07 collisions.
+    for f_info in files:
+        file_path = str(f_info.get('name', '')).replace('\\', '/').lower()
+        if not file_path:
+            continue
+        if file_path.endswith(normalized_telemetry_path) or os.path.basename(file_path) == telemetry_basename:
+            return _safe_int(f_info.get('size', 0))
+    return None
+
+
 def _minutes_from_general_log(log_path: str) -> float:
     if not log_path or not os.path.exists(log_path):
         return 0.0
@@ -115,20 +130,32 @@ def _minutes_from_general_log_text(log_text: str) -> float:
     return 0.0
 
 
+def _minutes_from_stored_log(log_source, telemetry: dict) -> float:
+    """Completed jobs without a local copy: fetch the general log body from the repository's log store."""
+    if log_source is None or not telemetry.get("gen_log_len") or not telemetry.get("path"):
+        return 0.0
+    gen_log, _ff_tail = log_source(telemetry["path"])
+    return _minutes_from_general_log_text(gen_log)
+
+
 # -------------------------------------------------------------
 # Standard Movie Card 
 # -------------------------------------------------------------
 class MediaCardWidget(QFrame):
     delete_confirmed = pyqtSignal(list, bool, object)  
 
-    def __init__(self, index: int, relative_path: str, title: str, season: str = "", hash_val: str = "", db_id: int = -1, parent=None):
+    def __init__(self, index: int, relative_path: str, title: str, season: str = "", hash_val: str = "", db_id: int = -1, parent=None, log_source=None):
         super().__init__(parent)
         self.flow_index = index
+        self.log_source = log_source
         self.relative_path = relative_path
         self._current_hash = hash_val
         self._qbit_initial_size_bytes = 0
+        self._last_summary_telemetry = None
+        self._last_summary_db_status = "NOT STARTED"
         self.db_id = db_id
         self.media_type = "movie"
+        get_torrent_size_resolver().size_resolved.connect(self._on_qbit_size_resolved)
         
         self.title = title if title else "Unknown Media"
         
@@ -323,35 +350,27 @@ class MediaCardWidget(QFrame):
         QDesktopServices.openUrl(QUrl.fromLocalFile(file_path))
 
     def _resolve_movie_qbit_initial_size(self) -> int:
+        """Cached qBittorrent size, or 0 while an async lookup (answered via _on_qbit_size_resolved) runs."""
         current_hash = str(getattr(self, '_current_hash', '') or '')
         if not current_hash:
             return 0
-        try:
-            host = os.getenv("QBIT_HOST")
-            port = os.getenv("QBIT_PORT")
-            user = os.getenv("QBIT_USER")
-            pwd = os.getenv("QBIT_PASS")
-            if not all([host, port, user, pwd]):
-                return 0
-
-            client = qbittorrentapi.Client(
-                host=f"http://{host}:{port}",
-                username=user,
-                password=pwd,
-            )
-            client.auth_log_in()
-            torrents = client.torrents_info()
-            matched = next((t for t in torrents if str(t.get("hash", "")) == current_hash), None)
-            if not matched:
-                return 0
-            raw_size = matched.get("total_size")
-            if raw_size is None:
-                raw_size = matched.get("size", 0)
-            return _safe_int(raw_size, 0)
-        except Exception:
-            return 0
+        resolver = get_torrent_size_resolver()
+        cached = resolver.cached_size(current_hash)
+        if cached:
+            return cached
+        resolver.request_size(current_hash)
+        return 0
+
+    def _on_qbit_size_resolved(self, torrent_hash: str, size_bytes: int) -> None:
+        if torrent_hash != self._current_hash or size_bytes <= 0 or self._qbit_initial_size_bytes > 0:
+            return
+        self._qbit_initial_size_bytes = size_bytes
+        if self._last_summary_telemetry is not None:
+            self._update_foldout_summary(self._last_summary_telemetry, self._last_summary_db_status)
 
     def _update_foldout_summary(self, telemetry: dict, db_status: str) -> None:
+        self._last_summary_telemetry = telemetry
+        self._last_summary_db_status = db_status
         # Source of truth: qBittorrent torrent size for movies.
         initial_size = _safe_int(self._qbit_initial_size_bytes)
         if initial_size <= 0:
@@ -371,8 +390,6 @@ class MediaCardWidget(QFrame):
         else:
             self.lbl_final_size.setText(f"Final size: {_format_size_bytes(final_size) if final_size > 0 else '-'}")
 
-        self.lbl_total_minutes.setText(f"Total conversion time: {total_minutes:.2f} min" if total_minutes > 0 else "Total conversion time: -")
-
         self._gen_log_local_path = str(telemetry.get("gen_log_local_path", "") or "")
         self._ff_log_local_path = str(telemetry.get("ff_log_local_path", "") or "")
 
@@ -382,6 +399,9 @@ class MediaCardWidget(QFrame):
             total_minutes = _minutes_from_general_log(self._gen_log_local_path)
 
         is_completed = str(db_status).upper() == "COMPLETED"
+        if is_completed and total_minutes <= 0.0:
+            total_minutes = _minutes_from_stored_log(self.log_source, telemetry)
+        self.lbl_total_minutes.setText(f"Total conversion time: {total_minutes:.2f} min" if total_minutes > 0 else "Total conversion time: -")
         self.btn_general_log.setEnabled(is_completed and bool(self._gen_log_local_path) and os.path.exists(self._gen_log_local_path))
         self.btn_ffmpeg_log.setEnabled(is_completed and bool(self._ff_log_local_path) and os.path.exists(self._ff_log_local_path))
         self.lbl_total_minutes.setText(f"Total conversion time: {total_minutes:.2f} min" if total_minutes > 0 else "Total conversion time: -")
@@ -594,9 +614,10 @@ class MediaCardWidget(QFrame):
 class EpisodeRowWidget(QFrame):
     delete_episode = pyqtSignal(str) 
 
-    def __init__(self, ep_name: str, ep_desc: str = "No description available.", path: str = "", ep_num: int = None, rating: str = "-", parent=None):
+    def __init__(self, ep_name: str, ep_desc: str = "No description available.", path: str = "", ep_num: int = None, rating: str = "-", parent=None, log_source=None):
         super().__init__(parent)
         self.ep_name = ep_name
+        self.log_source = log_source
         self.ep_num = ep_num
         self.ep_path = path
         self.ep_rating = rating
@@ -784,8 +805,6 @@ class EpisodeRowWidget(QFrame):
         else:
             self.lbl_final_size.setText(f"Final size: {_format_size_bytes(final_size) if final_size > 0 else '-'}")
 
-        self.lbl_total_minutes.setText(f"Total conversion time: {total_minutes:.2f} min" if total_minutes > 0 else "Total conversion time: -")
-
         self._gen_log_local_path = str(telemetry.get("gen_log_local_path", "") or "")
         self._ff_log_local_path = str(telemetry.get("ff_log_local_path", "") or "")
 
@@ -795,6 +814,9 @@ class EpisodeRowWidget(QFrame):
             total_minutes = _minutes_from_general_log(self._gen_log_local_path)
 
         is_completed = str(db_status).upper() == "COMPLETED"
+        if is_completed and total_minutes <= 0.0:
+            total_minutes = _minutes_from_stored_log(self.log_source, telemetry)
+        self.lbl_total_minutes.setText(f"Total conversion time: {total_minutes:.2f} min" if total_minutes > 0 else "Total conversion time: -")
         self.btn_general_log.setEnabled(is_completed and bool(self._gen_log_local_path) and os.path.exists(self._gen_log_local_path))
         self.btn_ffmpeg_log.setEnabled(is_completed and bool(self._ff_log_local_path) and os.path.exists(self._ff_log_local_path))
         self.lbl_total_minutes.setText(f"Total conversion time: {total_minutes:.2f} min" if total_minutes > 0 else "Total conversion time: -")
@@ -1025,9 +1047,10 @@ class EpisodeRowWidget(QFrame):
 class SeriesCardWidget(QWidget): 
     delete_confirmed = pyqtSignal(list, bool, object)
 
-    def __init__(self, index: int, relative_path: str, title: str, season: str, is_season: bool = False, hash_val: str = "", db_id: int = -1, parent=None):
+    def __init__(self, index: int, relative_path: str, title: str, season: str, is_season: bool = False, hash_val: str = "", db_id: int = -1, parent=None, log_source=None):
         super().__init__(parent)
         self.flow_index = index
+        self.log_source = log_source
         self.db_id = db_id
         self.media_type = "tv-series"
         self.relative_path = relative_path
@@ -1036,6 +1059,7 @@ class SeriesCardWidget(QWidget):
         self.is_season = is_season
         self.episodes_map = {} 
         self._cached_files = []
+        get_torrent_size_resolver().files_resolved.connect(self._on_qbit_files_resolved)
         self._expanded = False
         
         base_title = title if title else "Unknown Media"
@@ -1336,7 +1360,7 @@ class SeriesCardWidget(QWidget):
                 if ep_rating and ep_rating != '-':
                     ep_rating = str(round(float(ep_rating), 1))
         
-        row = EpisodeRowWidget(display_title, desc, path=rel_path, ep_num=ep_num, rating=ep_rating)
+        row = EpisodeRowWidget(display_title, desc, path=rel_path, ep_num=ep_num, rating=ep_rating, log_source=self.log_source)
         row.badge.setText(f"EP {ep_num}")
         if qbit_size_bytes > 0:
             row.set_qbit_initial_size_hint(qbit_size_bytes)
@@ -1381,59 +1405,34 @@ class SeriesCardWidget(QWidget):
         return int(match.group(2)) if len(match.groups()) > 1 else int(match.group(1))
 
     def _resolve_qbit_initial_size(self, telemetry_path: str, row=None) -> int:
-        cached_files = getattr(self, '_cached_files', None) or []
-        normalized_telemetry_path = str(telemetry_path or '').replace('\\', '/').lower()
-        telemetry_basename = os.path.basename(normalized_telemetry_path)
-
-        # Use strict filename/suffix matching to avoid cross-season E07 collisions.
-        for f_info in cached_files:
-            file_path = str(f_info.get('name', '')).replace('\\', '/').lower()
-            if not file_path:
-                continue
-            if file_path.endswith(normalized_telemetry_path) or os.path.basename(file_path) == telemetry_basename:
-                return _safe_int(f_info.get('size', 0))
+        cached_size = _episode_file_size(getattr(self, '_cached_files', None) or [], telemetry_path)
+        if cached_size is not None:
+            return cached_size
 
         # Live qB fallback: derive the file size directly from current torrent hash + basename.
         # This mirrors the verified EP7 source used in manual tracing (2931171105 bytes => 2.93 GB).
         current_hash = str(getattr(self, '_current_hash', '') or '')
         if not current_hash:
             return 0
-        try:
-            host = os.getenv("QBIT_HOST")
-            port = os.getenv("QBIT_PORT")
-            user = os.getenv("QBIT_USER")
-            pwd = os.getenv("QBIT_PASS")
-            if not all([host, port, user, pwd]):
-                return 0
-
-            client = qbittorrentapi.Client(
-                host=f"http://{host}:{port}",
-                username=user,
-                password=pwd,
-            )
-            client.auth_log_in()
-            raw_files = client.torrents_files(torrent_hash=current_hash)
-
-            # Refresh local cached files with live data when available.
-            refreshed = []
-            for f in raw_files:
-                refreshed.append({
-                    "name": f.get("name", ""),
-                    "size": _safe_int(f.get("size", 0), 0),
-                })
-            if refreshed:
-                self._cached_files = refreshed
-
-            for f_info in refreshed:
-                file_path = str(f_info.get('name', '')).replace('\\', '/').lower()
-                if not file_path:
-                    continue
-                if file_path.endswith(normalized_telemetry_path) or os.path.basename(file_path) == telemetry_basename:
-                    return _safe_int(f_info.get('size', 0))
-        except Exception:
+        resolver = get_torrent_size_resolver()
+        live_files = resolver.cached_files(current_hash)
+        if live_files is None:
+            # Fetched off the GUI thread; sizes are applied in _on_qbit_files_resolved.
+            resolver.request_files(current_hash)
             return 0
 
-        return 0
+        # Refresh local cached files with the shared list another caller already fetched.
+        self._cached_files = live_files
+        return _episode_file_size(live_files, telemetry_path) or 0
+
+    def _on_qbit_files_resolved(self, torrent_hash: str, files: list) -> None:
+        if not torrent_hash or torrent_hash != self._current_hash:
+            return
+        self._cached_files = files
+        for path, row in list(self.episodes_map.items()):
+            qbit_size = self._resolve_qbit_initial_size(path, row=row)
+            if qbit_size > 0 and hasattr(row, 'set_qbit_initial_size_hint'):
+                row.set_qbit_initial_size_hint(qbit_size)
 
     def update_telemetry_ui(self, episodes_data: list):
         if not episodes_data: return
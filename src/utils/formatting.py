@@ -46,4 +46,7 @@ def format_time(seconds: int) -> str:
         return "00:00:00"
     m, s = divmod(int(seconds), 60)
     h, m = divmod(m, 60)
-    return f"{h:02d}:{m:02d}:{s:02d}"
\ No newline at end of file
+    return f"{h:02d}:{m:02d}:{s:02d}"
+def format_active_state(human_state: str, progress: float, size_in_bytes: int) -> str:
+    """One-line torrent status shown on the card, e.g. 'State: Downloading | Progress: 42% | Size: 1.2 GB'."""
+    return f"State: {human_state} | Progress: {int((progress or 0.0) * 100)}% | Size: {format_size(size_in_bytes)}"
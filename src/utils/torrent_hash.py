@@ -0,0 +1,76 @@
+import hashlib
+from typing import Optional, Tuple
+
+
+def _skip_value(data: bytes, pos: int) -> int:
+    """Returns the offset just past the bencoded value starting at `pos`."""
+    lead = data[pos:pos + 1]
+    if lead == b"i":
+        return data.index(b"e", pos) + 1
+    if lead in (b"l", b"d"):
+        pos += 1
+        while data[pos:pos + 1] != b"e":
+            if not data[pos:pos + 1]:
+                raise ValueError("Unterminated bencoded container")
+            pos = _skip_value(data, pos)
+        return pos + 1
+    if lead.isdigit():
+        colon = data.index(b":", pos)
+        end = colon + 1 + int(data[pos:colon])
+        if end > len(data):
+            raise ValueError("Bencoded string runs past the end of the data")
+        return end
+    raise ValueError(f"Invalid bencode at offset {pos}")
+
+
+def _read_string(data: bytes, pos: int) -> Tuple[bytes, int]:
+    colon = data.index(b":", pos)
+    start = colon + 1
+    end = start + int(data[pos:colon])
+    return data[start:end], end
+
+
+def _info_span(data: bytes) -> Tuple[int, int]:
+    """Byte range of the top-level `info` dictionary, exactly as encoded in the file."""
+    if data[:1] != b"d":
+        raise ValueError("Torrent metainfo is not a bencoded dictionary")
+    pos = 1
+    while data[pos:pos + 1] != b"e":
+        key, pos = _read_string(data, pos)
+        end = _skip_value(data, pos)
+        if key == b"info":
+            return pos, end
+        pos = end
+    raise ValueError("Torrent metainfo has no info dictionary")
+
+
+def _is_v2_only(info: bytes) -> bool:
+    """True for BitTorrent v2 torrents without v1 piece hashes (their id is a truncated sha256)."""
+    pos = 1
+    has_pieces = False
+    meta_version = None
+    while info[pos:pos + 1] != b"e":
+        key, pos = _read_string(info, pos)
+        end = _skip_value(info, pos)
+        if key == b"pieces":
+            has_pieces = True
+        elif key == b"meta version":
+            meta_version = int(info[pos + 1:end - 1])
+        pos = end
+    return meta_version == 2 and not has_pieces
+
+
+def torrent_infohash(torrent_bytes: bytes) -> Optional[str]:
+    """
+    The hash qBittorrent reports for a .torrent file: sha1 of the bencoded info dictionary
+    (v1 and hybrid torrents) or its sha256 truncated to 40 hex digits (pure v2).
+    Returns None for data that is not valid torrent metainfo.
+    """
+    try:
+        start, end = _info_span(torrent_bytes)
+        info = torrent_bytes[start:end]
+        if _is_v2_only(info):
+            return hashlib.sha256(info).hexdigest()[:40]
+        return hashlib.sha1(info).hexdigest()
+    except (ValueError, IndexError):
+        return None
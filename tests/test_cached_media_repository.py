@@ -0,0 +1,68 @@
+import json
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.domain.entities import MediaItem
+from src.infrastructure.repositories.cached_media_repository import CachedMediaRepository
+from src.infrastructure.repositories.sqlite_media_repository import SQLiteMediaRepository
+
+
+@pytest.fixture
+def sqlite_repo(tmp_path):
+    repository = SQLiteMediaRepository(str(tmp_path / "local_data.db"))
+    yield repository
+    repository.close()
+
+
+def test_item_reads_are_served_from_memory(sqlite_repo):
+    item_id = sqlite_repo.add_item(MediaItem(relative_path="movies/up", title="Up"))
+    cached = CachedMediaRepository(sqlite_repo)
+
+    with patch.object(sqlite_repo, "get_item", side_effect=AssertionError("SQLite read")), \
+         patch.object(sqlite_repo, "get_all_items", side_effect=AssertionError("SQLite read")):
+        assert cached.get_item(item_id).title == "Up"
+        assert [item.id for item in cached.get_all_items()] == [item_id]
+
+
+def test_writes_go_through_and_update_the_cache(sqlite_repo):
+    cached = CachedMediaRepository(sqlite_repo)
+    item_id = cached.add_item(MediaItem(relative_path="tv/show", title="Show", is_season=1, media_type="tv-series"))
+
+    cached.update_item_title(item_id, "Show - Season 1")
+    cached.update_metadata(item_id, "desc", "Drama", "8.1")
+    cached.update_torrent_data_many([(item_id, '{"hash": "aa"}')])
+    cached.update_conversion_data(item_id, '[{"path": "/x.mkv", "db_status": "Pending"}]')
+
+    assert cached.get_item(item_id) == sqlite_repo.get_item(item_id)
+    assert cached.get_item(item_id).torrent_data == '{"hash": "aa"}'
+
+    assert cached.delete_item(item_id)
+    assert cached.get_item(item_id) is None
+    assert sqlite_repo.get_item(item_id) is None
+
+
+def test_returned_items_are_copies(sqlite_repo):
+    cached = CachedMediaRepository(sqlite_repo)
+    item_id = cached.add_item(MediaItem(relative_path="movies/up", title="Up"))
+
+    cached.get_item(item_id).title = "mutated"
+    assert cached.get_item(item_id).title == "Up"
+
+
+def test_cached_items_carry_log_references_not_bodies(sqlite_repo):
+    cached = CachedMediaRepository(sqlite_repo)
+    item_id = cached.add_item(MediaItem(relative_path="movies/up", title="Up"))
+    gen_log = "2024-01-01_10:00:00 - PIPELINE STARTED\n" * 500
+
+    cached.update_conversion_data(item_id, json.dumps([{"path": "/up.mkv", "db_status": "IN PROGRESS", "gen_log": gen_log}]))
+
+    job = json.loads(cached.get_item(item_id).conversion_data)[0]
+    assert "gen_log" not in job and job["gen_log_len"] == len(gen_log)
+    assert cached.get_item(item_id) == sqlite_repo.get_item(item_id)
+    assert cached.get_conversion_job_logs(item_id, "/up.mkv") == (gen_log, "")
@@ -0,0 +1,167 @@
+import io
+import os
+import socket
+import sys
+import threading
+from types import SimpleNamespace
+
+import paramiko
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.infrastructure.services.log_downloader import SFTPLogDownloader
+
+
+class _FakeRemoteFile(io.BytesIO):
+    def __init__(self, data, prefetched):
+        super().__init__(data)
+        self._prefetched = prefetched
+
+    def prefetch(self, file_size=None):
+        self._prefetched.append(file_size)
+
+
+class _FakeSFTP:
+    def __init__(self, files):
+        self.files = files
+        self.opened = []
+        self.prefetched = []
+        self.stats = []
+
+    def stat(self, path):
+        self.stats.append(path)
+        if path not in self.files:
+            raise FileNotFoundError(path)
+        data, mtime = self.files[path]
+        return SimpleNamespace(st_size=len(data), st_mtime=mtime)
+
+    def open(self, path, mode="r"):
+        self.opened.append(path)
+        return _FakeRemoteFile(self.files[path][0], self.prefetched)
+
+    def close(self):
+        pass
+
+
+def test_downloads_once_per_remote_version_over_one_channel(tmp_path):
+    sftp = _FakeSFTP({f"/logs/e{n:02d}.log": (f"episode {n}\n".encode(), 100) for n in range(1, 25)})
+    channels = []
+    downloader = SFTPLogDownloader(lambda: channels.append(sftp) or sftp, max_workers=4)
+    files = [(path, os.path.basename(path), None) for path in sftp.files] + [("/logs/missing.log", "missing.log", None)]
+    try:
+        outcome = downloader.download(str(tmp_path), files)
+        assert outcome.pop("missing.log") is False
+        assert all(outcome.values()) and len(sftp.opened) == 24
+        assert (tmp_path / "e07.log").read_text() == "episode 7\n"
+        assert sorted(sftp.prefetched) == [len(b"episode 1\n")] * 9 + [len(b"episode 10\n")] * 15
+
+        # Unchanged remote stat: nothing is re-read.
+        sftp.opened.clear()
+        downloader.download(str(tmp_path), files)
+        assert sftp.opened == []
+
+        sftp.files["/logs/e03.log"] = (b"episode 3 rerun\n", 200)
+        downloader.download(str(tmp_path), files)
+        assert sftp.opened == ["/logs/e03.log"]
+        assert (tmp_path / "e03.log").read_text() == "episode 3 rerun\n"
+        # One channel per pool thread, reused across batches.
+        assert 1 <= len(channels) <= 4
+    finally:
+        downloader.shutdown()
+
+
+def test_unchanged_row_versions_skip_the_remote_stat(tmp_path):
+    sftp = _FakeSFTP({"/logs/gen.log": (b"general\n", 100), "/logs/ff.log": (b"ffmpeg\n", 100)})
+    downloader = SFTPLogDownloader(lambda: sftp, max_workers=2)
+    try:
+        files = [("/logs/gen.log", "gen.log", "v1"), ("/logs/ff.log", "ff.log", "v1")]
+        assert downloader.download(str(tmp_path), files) == {"gen.log": True, "ff.log": True}
+        assert sorted(sftp.stats) == ["/logs/ff.log", "/logs/gen.log"]
+
+        # Same row version and remote path with the local copies present: no network call at all.
+        sftp.stats.clear()
+        assert downloader.download(str(tmp_path), files) == {"gen.log": True, "ff.log": True}
+        assert sftp.stats == []
+
+        # A new row version, a new remote path or a missing local copy stats again.
+        (tmp_path / "ff.log").unlink()
+        sftp.files["/logs/gen2.log"] = (b"general rerun\n", 200)
+        downloader.download(str(tmp_path), [("/logs/gen2.log", "gen.log", "v1"), ("/logs/ff.log", "ff.log", "v1")])
+        assert sorted(sftp.stats) == ["/logs/ff.log", "/logs/gen2.log"]
+        sftp.stats.clear()
+        downloader.download(str(tmp_path), [("/logs/gen2.log", "gen.log", "v2"), ("/logs/ff.log", "ff.log", "v1")])
+        assert sftp.stats == ["/logs/gen2.log"]
+        # The stat still matches, so the new version is recorded without re-reading the file.
+        assert sorted(sftp.opened) == ["/logs/ff.log", "/logs/ff.log", "/logs/gen.log", "/logs/gen2.log"]
+        assert (tmp_path / "gen.log").read_text() == "general rerun\n"
+    finally:
+        downloader.shutdown()
+
+
+class _LocalSFTPHandle(paramiko.SFTPHandle):
+    def stat(self):
+        return paramiko.SFTPAttributes.from_stat(os.fstat(self.readfile.fileno()))
+
+
+class _LocalSFTPServer(paramiko.SFTPServerInterface):
+    """Serves the real filesystem read-only, enough for stat/open/read."""
+    def stat(self, path):
+        try:
+            return paramiko.SFTPAttributes.from_stat(os.stat(path))
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+
+    lstat = stat
+
+    def open(self, path, flags, attr):
+        try:
+            handle = _LocalSFTPHandle(flags)
+            handle.readfile = open(path, "rb")
+            return handle
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+
+
+class _AcceptAll(paramiko.ServerInterface):
+    def get_allowed_auths(self, username):
+        return "password"
+
+    def check_auth_password(self, username, password):
+        return paramiko.AUTH_SUCCESSFUL
+
+    def check_channel_request(self, kind, chanid):
+        return paramiko.OPEN_SUCCEEDED
+
+
+def test_concurrent_downloads_over_a_real_sftp_server(tmp_path):
+    remote_dir = tmp_path / "remote"
+    remote_dir.mkdir()
+    payloads = {f"e{n:02d}.log": os.urandom(200 * 1024) for n in range(40)}
+    for name, data in payloads.items():
+        (remote_dir / name).write_bytes(data)
+
+    server_sock, client_sock = socket.socketpair()
+    server = paramiko.Transport(server_sock)
+    server.add_server_key(paramiko.RSAKey.generate(2048))
+    server.set_subsystem_handler("sftp", paramiko.SFTPServer, _LocalSFTPServer)
+    server.start_server(event=threading.Event(), server=_AcceptAll())
+    client = paramiko.Transport(client_sock)
+    client.connect(username="user", password="pass")
+
+    downloader = SFTPLogDownloader(lambda: paramiko.SFTPClient.from_transport(client), max_workers=8, timeout=10.0)
+    files = [(str(remote_dir / name), name, None) for name in payloads]
+    outcomes = []
+    try:
+        for batch in range(3):
+            local_dir = tmp_path / f"local{batch}"
+            worker = threading.Thread(target=lambda d=local_dir: outcomes.append(downloader.download(str(d), files)))
+            worker.start()
+            worker.join(60)
+            assert not worker.is_alive(), "download batch hung"
+            assert all(outcomes[-1].values()) and len(outcomes[-1]) == 40
+            assert all((local_dir / name).read_bytes() == data for name, data in payloads.items())
+    finally:
+        downloader.shutdown()
+        client.close()
+        server.close()
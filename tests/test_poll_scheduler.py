@@ -0,0 +1,79 @@
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.infrastructure.services.poll_scheduler import (
+    ACTIVE, DONE, IDLE, PollScheduler, conversion_activity, torrent_activity,
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _scheduler(clock, jitter=0.0, rng=lambda: 0.5):
+    return PollScheduler(active_interval=2.0, idle_interval=30.0, max_backoff=60.0, jitter=jitter, clock=clock, rng=rng)
+
+
+def test_interval_follows_activity_and_done_items_stop():
+    clock = _Clock()
+    scheduler = _scheduler(clock)
+    assert scheduler.due([1, 2, 3]) == [1, 2, 3]
+
+    scheduler.record(1, ACTIVE)
+    scheduler.record(2, IDLE)
+    scheduler.record(3, DONE)
+    clock.now += 2
+    assert scheduler.due([1, 2, 3]) == [1]
+    clock.now += 28
+    assert scheduler.due([1, 2, 3]) == [1, 2]
+    assert scheduler.seconds_until_due([3]) is None
+
+    scheduler.forget(3)
+    assert scheduler.is_due(3)
+
+
+def test_errors_back_off_exponentially_up_to_cap():
+    clock = _Clock()
+    scheduler = _scheduler(clock)
+    waits = []
+    for _ in range(6):
+        scheduler.record_error("item")
+        waits.append(scheduler.seconds_until_due(["item"]))
+    assert waits == [4.0, 8.0, 16.0, 32.0, 60.0, 60.0]
+
+    scheduler.record("item", ACTIVE)
+    assert scheduler.seconds_until_due(["item"]) == 2.0
+
+
+def test_jitter_spreads_deadlines_within_bounds():
+    clock = _Clock()
+    low = _scheduler(clock, jitter=0.1, rng=lambda: 0.0)
+    high = _scheduler(clock, jitter=0.1, rng=lambda: 1.0)
+    low.record("item", IDLE)
+    high.record("item", IDLE)
+    assert low.seconds_until_due(["item"]) == 27.0
+    assert high.seconds_until_due(["item"]) == 33.0
+
+
+def test_activity_classification():
+    assert torrent_activity("downloading", 0.4) == ACTIVE
+    assert torrent_activity("stalledDL", 0.4) == IDLE
+    assert torrent_activity("uploading", 1.0) == IDLE
+
+    assert conversion_activity([{"db_status": "COMPLETED"}, {"db_status": "In Progress"}]) == ACTIVE
+    assert conversion_activity([{"db_status": "COMPLETED"}, {"db_status": "queued"}]) == IDLE
+    assert conversion_activity([{"db_status": "COMPLETED"}]) == DONE
+    assert conversion_activity([]) == IDLE
+
+
+def test_failed_and_rejected_jobs_stop_fast_polling():
+    assert conversion_activity([{"db_status": "REJECTED"}, {"db_status": "QUEUED"}]) == IDLE
+    assert conversion_activity([{"db_status": "COMPLETED"}, {"db_status": "REJECTED"}, {"db_status": "FAILED"}]) == DONE
+    assert conversion_activity([{"db_status": "REJECTED"}, {"db_status": "ENCODING"}]) == ACTIVE
@@ -0,0 +1,96 @@
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.domain.entities import MediaItemSummary
+from src.infrastructure.services import qbittorrent
+from src.infrastructure.services.poll_scheduler import PollScheduler
+from src.infrastructure.services.qbittorrent import QBittorrentPollingThread
+
+
+class _FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+
+    def sync_maindata(self, rid=0):
+        return self.responses.pop(0)
+
+    def reset(self):
+        pass
+
+
+class _FakeRepository:
+    def __init__(self, items):
+        self.items = items
+
+    def get_item_summaries(self):
+        return list(self.items)
+
+    def has_torrent_cache_for_path(self, path):
+        return False
+
+    def set_torrent_cache(self, hash_val, path, data):
+        pass
+
+
+class _StopAfterCycles:
+    def __init__(self, cycles):
+        self.cycles = cycles
+        self.poller = None
+        self.updates = []
+
+    def prime(self, item_id, torrent_data):
+        pass
+
+    def execute(self, updates):
+        self.updates.append(list(updates))
+        if len(self.updates) == self.cycles:
+            self.poller.active = False
+
+
+def _poller(monkeypatch, responses, cycles):
+    monkeypatch.delenv("QBIT_POLL_MODE", raising=False)
+    session = _FakeSession(responses)
+    monkeypatch.setattr(qbittorrent, "get_qbittorrent_session", lambda: session)
+    sync = _StopAfterCycles(cycles)
+    repo = _FakeRepository([MediaItemSummary(id=1, relative_path="Movies/Up", title="Up")])
+    poller = QBittorrentPollingThread(repo=repo, sync_use_case=sync)
+    sync.poller = poller
+    now = [0.0]
+    poller.scheduler = PollScheduler(active_interval=2.0, idle_interval=30.0, jitter=0.0, clock=lambda: now[0])
+    return poller, sync, now
+
+
+def test_unmatched_items_are_polled_on_the_active_cadence(monkeypatch):
+    poller, sync, now = _poller(monkeypatch, [{"rid": 1, "full_update": True, "torrents": {}}], cycles=1)
+
+    poller.run()
+
+    assert sync.updates == [[]]
+    now[0] = 2.0
+    assert poller.scheduler.is_due(1)
+
+
+def test_deleted_torrents_stop_counting_as_known(monkeypatch):
+    torrent = {"name": "Up", "save_path": "/data/Movies/Up", "progress": 0.5, "state": "downloading"}
+    poller, sync, now = _poller(monkeypatch, [
+        {"rid": 1, "full_update": True, "torrents": {"aa": torrent}},
+        {"rid": 2, "torrents": {}},
+        {"rid": 3, "torrents_removed": ["aa"]},
+    ], cycles=1)
+    poller.run()
+    assert poller.is_known_torrent("aa")
+
+    poller.forget_torrents(["aa"])
+    assert not poller.is_known_torrent("aa")
+
+    # Still listed while qBittorrent finishes the deletion, then gone from both sets.
+    for cycles in (2, 3):
+        sync.cycles = cycles
+        now[0] += 3.0
+        poller.active = True
+        poller.run()
+        assert not poller.is_known_torrent("aa")
+    assert poller._deleted_hashes == set()
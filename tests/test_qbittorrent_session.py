@@ -0,0 +1,71 @@
+import os
+import sys
+import threading
+
+import pytest
+import qbittorrentapi
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.infrastructure.services.qbittorrent_session import QBittorrentSession
+
+
+class _FakeClient:
+    instances = []
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.logins = 0
+        self.expire_next = False
+        self.in_flight = 0
+        self.max_in_flight = 0
+        _FakeClient.instances.append(self)
+
+    def auth_log_in(self):
+        self.logins += 1
+
+    def torrents_info(self, **kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.expire_next:
+                self.expire_next = False
+                raise qbittorrentapi.Forbidden403Error("session expired")
+            return [{"hash": "aa", **kwargs}]
+        finally:
+            self.in_flight -= 1
+
+    def app_version(self):
+        raise qbittorrentapi.APIConnectionError("refused")
+
+
+@pytest.fixture
+def session():
+    _FakeClient.instances = []
+    return QBittorrentSession("nas", "8080", "user", "pass", client_factory=_FakeClient)
+
+
+def test_logs_in_once_and_serializes_calls_across_threads(session):
+    workers = [threading.Thread(target=session.torrents_info) for _ in range(8)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    client, = _FakeClient.instances
+    assert client.logins == 1 and client.max_in_flight == 1
+    assert client.kwargs["host"] == "http://nas:8080"
+
+
+def test_expired_login_is_renewed_and_connection_errors_drop_the_client(session):
+    session.torrents_info()
+    client = _FakeClient.instances[0]
+    client.expire_next = True
+    assert session.torrents_info(category="tv") == [{"hash": "aa", "category": "tv"}]
+    assert client.logins == 2
+
+    with pytest.raises(qbittorrentapi.APIConnectionError):
+        session.app_version()
+    session.torrents_info()
+    assert len(_FakeClient.instances) == 2
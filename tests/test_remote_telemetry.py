@@ -0,0 +1,118 @@
+import os
+import sqlite3
+import sys
+from contextlib import closing
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.infrastructure.services import remote_telemetry
+
+
+def _jobs_db(tmp_path, rows):
+    conn = sqlite3.connect(str(tmp_path / "conversion_data.db"))
+    with conn:
+        conn.execute("CREATE TABLE jobs (id INTEGER PRIMARY KEY, status TEXT, stage_results TEXT, path TEXT)")
+        conn.executemany("INSERT INTO jobs (status, stage_results, path) VALUES (?, ?, ?)", rows)
+    return conn
+
+
+def test_batch_answers_every_target_from_one_pass(tmp_path, monkeypatch):
+    gen_dir = tmp_path / "general"
+    ff_dir = tmp_path / "ffmpeg"
+    gen_dir.mkdir()
+    ff_dir.mkdir()
+    (ff_dir / "show_name_s01e02.log").write_text("Duration: 00:10:00.00\ntime=00:05:00.00\n")
+    monkeypatch.setattr(remote_telemetry, "GENERAL_LOG_DIR", str(gen_dir))
+    monkeypatch.setattr(remote_telemetry, "FFMPEG_LOG_DIR", str(ff_dir))
+
+    with closing(_jobs_db(tmp_path, [
+        ("COMPLETED", "{}", "/data/tv/Show.Name.S01E01.mkv"),
+        ("IN PROGRESS", "{}", "/data/tv/Show.Name.S01E02.mkv"),
+        ("QUEUED", "{}", "/data/tv/Show.Name.S02E01.mkv"),
+        ("COMPLETED", "{}", "/data/movies/Avatar.2009.mkv"),
+    ])) as conn:
+        results = remote_telemetry.collect_batch(conn.cursor(), [
+            {"key": 1, "target": "Show Name", "season": "Season 1"},
+            {"key": 2, "target": "avatar"},
+            {"key": 3, "target": "Missing Title"},
+        ])
+
+    assert [row["path"] for row in results["1"]] == ["/data/tv/Show.Name.S01E02.mkv", "/data/tv/Show.Name.S01E01.mkv"]
+    assert results["1"][0]["prog"] == 50
+    assert [row["db_status"] for row in results["2"]] == ["COMPLETED"]
+    assert results["3"] == []
+
+
+def test_log_index_memoizes_until_directory_changes(tmp_path, monkeypatch):
+    older = tmp_path / "show_s01e01_a.log"
+    newer = tmp_path / "show_s01e01_b.log"
+    older.write_text("")
+    newer.write_text("")
+    os.utime(older, (1_000, 1_000))
+    os.utime(newer, (2_000, 2_000))
+    os.utime(tmp_path, ns=(1, 1))
+
+    index = remote_telemetry.LogIndex(str(tmp_path))
+    index.refresh()
+    assert index.find(["s01e01"]) == str(newer)
+    assert index.find(["missing"]) is None
+
+    listings = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(remote_telemetry.os, "scandir", lambda d: listings.append(d) or real_scandir(d))
+    index.refresh()
+    assert listings == []
+
+    (tmp_path / "missing_title.log").write_text("")
+    os.utime(tmp_path, ns=(2, 2))
+    index.refresh()
+    assert listings == [str(tmp_path)]
+    assert index.find(["missing"]) == str(tmp_path / "missing_title.log")
+
+
+def test_ffmpeg_log_is_parsed_incrementally_and_restarts_on_truncation(tmp_path):
+    log_path = tmp_path / "ffmpeg.log"
+    log_path.write_bytes(b"Duration: 00:10:00.00, bitrate: 800 kb/s\nframe=1 size=  10kB time=00:01:00.00 \r")
+    reader = remote_telemetry.FfmpegLog(str(log_path))
+    reader.update()
+    assert reader.snapshot() == (600.0, 60.0, 10, 800.0)
+
+    with open(log_path, "ab") as f:
+        f.write(b"frame=2 size=  20kB time=00:05:")
+    reader.update()
+    # The half-written progress line is not committed yet.
+    assert reader.last_time_s == 60.0 and reader.snapshot()[2] == 20
+
+    with open(log_path, "ab") as f:
+        f.write(b"00.00 \r")
+    reader.update()
+    assert reader.offset == log_path.stat().st_size
+    assert reader.snapshot() == (600.0, 300.0, 20, 800.0)
+
+    log_path.write_bytes(b"Duration: 00:20:00.00\n")
+    reader.update()
+    assert reader.snapshot() == (1200.0, None, None, None)
+
+
+def test_general_log_snapshot_matches_full_read(tmp_path):
+    log_path = tmp_path / "general.log"
+    log_path.write_text("2024-01-01_10:00:00 - PIPELINE STARTED\nExtracting subtitle\n")
+    reader = remote_telemetry.GeneralLog(str(log_path))
+    reader.update()
+    assert reader.snapshot() == ("2024-01-01_10:00:00 - PIPELINE STARTED\nExtracting subtitle", "In Progress", 0.0)
+
+    with open(log_path, "a") as f:
+        f.write("Converted\n2024-01-01_10:30:00 - PIPELINE SUCCESS")
+    reader.update()
+    content, sub_status, minutes = reader.snapshot()
+    assert content == log_path.read_text().strip()
+    assert (sub_status, minutes) == ("Completed", 30.0)
+
+
+def test_read_tail_seeks_from_end(tmp_path):
+    log_path = tmp_path / "ffmpeg.log"
+    lines = [f"frame={i}" for i in range(5000)]
+    log_path.write_text("\r".join(lines) + "\n")
+    assert remote_telemetry.read_tail(str(log_path), max_lines=50, window=256) == "\n".join(lines[-50:])
+    assert remote_telemetry.read_tail(str(log_path), max_lines=50) == "\n".join(lines[-50:])
@@ -0,0 +1,33 @@
+import os
+import sys
+
+import pytest
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.infrastructure.repositories.sqlite_media_repository import SQLiteMediaRepository, _HOT_LOOKUP_QUERIES
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repository = SQLiteMediaRepository(str(tmp_path / "local_data.db"))
+    yield repository
+    repository.close()
+
+
+@pytest.mark.parametrize("name", sorted(_HOT_LOOKUP_QUERIES))
+def test_hot_lookups_resolve_through_an_index(repo, name):
+    sql, params = _HOT_LOOKUP_QUERIES[name]
+    plan = repo.explain_query_plan(sql, params)
+
+    assert plan, f"{name}: empty query plan"
+    # SQLite reports "SEARCH ... USING [COVERING] INDEX / INTEGER PRIMARY KEY" for indexed access
+    # and "SCAN <table>" for a full table scan.
+    assert not any(detail.startswith("SCAN") for detail in plan), f"{name}: {plan}"
+    assert any(detail.startswith("SEARCH") for detail in plan), f"{name}: {plan}"
+
+
+def test_torrent_cache_path_probe_is_index_only(repo):
+    plan = repo.explain_query_plan(*_HOT_LOOKUP_QUERIES["torrent_cache_exists_for_path"])
+    assert any("COVERING INDEX idx_torrent_cache_path" in detail for detail in plan), plan
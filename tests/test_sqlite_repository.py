@@ -0,0 +1,266 @@
+import json
+import os
+import sqlite3
+import sys
+import threading
+from contextlib import closing
+
+import pytest
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.domain.entities import MediaItem
+from src.infrastructure.repositories.sqlite_media_repository import SQLiteMediaRepository
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Provides a fresh file-backed repository (WAL needs a real file, not :memory:)."""
+    repository = SQLiteMediaRepository(str(tmp_path / "local_data.db"))
+    yield repository
+    repository.close()
+
+
+def test_connection_is_reused_per_thread(repo):
+    assert repo._get_connection() is repo._get_connection()
+
+    other = {}
+    worker = threading.Thread(target=lambda: other.setdefault("conn", repo._get_connection()))
+    worker.start()
+    worker.join()
+    assert other["conn"] is not repo._get_connection()
+
+
+def test_connection_uses_wal_journal(repo):
+    mode = repo._get_connection().execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode.lower() == "wal"
+
+
+def test_reader_is_not_blocked_by_open_write_transaction(repo):
+    item_id = repo.add_item(MediaItem(relative_path="movies/avatar", title="Avatar"))
+    write_started = threading.Event()
+    release_writer = threading.Event()
+
+    def hold_writer_lock():
+        conn = repo._get_connection()
+        with conn:
+            conn.execute("UPDATE media_items SET title = ? WHERE id = ?", ("Avatar 2", item_id))
+            write_started.set()
+            release_writer.wait(5)
+
+    writer = threading.Thread(target=hold_writer_lock)
+    writer.start()
+    write_started.wait(5)
+    try:
+        # The uncommitted write is invisible, but the read must not wait for it.
+        assert repo.get_item(item_id).title == "Avatar"
+    finally:
+        release_writer.set()
+        writer.join()
+    assert repo.get_item(item_id).title == "Avatar 2"
+
+
+def test_close_allows_transparent_reconnect(repo):
+    item_id = repo.add_item(MediaItem(relative_path="movies/up", title="Up"))
+    repo.close()
+    assert repo.get_item(item_id).title == "Up"
+
+
+def test_update_torrent_data_many_commits_in_one_transaction(repo):
+    first = repo.add_item(MediaItem(relative_path="movies/a", title="A"))
+    second = repo.add_item(MediaItem(relative_path="movies/b", title="B"))
+    conn = repo._get_connection()
+    changes_before = conn.total_changes
+
+    repo.update_torrent_data_many([(first, '{"hash": "aa"}'), (second, '{"hash": "bb"}'), (None, "{}")])
+
+    # Two media_items rows plus their torrent_state mirrors
+    assert conn.total_changes - changes_before == 4
+    assert repo.get_item(first).torrent_data == '{"hash": "aa"}'
+    assert repo.get_item(second).torrent_data == '{"hash": "bb"}'
+
+
+def test_identical_payloads_do_not_rewrite_rows(repo):
+    item_id = repo.add_item(MediaItem(relative_path="movies/a", title="A"))
+    repo.update_torrent_data(item_id, '{"hash": "aa"}')
+    repo.update_conversion_data(item_id, '[{"db_status": "COMPLETED"}]')
+    conn = repo._get_connection()
+    changes_before = conn.total_changes
+
+    repo.update_torrent_data(item_id, '{"hash": "aa"}')
+    repo.update_torrent_data_many([(item_id, '{"hash": "aa"}')])
+    repo.update_conversion_data(item_id, '[{"db_status": "COMPLETED"}]')
+
+    assert conn.total_changes == changes_before
+
+
+def test_telemetry_blobs_are_mirrored_into_normalized_tables(repo):
+    item_id = repo.add_item(MediaItem(relative_path="tv/show", title="Show", is_season=1))
+    repo.update_torrent_data(item_id, json.dumps({
+        "hash": "abc", "name": "Show.S01", "human_state": "Downloading", "prog_val": 0.5,
+        "qbit_state": "downloading", "raw_size_bytes": 2048, "eta": 60, "dl_speed": 512,
+    }))
+    repo.update_conversion_data(item_id, json.dumps([
+        {"path": "/data/Show.S01E01.mkv", "db_status": "COMPLETED", "stage_results": '{"p1-input": "pass"}', "prog": 100},
+        {"path": "/data/Show.S01E02.mkv", "db_status": "Failed", "prog": 12},
+    ]))
+
+    state = repo.get_torrent_state(item_id)
+    assert (state.hash, state.progress, state.state, state.total_size) == ("abc", 0.5, "downloading", 2048)
+
+    jobs = repo.get_conversion_jobs(item_id)
+    assert [job.path for job in jobs] == ["/data/Show.S01E01.mkv", "/data/Show.S01E02.mkv"]
+    assert jobs[0].stage_results == {"p1-input": "pass"}
+
+    failed = repo.get_conversion_jobs_by_status("FAILED")
+    assert [(job.item_id, job.prog) for job in failed] == [(item_id, 12)]
+
+    repo.delete_item(item_id)
+    assert repo.get_torrent_state(item_id) is None
+    assert repo.get_conversion_jobs(item_id) == []
+
+
+def test_existing_blobs_are_backfilled_on_upgrade(tmp_path):
+    db_path = str(tmp_path / "legacy.db")
+    with closing(sqlite3.connect(db_path)) as conn, conn:
+        conn.execute("CREATE TABLE media_items (id INTEGER PRIMARY KEY AUTOINCREMENT, relative_path TEXT NOT NULL, "
+                     "image_url TEXT, title TEXT NOT NULL, season TEXT, torrent_data TEXT, conversion_data TEXT)")
+        conn.execute("INSERT INTO media_items (relative_path, title, torrent_data, conversion_data) VALUES (?, ?, ?, ?)",
+                     ("movies/up", "Up", '{"hash": "ff", "human_state": "Completed", "pill_class": "PillSuccess", "prog_val": 1.0}',
+                      '[{"path": "/data/Up.mkv", "db_status": "COMPLETED"}]'))
+
+    repository = SQLiteMediaRepository(db_path)
+    try:
+        state = repository.get_torrent_state(1)
+        assert (state.human_state, state.pill_class) == ("Completed", "PillSuccess")
+        assert repository.get_conversion_jobs(1)[0].path == "/data/Up.mkv"
+    finally:
+        repository.close()
+
+
+def test_schema_version_is_recorded_and_reopen_skips_migrations(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "local_data.db")
+    SQLiteMediaRepository(db_path).close()
+
+    latest = SQLiteMediaRepository._MIGRATIONS[-1][0]
+    with closing(sqlite3.connect(db_path)) as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == latest
+
+    def fail(_repo, _cursor):
+        raise AssertionError("migration re-applied on an up-to-date database")
+
+    monkeypatch.setattr(SQLiteMediaRepository, "_MIGRATIONS", tuple((v, fail) for v, _ in SQLiteMediaRepository._MIGRATIONS))
+    SQLiteMediaRepository(db_path).close()
+
+
+def test_recover_tmdb_id_by_title_uses_indexed_title(repo):
+    repo.set_tmdb_cache("1399", "tv", json.dumps({"full_title": "Game of Thrones (2011)", "description": ""}))
+    repo.set_tmdb_cache("eps_1399_1", "tv_season", json.dumps({"1": {"name": "Winter Is Coming"}}))
+
+    assert repo.recover_tmdb_id_by_title("Game of Thrones (2011)") == "1399"
+    assert repo.recover_tmdb_id_by_title("game of thrones 2011") == "1399"
+    assert repo.recover_tmdb_id_by_title("Winter Is Coming") is None
+
+    plan = " ".join(row[3] for row in repo._get_connection().execute(
+        "EXPLAIN QUERY PLAN SELECT id FROM tmdb_cache WHERE full_title = ?", ("x",)))
+    assert "idx_tmdb_cache_full_title" in plan
+
+
+def test_tmdb_titles_are_backfilled_on_upgrade(tmp_path):
+    db_path = str(tmp_path / "legacy.db")
+    with closing(sqlite3.connect(db_path)) as conn, conn:
+        conn.execute("CREATE TABLE tmdb_cache (id TEXT, type TEXT, data TEXT, PRIMARY KEY (id, type))")
+        conn.execute("INSERT INTO tmdb_cache VALUES (?, ?, ?)", ("603", "movie", '{"full_title": "The Matrix (1999)"}'))
+
+    repository = SQLiteMediaRepository(db_path)
+    try:
+        assert repository.recover_tmdb_id_by_title("The Matrix (1999)") == "603"
+    finally:
+        repository.close()
+
+
+def test_item_summaries_skip_conversion_payload(repo):
+    done = repo.add_item(MediaItem(relative_path="tv/a", title="A", is_season=1, media_type="tv-series"))
+    busy = repo.add_item(MediaItem(relative_path="tv/b", title="B", is_season=1, media_type="tv-series"))
+    repo.update_torrent_data(done, json.dumps({"hash": "aa", "human_state": "Completed", "prog_val": 1.0}))
+    repo.update_conversion_data(done, json.dumps([{"path": "/a1.mkv", "db_status": "COMPLETED", "gen_log": "x" * 4096}]))
+    repo.update_conversion_data(busy, json.dumps([
+        {"path": "/b1.mkv", "db_status": "COMPLETED"},
+        {"path": "/b2.mkv", "db_status": "IN PROGRESS", "ff_tail": "frame=1"},
+    ]))
+
+    summaries = {summary.id: summary for summary in repo.get_item_summaries()}
+    assert not hasattr(summaries[done], "conversion_data")
+    assert (summaries[done].torrent_hash, summaries[done].torrent_state) == ("aa", "Completed")
+    assert summaries[done].conversion_completed
+    assert (summaries[busy].conversion_job_count, summaries[busy].conversion_completed) == (2, False)
+
+    jobs = repo.get_conversion_jobs(busy, include_logs=False)
+    assert [job.ff_tail for job in jobs] == ["", ""]
+    assert repo.get_conversion_job_logs(busy, "/b2.mkv") == ("", "frame=1")
+
+
+def test_conversion_logs_are_stored_once_and_pruned(repo):
+    first = repo.add_item(MediaItem(relative_path="tv/a", title="A", is_season=1))
+    second = repo.add_item(MediaItem(relative_path="tv/b", title="B", is_season=1))
+    shared_log = "frame= 100 fps=24\n" * 2000
+    repo.update_conversion_data(first, json.dumps([{"path": "/a.mkv", "db_status": "IN PROGRESS", "gen_log": shared_log}]))
+    repo.update_conversion_data(second, json.dumps([{"path": "/b.mkv", "db_status": "IN PROGRESS", "gen_log": shared_log}]))
+
+    conn = repo._get_connection()
+    (stored_rows, stored_bytes), = conn.execute("SELECT COUNT(*), SUM(LENGTH(body)) FROM conversion_logs")
+    assert stored_rows == 1 and stored_bytes < len(shared_log) // 10
+    raw = conn.execute("SELECT conversion_data FROM media_items WHERE id = ?", (first,)).fetchone()[0]
+    assert shared_log not in raw and json.loads(raw)[0]["gen_log_len"] == len(shared_log)
+
+    # Item reads carry only the reference; the body is loaded on demand.
+    job = json.loads(repo.get_item(first).conversion_data)[0]
+    assert "gen_log" not in job and job["gen_log_len"] == len(shared_log)
+    assert repo.get_conversion_job_logs(first, "/a.mkv") == (shared_log, "")
+    assert repo.get_conversion_jobs(second)[0].gen_log == shared_log
+
+    repo.update_conversion_data(first, json.dumps([{"path": "/a.mkv", "db_status": "COMPLETED", "gen_log": "done"}]))
+    repo.delete_item(second)
+    assert [row[0] for row in conn.execute("SELECT length FROM conversion_logs")] == [len("done")]
+
+
+def test_job_rows_are_only_rewritten_when_they_change(repo):
+    item_id = repo.add_item(MediaItem(relative_path="tv/show", title="Show", is_season=1))
+    first = {"path": "/e1.mkv", "db_status": "COMPLETED", "gen_log": "first done"}
+    second = {"path": "/e2.mkv", "db_status": "IN PROGRESS", "prog": 10, "gen_log": "second running"}
+    third = {"path": "/e3.mkv", "db_status": "QUEUED"}
+    repo.update_conversion_data(item_id, json.dumps([first, second, third]))
+
+    conn = repo._get_connection()
+    rowids = dict(conn.execute("SELECT path, rowid FROM conversion_jobs WHERE item_id = ?", (item_id,)).fetchall())
+    changes_before = conn.total_changes
+    repo.update_conversion_data(item_id, json.dumps([first, dict(second, prog=55)]))
+
+    # One media_items row, one changed job and one vanished job; the unchanged job is left alone.
+    assert conn.total_changes - changes_before == 3
+    after = dict(conn.execute("SELECT path, rowid FROM conversion_jobs WHERE item_id = ?", (item_id,)).fetchall())
+    assert after == {"/e1.mkv": rowids["/e1.mkv"], "/e2.mkv": rowids["/e2.mkv"]}
+    assert [job.prog for job in repo.get_conversion_jobs(item_id, include_logs=False)] == [0, 55]
+    assert repo.get_conversion_job_logs(item_id, "/e1.mkv") == ("first done", "")
+
+    repo.update_conversion_data(item_id, json.dumps([first]))
+    assert {row[0] for row in conn.execute("SELECT length FROM conversion_logs")} == {len("first done")}
+
+
+def test_inline_logs_are_moved_to_store_on_upgrade(tmp_path):
+    db_path = str(tmp_path / "legacy.db")
+    with closing(sqlite3.connect(db_path)) as conn, conn:
+        conn.execute("CREATE TABLE media_items (id INTEGER PRIMARY KEY AUTOINCREMENT, relative_path TEXT NOT NULL, "
+                     "image_url TEXT, title TEXT NOT NULL, season TEXT, torrent_data TEXT, conversion_data TEXT)")
+        conn.execute("INSERT INTO media_items (relative_path, title, conversion_data) VALUES (?, ?, ?)",
+                     ("movies/up", "Up", '[{"path": "/data/Up.mkv", "db_status": "COMPLETED", "ff_tail": "frame=9"}]'))
+
+    repository = SQLiteMediaRepository(db_path)
+    try:
+        raw = repository._get_connection().execute("SELECT conversion_data FROM media_items").fetchone()[0]
+        assert "frame=9" not in raw
+        assert repository.get_conversion_job_logs(1, "/data/Up.mkv") == ("", "frame=9")
+        assert json.loads(repository.get_item(1).conversion_data)[0]["ff_tail_len"] == len("frame=9")
+    finally:
+        repository.close()
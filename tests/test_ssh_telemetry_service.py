@@ -0,0 +1,150 @@
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+from contextlib import closing
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.infrastructure.services.ssh_client import SSHTelemetryService, TelemetryTarget
+
+
+class _PipeReader:
+    def __init__(self, stream):
+        self._stream = stream
+
+    def readline(self):
+        return self._stream.readline().decode("utf-8")
+
+    def read(self):
+        return self._stream.read()
+
+
+class _PipeWriter:
+    def __init__(self, stream):
+        self._stream = stream
+
+    def write(self, data):
+        self._stream.write(data.encode("utf-8"))
+
+    def flush(self):
+        self._stream.flush()
+
+
+class _LocalChannel:
+    """Stands in for a paramiko session channel by running the command through a local shell."""
+    def __init__(self):
+        self.combine_stderr = False
+        self.command = None
+        self.process = None
+
+    def set_combine_stderr(self, combine):
+        self.combine_stderr = combine
+
+    def exec_command(self, command):
+        self.command = command
+        self.process = subprocess.Popen(
+            command, shell=True, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT if self.combine_stderr else subprocess.PIPE,
+        )
+
+    def makefile_stdin(self, mode):
+        return _PipeWriter(self.process.stdin)
+
+    def makefile(self, mode):
+        return _PipeReader(self.process.stdout)
+
+    def settimeout(self, timeout):
+        pass
+
+    def shutdown_write(self):
+        self.process.stdin.close()
+
+    def close(self):
+        if not self.process.stdin.closed:
+            self.process.stdin.close()
+        self.process.wait(timeout=30)
+
+
+class _LocalClient:
+    def __init__(self):
+        self.channels = []
+
+    def get_transport(self):
+        return self
+
+    def open_session(self):
+        channel = _LocalChannel()
+        self.channels.append(channel)
+        return channel
+
+
+class _RecordingSync:
+    def __init__(self):
+        self.payloads = []
+
+    def execute(self, item_id, conversion_data):
+        self.payloads.append((item_id, json.loads(conversion_data)))
+
+
+class _NoItems:
+    def get_item(self, item_id):
+        return None
+
+
+def _jobs_db(app_dir, rows):
+    with closing(sqlite3.connect(str(app_dir / "conversion_data.db"))) as conn, conn:
+        conn.execute("CREATE TABLE jobs (id INTEGER PRIMARY KEY, status TEXT, stage_results TEXT, path TEXT)")
+        conn.executemany("INSERT INTO jobs (status, stage_results, path) VALUES (?, ?, ?)", rows)
+
+
+def _service():
+    service = SSHTelemetryService(repo=_NoItems(), sync_use_case=_RecordingSync())
+    service.register(1, "Show Name")
+    return service, service._get_remote_script_b64()
+
+
+def test_agent_answers_over_its_channel_and_later_polls_are_deltas(tmp_path):
+    _jobs_db(tmp_path, [("IN PROGRESS", "{}", "/data/tv/Show.Name.S01E01.mkv")])
+    service, b64_script = _service()
+    client = _LocalClient()
+    target = TelemetryTarget(1, "Show Name")
+
+    agent, results = service._query_via_agent(None, client, b64_script, str(tmp_path), [target])
+    try:
+        assert client.channels[0].combine_stderr
+        assert [row["db_status"] for row in results["1"]] == ["IN PROGRESS"]
+        service._apply_results(None, target, results["1"])
+
+        # The agent remembers what it sent: an unchanged row comes back as just its path and version.
+        agent, results = service._query_via_agent(agent, client, b64_script, str(tmp_path), [target])
+        assert len(client.channels) == 1
+        assert set(results["1"][0]) == {"path", "v"}
+        service._apply_results(None, target, results["1"])
+    finally:
+        agent.close()
+
+    first, second = service.sync_use_case.payloads
+    assert first == second
+    assert first[1][0]["path"] == "/data/tv/Show.Name.S01E01.mkv"
+
+
+def test_one_shot_fallback_sends_large_batches_over_stdin(tmp_path):
+    _jobs_db(tmp_path, [("QUEUED", "{}", "/data/tv/Show.Name.S01E01.mkv")])
+    service, b64_script = _service()
+    service._agent_failures = service._MAX_AGENT_FAILURES
+    # Known-version maps of a large library: well past the kernel's 128 KiB per-argument limit.
+    service._job_cache[1] = {f"/data/tv/Show.Name.S09E{n:04d}.mkv": ("0" * 40, {}) for n in range(4000)}
+    client = _LocalClient()
+    target = TelemetryTarget(1, "Show Name")
+
+    agent, results = service._query_via_agent(None, client, b64_script, str(tmp_path), [target])
+    assert (agent, results) == (None, None)
+    results = service._query_targets(client, b64_script, str(tmp_path), [target])
+
+    assert len(client.channels[0].command) < 64 * 1024
+    assert [row["db_status"] for row in results["1"]] == ["QUEUED"]
+    service._apply_results(None, target, results["1"])
+    assert service.sync_use_case.payloads[0][1][0]["path"] == "/data/tv/Show.Name.S01E01.mkv"
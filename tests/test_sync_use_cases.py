@@ -0,0 +1,84 @@
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.application.use_cases import sync_use_cases
+from src.application.use_cases.sync_use_cases import SyncConversionStateUseCase, SyncTorrentStatesBatchUseCase
+
+
+class _FakeSignal:
+    def __init__(self):
+        self.emitted = []
+
+    def emit(self, item_id):
+        self.emitted.append(item_id)
+
+
+class _FakeEventBus:
+    def __init__(self):
+        self.torrent_updated_signal = _FakeSignal()
+        self.conversion_updated_signal = _FakeSignal()
+
+
+class _FakeRepository:
+    def __init__(self):
+        self.torrent_writes = []
+        self.conversion_writes = []
+
+    def update_torrent_data_many(self, updates):
+        self.torrent_writes.append(list(updates))
+
+    def update_conversion_data(self, item_id, data):
+        self.conversion_writes.append((item_id, data))
+
+
+def _use_case(monkeypatch, cls):
+    bus = _FakeEventBus()
+    monkeypatch.setattr(sync_use_cases, "event_bus", bus)
+    repo = _FakeRepository()
+    return cls(repo), repo, bus
+
+
+def test_unchanged_torrent_payloads_skip_the_write_and_the_signal(monkeypatch):
+    use_case, repo, bus = _use_case(monkeypatch, SyncTorrentStatesBatchUseCase)
+
+    use_case.execute([(1, '{"hash": "aa"}'), (2, '{"hash": "bb"}')])
+    use_case.execute([(1, '{"hash": "aa"}'), (2, '{"hash": "bb", "prog_val": 5}')])
+    use_case.execute([(1, '{"hash": "aa"}'), (2, '{"hash": "bb", "prog_val": 5}')])
+
+    assert repo.torrent_writes == [
+        [(1, '{"hash": "aa"}'), (2, '{"hash": "bb"}')],
+        [(2, '{"hash": "bb", "prog_val": 5}')],
+    ]
+    assert bus.torrent_updated_signal.emitted == [1, 2, 2]
+
+
+def test_prime_seeds_persisted_state_without_overriding_newer_payloads(monkeypatch):
+    use_case, repo, bus = _use_case(monkeypatch, SyncTorrentStatesBatchUseCase)
+
+    use_case.prime(1, '{"hash": "aa"}')
+    use_case.prime(2, None)
+    use_case.execute([(1, '{"hash": "aa"}')])
+    assert repo.torrent_writes == []
+    assert bus.torrent_updated_signal.emitted == []
+
+    use_case.execute([(1, '{"hash": "aa", "prog_val": 9}')])
+    # A later prime with the stale database value must not make the newer payload look unpersisted.
+    use_case.prime(1, '{"hash": "aa"}')
+    use_case.execute([(1, '{"hash": "aa", "prog_val": 9}'), (2, '{"hash": "bb"}')])
+
+    assert repo.torrent_writes == [[(1, '{"hash": "aa", "prog_val": 9}')], [(2, '{"hash": "bb"}')]]
+    assert bus.torrent_updated_signal.emitted == [1, 2]
+
+
+def test_unchanged_conversion_payloads_skip_the_write_and_the_signal(monkeypatch):
+    use_case, repo, bus = _use_case(monkeypatch, SyncConversionStateUseCase)
+
+    use_case.execute(3, '[{"path": "/a.mkv", "prog": 10}]')
+    use_case.execute(3, '[{"path": "/a.mkv", "prog": 10}]')
+    use_case.execute(3, '[{"path": "/a.mkv", "prog": 20}]')
+
+    assert repo.conversion_writes == [(3, '[{"path": "/a.mkv", "prog": 10}]'), (3, '[{"path": "/a.mkv", "prog": 20}]')]
+    assert bus.conversion_updated_signal.emitted == [3, 3]
@@ -0,0 +1,45 @@
+import os
+import sys
+
+import pytest
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.infrastructure.services.remote_telemetry import DeltaEncoder
+from src.infrastructure.services.telemetry_delta import known_versions, merge_rows
+
+
+def _row(path, status, prog, gen_log=""):
+    return {"path": path, "db_status": status, "prog": prog, "gen_log": gen_log, "ff_tail": ""}
+
+
+def test_only_changed_rows_and_fields_cross_the_wire():
+    encoder = DeltaEncoder()
+    first = [_row("/a.mkv", "COMPLETED", 100, "done\n"), _row("/b.mkv", "IN PROGRESS", 10, "start\n")]
+    entries = encoder.encode(1, first, {})
+    assert all(entry["full"] for entry in entries)
+    rows, cache = merge_rows({}, entries)
+    assert rows == first
+
+    second = [first[0], _row("/b.mkv", "IN PROGRESS", 40, "start\nstep\n")]
+    entries = encoder.encode(1, second, known_versions(cache))
+    assert entries[0] == {"path": "/a.mkv", "v": cache["/a.mkv"][0]}
+    assert set(entries[1]) == {"path", "v", "base", "prog", "gen_log_append"}
+    assert entries[1]["gen_log_append"] == "step\n"
+    rows, cache = merge_rows(cache, entries)
+    assert rows == second
+
+
+def test_fresh_encoder_sends_full_rows_for_changes_and_merge_rejects_unknown_base():
+    row = _row("/a.mkv", "IN PROGRESS", 10)
+    _, cache = merge_rows({}, DeltaEncoder().encode(1, [row], {}))
+
+    # A restarted agent has no memory of what it sent, so changed rows come back whole.
+    changed = dict(row, prog=20)
+    entries = DeltaEncoder().encode(1, [changed], known_versions(cache))
+    assert entries[0]["full"]
+    assert merge_rows(cache, entries)[0] == [changed]
+
+    with pytest.raises(ValueError):
+        merge_rows({}, [{"path": "/a.mkv", "v": "x", "base": "y", "prog": 30}])
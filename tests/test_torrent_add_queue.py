@@ -0,0 +1,90 @@
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.application.torrent_add_queue import KNOWN, QUEUED, WAITING, TorrentAddQueue
+from src.infrastructure.services import qbittorrent
+from src.infrastructure.services.qbittorrent import QBittorrentBatchAddWorker
+from src.utils.torrent_hash import torrent_infohash
+
+
+def _torrent(name: str) -> bytes:
+    info = f"d6:lengthi1e4:name{len(name)}:{name}12:piece lengthi16384e6:pieces20:".encode() + b"\x00" * 20 + b"e"
+    return b"d4:info" + info + b"e"
+
+
+def test_duplicates_are_never_queued_twice_and_link_only_on_confirmation():
+    known = {torrent_infohash(_torrent("Seeding"))}
+    queue = TorrentAddQueue(lambda torrent_hash: torrent_hash in known)
+    s1, s2 = _torrent("Show.S01"), _torrent("Show.S02")
+
+    assert queue.enqueue(1, s1, "/tv/show/s1") == (torrent_infohash(s1), QUEUED)
+    assert queue.enqueue(2, s2, "/tv/show/s2")[1] == QUEUED
+    assert queue.enqueue(3, s1, "/tv/show/s1")[1] == WAITING
+    assert queue.enqueue(4, _torrent("Seeding"), "/tv/other")[1] == KNOWN
+
+    batch = queue.take_batch()
+    assert [name for name, _data, _path in batch] == [torrent_infohash(s1), torrent_infohash(s2)]
+    assert queue.take_batch() == []
+
+    # In flight: still deduplicated.
+    assert queue.enqueue(5, s2, "/tv/show/s2")[1] == WAITING
+    assert queue.confirm([torrent_infohash(s1)]) == [(1, torrent_infohash(s1)), (3, torrent_infohash(s1))]
+    assert queue.enqueue(6, s1, "/tv/show/s1")[1] == KNOWN
+
+    # A failed add links nothing and can be retried.
+    queue.reject([torrent_infohash(s2)])
+    assert queue.confirm([torrent_infohash(s2)]) == []
+    assert queue.enqueue(7, s2, "/tv/show/s2")[1] == QUEUED
+
+
+def test_confirmed_hashes_are_dropped_once_known_or_deleted():
+    known = set()
+    queue = TorrentAddQueue(lambda torrent_hash: torrent_hash in known)
+    s1, s2 = _torrent("Show.S01"), _torrent("Show.S02")
+    h1, h2 = torrent_infohash(s1), torrent_infohash(s2)
+    queue.enqueue(1, s1, "/tv/show/s1")
+    queue.enqueue(2, s2, "/tv/show/s2")
+    queue.take_batch()
+    queue.confirm([h1, h2])
+
+    # The poller now reports s1; the queue stops tracking it on its own.
+    known.add(h1)
+    assert queue.enqueue(3, s1, "/tv/show/s1")[1] == KNOWN
+    assert queue._confirmed == {h2}
+
+    # s1 is deleted from qBittorrent and s2's deletion is requested before the poller ever saw it.
+    known.discard(h1)
+    queue.forget([h2])
+    assert queue.enqueue(4, s1, "/tv/show/s1")[1] == QUEUED
+    assert queue.enqueue(5, s2, "/tv/show/s2")[1] == QUEUED
+    assert queue._confirmed == set()
+
+
+class _FakeSession:
+    def __init__(self, failing_paths=()):
+        self.calls = []
+        self.failing_paths = set(failing_paths)
+
+    def torrents_add(self, torrent_files, save_path):
+        self.calls.append((save_path, sorted(torrent_files)))
+        if save_path in self.failing_paths:
+            raise ConnectionError("qBittorrent unreachable")
+        return "Ok."
+
+
+def test_batch_worker_sends_one_request_per_save_path(monkeypatch):
+    session = _FakeSession(failing_paths={"/tv/b"})
+    monkeypatch.setattr(qbittorrent, "get_qbittorrent_session", lambda: session)
+    worker = QBittorrentBatchAddWorker([("aa", b"1", "/tv/a"), ("bb", b"2", "/tv/a"), ("cc", b"3", "/tv/b")])
+    submitted, rejected = [], []
+    worker.submitted.connect(submitted.append)
+    worker.rejected.connect(lambda names, reason: rejected.append(names))
+
+    worker.run()
+
+    assert session.calls == [("/tv/a", ["aa.torrent", "bb.torrent"]), ("/tv/b", ["cc.torrent"])]
+    assert submitted == [["aa", "bb"]]
+    assert rejected == [["cc"]]
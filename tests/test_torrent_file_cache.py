@@ -0,0 +1,47 @@
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.infrastructure.services.torrent_file_cache import TorrentFileListCache
+
+
+class _FakeFilesClient:
+    def __init__(self):
+        self.calls = []
+        self.files = [{"name": "Show.S01/Show.S01E01.mkv", "size": "1000", "priority": 1}]
+
+    def torrents_files(self, torrent_hash):
+        self.calls.append(torrent_hash)
+        return self.files
+
+
+def test_file_list_is_fetched_once_until_the_torrent_changes():
+    cache = TorrentFileListCache()
+    client = _FakeFilesClient()
+    torrent = {"hash": "aa", "total_size": 1000, "completion_on": -1}
+    cache.observe(torrent)
+
+    assert cache.get_files(client, "aa") == [{"name": "Show.S01/Show.S01E01.mkv", "size": 1000}]
+    cache.observe(dict(torrent, progress=0.5))
+    cache.get_files(client, "aa")
+    assert client.calls == ["aa"]
+
+    client.files = client.files + [{"name": "Show.S01/Show.S01E02.mkv", "size": 2000}]
+    cache.observe(dict(torrent, total_size=3000))
+    assert len(cache.get_files(client, "aa")) == 2
+    assert client.calls == ["aa", "aa"]
+
+
+def test_persisted_list_is_adopted_only_under_the_current_stamp():
+    cache = TorrentFileListCache()
+    client = _FakeFilesClient()
+    cache.observe({"hash": "aa", "total_size": 1000, "completion_on": 77})
+
+    cache.seed("aa", [1000, -1], [{"name": "stale.mkv", "size": 1}])
+    assert cache.peek("aa") is None
+
+    cache.seed("aa", [1000, 77], [{"name": "current.mkv", "size": 1000}])
+    assert cache.get_files(client, "aa") == [{"name": "current.mkv", "size": 1000}]
+    assert client.calls == []
@@ -0,0 +1,29 @@
+import hashlib
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.torrent_hash import torrent_infohash
+
+
+def test_infohash_is_sha1_of_the_encoded_info_dictionary():
+    info = b"d6:lengthi1024e4:name8:Up.2009.12:piece lengthi16384e6:pieces20:" + b"\x01" * 20 + b"e"
+    torrent = b"d8:announce18:http://tracker/ann4:info" + info + b"7:comment3:hi!e"
+
+    assert torrent_infohash(torrent) == hashlib.sha1(info).hexdigest()
+
+
+def test_pure_v2_torrents_use_truncated_sha256():
+    info = b"d9:file treed0:dee12:meta versioni2e4:name2:Up12:piece lengthi16384ee"
+    torrent = b"d4:info" + info + b"e"
+
+    assert torrent_infohash(torrent) == hashlib.sha256(info).hexdigest()[:40]
+
+
+def test_invalid_metainfo_has_no_hash():
+    assert torrent_infohash(b"") is None
+    assert torrent_infohash(b"<html>not a torrent</html>") is None
+    assert torrent_infohash(b"d4:infod4:name5:Up") is None
+    assert torrent_infohash(b"d8:announce3:abce") is None
@@ -0,0 +1,114 @@
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.infrastructure.services.torrent_index import MaindataTorrentFeed, TorrentIndex, TrackedTorrentFeed
+
+
+def _torrent(torrent_hash, name, save_path, added_on=0):
+    return {"hash": torrent_hash, "name": name, "save_path": save_path, "added_on": added_on}
+
+
+def test_lookup_by_hash_and_first_name():
+    index = TorrentIndex([
+        _torrent("aa", "Up.2009", "/data/movies/Up"),
+        _torrent("bb", "Up.2009", "/data/other"),
+    ])
+    assert index.by_hash("aa")["save_path"] == "/data/movies/Up"
+    assert index.by_hash("zz") is None
+    assert index.by_name("Up.2009")["hash"] == "aa"
+
+
+def test_path_lookup_matches_whole_components_across_separators():
+    index = TorrentIndex([
+        _torrent("aa", "Show.S01", "D:\\media\\tv\\Show\\"),
+        _torrent("bb", "Show.S02", "/srv/media/tv/Show/Season 2"),
+        _torrent("cc", "Showtime", "/srv/media/tv/Showtime"),
+    ])
+    assert [t["hash"] for t in index.by_path("tv/Show")] == ["aa", "bb"]
+    assert [t["hash"] for t in index.by_path("tv\\Show\\")] == ["aa", "bb"]
+    assert index.by_path("") == []
+
+
+def test_incremental_updates_keep_indexes_consistent():
+    index = TorrentIndex([_torrent("aa", "Up", "/data/movies/Up")])
+
+    index.upsert(_torrent("aa", "Up.Remux", "/data/archive/Up"))
+    assert index.by_name("Up") is None
+    assert index.by_path("movies/Up") == []
+    assert index.by_path("archive/Up")[0]["name"] == "Up.Remux"
+
+    index.remove("aa")
+    assert len(index) == 0
+    assert index.by_name("Up.Remux") is None and index.by_path("archive") == []
+
+
+class _FakeMaindataClient:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requested_rids = []
+
+    def sync_maindata(self, rid=0):
+        self.requested_rids.append(rid)
+        return self.responses.pop(0)
+
+
+def test_maindata_feed_merges_partial_updates_and_removals():
+    client = _FakeMaindataClient([
+        {"rid": 1, "full_update": True, "torrents": {
+            "aa": {"name": "Up", "save_path": "/data/movies/Up", "progress": 0.5},
+            "bb": {"name": "Cars", "save_path": "/data/movies/Cars", "progress": 1.0},
+        }},
+        {"rid": 2, "torrents": {"aa": {"progress": 0.75}}, "torrents_removed": ["bb"]},
+        {"rid": 3},
+    ])
+    feed = MaindataTorrentFeed()
+
+    feed.refresh(client)
+    index = feed.refresh(client)
+    assert index.by_hash("aa") == {"hash": "aa", "name": "Up", "save_path": "/data/movies/Up", "progress": 0.75}
+    assert index.by_path("movies/Cars") == [] and len(index) == 1
+
+    feed.refresh(client)
+    assert client.requested_rids == [0, 1, 2]
+
+    feed.reset()
+    client.responses.append({"rid": 1, "full_update": True, "torrents": {}})
+    assert len(feed.refresh(client)) == 0
+    assert client.requested_rids[-1] == 0
+
+
+class _FakeInfoClient:
+    def __init__(self, torrents):
+        self.torrents = torrents
+        self.calls = []
+
+    def torrents_info(self, torrent_hashes=None, **filters):
+        self.calls.append((torrent_hashes, filters))
+        wanted = set(torrent_hashes.split("|")) if torrent_hashes else None
+        return [t for t in self.torrents
+                if (wanted is None or t["hash"] in wanted) and all(t.get(k) == v for k, v in filters.items())]
+
+
+def test_tracked_feed_fetches_known_hashes_and_throttles_discovery():
+    client = _FakeInfoClient([
+        dict(_torrent("aa", "Up", "/data/movies/Up"), category="media"),
+        dict(_torrent("bb", "Cars", "/data/movies/Cars"), category="media"),
+        dict(_torrent("cc", "Linux.iso", "/data/iso"), category="other"),
+    ])
+    now = [100.0]
+    feed = TrackedTorrentFeed(discovery_interval=30, category="media", clock=lambda: now[0])
+
+    index = feed.refresh(client, {"aa"}, has_unmatched=True)
+    assert client.calls == [("aa", {}), (None, {"category": "media"})]
+    assert index.by_path("movies/Cars")[0]["hash"] == "bb" and "cc" not in index
+
+    now[0] += 5
+    feed.refresh(client, {"aa"}, has_unmatched=True)
+    assert len(client.calls) == 3
+
+    now[0] += 30
+    feed.refresh(client, {"aa", "bb"}, has_unmatched=False)
+    assert client.calls[-1] == ("aa|bb", {})
@@ -0,0 +1,88 @@
+import os
+import sys
+
+from PyQt6.QtCore import QCoreApplication, QEventLoop, QThread, QTimer, pyqtSignal
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.infrastructure.services import torrent_size_resolver
+from src.infrastructure.services.torrent_file_cache import TorrentFileListCache
+from src.infrastructure.services.torrent_size_resolver import TorrentSizeResolver
+
+
+class _FakeSizeWorker(QThread):
+    finished = pyqtSignal(int)
+    error = pyqtSignal(str)
+    started = []
+
+    def __init__(self, torrent_hash, parent=None):
+        super().__init__(parent)
+        self.torrent_hash = torrent_hash
+
+    def start(self):
+        _FakeSizeWorker.started.append(self.torrent_hash)
+        self.finished.emit(4096)
+
+
+def test_size_is_fetched_once_then_served_from_cache(monkeypatch):
+    _FakeSizeWorker.started = []
+    monkeypatch.setattr(torrent_size_resolver, "QBittorrentSizeWorker", _FakeSizeWorker)
+    now = [0.0]
+    resolver = TorrentSizeResolver(refresh_interval=30.0, clock=lambda: now[0])
+    resolved = []
+    resolver.size_resolved.connect(lambda h, size: resolved.append((h, size)))
+
+    assert resolver.cached_size("aa") is None
+    resolver.request_size("aa")
+    resolver.request_size("aa")
+    assert resolved == [("aa", 4096)]
+    assert resolver.cached_size("aa") == 4096
+    assert _FakeSizeWorker.started == ["aa"]
+
+    now[0] = 31.0
+    resolver.request_size("aa")
+    assert _FakeSizeWorker.started == ["aa", "aa"]
+
+
+def test_file_lists_are_served_from_the_shared_file_cache(monkeypatch):
+    shared = TorrentFileListCache()
+    monkeypatch.setattr(torrent_size_resolver, "get_torrent_file_cache", lambda: shared)
+    resolver = TorrentSizeResolver()
+    assert resolver.cached_files("bb") is None
+
+    shared.observe({"hash": "bb", "total_size": 10, "completion_on": 1})
+    shared.seed("bb", (10, 1), [{"name": "Show.S01E01.mkv", "size": 10}])
+    assert resolver.cached_files("bb") == [{"name": "Show.S01E01.mkv", "size": 10}]
+
+    shared.observe({"hash": "bb", "total_size": 20, "completion_on": 1})
+    assert resolver.cached_files("bb") is None
+
+
+class _ThreadedSizeWorker(QThread):
+    finished = pyqtSignal(int)
+    error = pyqtSignal(str)
+
+    def __init__(self, torrent_hash, parent=None):
+        super().__init__(parent)
+
+    def run(self):
+        self.finished.emit(2048)
+
+
+def test_finished_workers_are_deleted(monkeypatch):
+    _app = QCoreApplication.instance() or QCoreApplication([])
+    monkeypatch.setattr(torrent_size_resolver, "QBittorrentSizeWorker", _ThreadedSizeWorker)
+    resolver = TorrentSizeResolver()
+    loop = QEventLoop()
+    destroyed = []
+
+    resolver.request_size("cc")
+    worker = resolver.findChild(_ThreadedSizeWorker)
+    worker.destroyed.connect(lambda: (destroyed.append(True), loop.quit()))
+    QTimer.singleShot(5000, loop.quit)
+    loop.exec()
+
+    assert destroyed == [True]
+    assert resolver.cached_size("cc") == 2048
+    assert resolver.findChildren(_ThreadedSizeWorker) == []